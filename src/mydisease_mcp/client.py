@@ -2,23 +2,70 @@
 
 import asyncio
 import hashlib
+import importlib.util
 import json
+import re
 import time
 from collections import OrderedDict
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# httpx only negotiates HTTP/2 when the optional h2 package is installed.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Tool calls arrive seconds apart, so keep idle connections past httpx's 5s default
+KEEPALIVE_EXPIRY = 60.0
+
+# Largest number of ids sent in one batched POST /disease request
+DISEASE_BATCH_LIMIT = 1000
+
+_DISEASE_ENDPOINT_RE = re.compile(r"^/?disease/([^/?]+)$")
+
 
 class MyDiseaseError(Exception):
     """Custom error for MyDisease API operations."""
 
 
+def _decode_json(content: bytes) -> Any:
+    """Decode a JSON response body, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _encode_json(data: Any) -> bytes:
+    """Encode a JSON request body, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _settle(
+    futures: List["asyncio.Future[Any]"], result: Any = None, error: Optional[BaseException] = None
+) -> None:
+    """Resolve every still-pending waiter with a result or an error."""
+    for future in futures:
+        if future.done():
+            continue
+        if error is not None:
+            future.set_exception(error)
+            future.exception()  # mark retrieved if the waiter has gone away
+        else:
+            future.set_result(result)
+
+
 class CacheEntry:
-    """Cache entry with expiration."""
+    """Cache entry with expiration and the response's ETag, if any."""
 
-    def __init__(self, data: Any, ttl_seconds: int = 3600):
+    def __init__(self, data: Any, ttl_seconds: int = 3600, etag: Optional[str] = None):
         self.data = data
+        self.etag = etag
         self.expires_at_monotonic = time.monotonic() + ttl_seconds
 
     def is_expired(self) -> bool:
@@ -49,6 +96,12 @@ class MyDiseaseClient:
         self._rate_limit_lock = asyncio.Lock()
         self._http_client: Optional[httpx.AsyncClient] = None
         self._closed = False
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        # fields projection -> disease id -> (endpoint, params, cache key, waiters)
+        self._disease_batches: Dict[
+            Optional[str], Dict[str, Tuple[str, Optional[Dict[str, Any]], str, List["asyncio.Future[Any]"]]]
+        ] = {}
+        self._batch_tasks: Set["asyncio.Task[None]"] = set()
 
     def _get_cache_key(
         self,
@@ -60,7 +113,16 @@ class MyDiseaseClient:
         """Generate cache key from request parameters."""
         key_parts = [method, endpoint]
         if params:
-            key_parts.append(json.dumps(params, sort_keys=True))
+            # Key on the query-string text httpx actually sends, so size=10 and
+            # size="10" share one entry while True is encoded as "true".
+            items = []
+            for key, value in httpx.QueryParams(params).multi_items():
+                if key == "fields" and "," in value:
+                    # Field order does not change the response, so share one entry.
+                    value = ",".join(sorted(value.split(",")))
+                items.append((key, value))
+            items.sort(key=lambda item: item[0])
+            key_parts.append(json.dumps(items))
         if data:
             key_parts.append(json.dumps(data, sort_keys=True))
         key_string = "|".join(key_parts)
@@ -75,15 +137,25 @@ class MyDiseaseClient:
         if entry is None:
             return None
         if entry.is_expired():
-            del self._cache[cache_key]
+            # Entries with an ETag stay behind so the refetch can revalidate them
+            if entry.etag is None:
+                del self._cache[cache_key]
             return None
         self._cache.move_to_end(cache_key)
         return entry.data
 
-    def _update_cache(self, cache_key: str, data: Any) -> None:
+    def _update_cache(
+        self,
+        cache_key: str,
+        data: Any,
+        ttl_seconds: Optional[int] = None,
+        etag: Optional[str] = None,
+    ) -> None:
         """Update cache with new data."""
         if self.cache_enabled:
-            self._cache[cache_key] = CacheEntry(data, self.cache_ttl)
+            self._cache[cache_key] = CacheEntry(
+                data, self.cache_ttl if ttl_seconds is None else ttl_seconds, etag
+            )
             self._cache.move_to_end(cache_key)
             if self.cache_max_entries is not None:
                 while len(self._cache) > self.cache_max_entries:
@@ -123,25 +195,169 @@ class MyDiseaseClient:
             self._http_client = httpx.AsyncClient(
                 base_url=self.base_url,
                 timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=20,
+                    max_connections=100,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
             )
         return self._http_client
 
-    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Make GET request to MyDisease API with caching."""
+    async def get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        cache_ttl: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Make GET request to MyDisease API with caching.
+
+        cache_ttl overrides the client-wide TTL for this response, for data
+        that changes far less often than the default assumes.
+        """
         cache_key = self._get_cache_key("GET", endpoint, params)
         cached_data = self._check_cache(cache_key)
         if cached_data is not None:
             return cached_data
 
+        if not self.cache_enabled:
+            return await self._fetch(endpoint, params, cache_key)
+
+        # Coalesce concurrent misses for the same request onto one fetch. The
+        # fetch runs as its own task and each caller waits through a shield,
+        # so a caller that is cancelled does not cancel the others.
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_shared(endpoint, params, cache_key, cache_ttl))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(cache_key, done))
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, cache_key: str, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every caller has gone away
+
+    async def _fetch_shared(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        cache_key: str,
+        cache_ttl: Optional[int],
+    ) -> Dict[str, Any]:
+        data = await self._fetch(endpoint, params, cache_key)
+        if cache_ttl is not None:
+            entry = self._cache.get(cache_key)
+            self._update_cache(cache_key, data, cache_ttl, entry.etag if entry else None)
+        return data
+
+    async def _fetch(
+        self, endpoint: str, params: Optional[Dict[str, Any]], cache_key: str
+    ) -> Dict[str, Any]:
+        """Fetch a GET response, batching single-disease lookups when possible."""
+        match = _DISEASE_ENDPOINT_RE.match(endpoint)
+        if match is None or (params and set(params) - {"fields"}):
+            return await self._fetch_get(endpoint, params, cache_key)
+
+        # Queue the lookup; everything queued in this loop iteration with the
+        # same projection is sent together as one POST /disease.
+        fields = (params or {}).get("fields")
+        loop = asyncio.get_running_loop()
+        batch = self._disease_batches.get(fields)
+        if batch is None:
+            batch = self._disease_batches[fields] = {}
+            loop.call_soon(self._start_disease_batch, fields)
+
+        future: "asyncio.Future[Any]" = loop.create_future()
+        batch.setdefault(match.group(1), (endpoint, params, cache_key, []))[3].append(future)
+        if len(batch) >= DISEASE_BATCH_LIMIT:
+            self._start_disease_batch(fields)
+        return await future
+
+    def _start_disease_batch(self, fields: Optional[str]) -> None:
+        batch = self._disease_batches.pop(fields, None)
+        if batch:
+            task = asyncio.ensure_future(self._flush_disease_batch(fields, batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _flush_disease_batch(
+        self,
+        fields: Optional[str],
+        batch: Dict[str, Tuple[str, Optional[Dict[str, Any]], str, List["asyncio.Future[Any]"]]],
+    ) -> None:
+        """Resolve queued single-disease lookups, using one POST when there are several."""
+        if len(batch) > 1:
+            post_data: Dict[str, Any] = {"ids": list(batch)}
+            if fields is not None:
+                post_data["fields"] = fields
+            try:
+                records = await self.post("disease", post_data, use_cache=False)
+            except Exception as exc:
+                for _, _, _, futures in batch.values():
+                    _settle(futures, error=exc)
+                return
+
+            found: Dict[Any, Dict[str, Any]] = {}
+            for record in records:
+                if not record.get("notfound"):
+                    found.setdefault(record.get("query"), record)
+
+            missing = {}
+            for disease_id, (endpoint, params, cache_key, futures) in batch.items():
+                record = found.get(disease_id)
+                if record is None:
+                    missing[disease_id] = (endpoint, params, cache_key, futures)
+                    continue
+                data = {key: value for key, value in record.items() if key != "query"}
+                self._update_cache(cache_key, data)
+                _settle(futures, result=data)
+            # Ids the batch could not resolve are retried on their own so callers
+            # see the same error a direct GET would raise.
+            batch = missing
+
+        await asyncio.gather(*(
+            self._settle_get(endpoint, params, cache_key, futures)
+            for endpoint, params, cache_key, futures in batch.values()
+        ))
+
+    async def _settle_get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        cache_key: str,
+        futures: List["asyncio.Future[Any]"],
+    ) -> None:
+        try:
+            data = await self._fetch_get(endpoint, params, cache_key)
+        except Exception as exc:
+            _settle(futures, error=exc)
+        else:
+            _settle(futures, result=data)
+
+    async def _fetch_get(
+        self, endpoint: str, params: Optional[Dict[str, Any]], cache_key: str
+    ) -> Dict[str, Any]:
+        """Issue a GET request and cache the decoded response.
+
+        An expired entry that carries an ETag is revalidated with
+        If-None-Match; a 304 reply renews it without resending the body.
+        """
         await self._apply_rate_limit()
 
+        stale = self._cache.get(cache_key) if self.cache_enabled else None
+        headers = {"If-None-Match": stale.etag} if stale is not None and stale.etag else None
         try:
             response = await (await self._ensure_client_open()).get(
-                endpoint.lstrip("/"), params=params
+                endpoint.lstrip("/"), params=params, headers=headers
             )
+            if response.status_code == 304 and stale is not None:
+                self._update_cache(cache_key, stale.data, etag=stale.etag)
+                return stale.data
             response.raise_for_status()
-            data = response.json()
-            self._update_cache(cache_key, data)
+            data = _decode_json(response.content)
+            self._update_cache(cache_key, data, etag=response.headers.get("etag"))
             return data
         except httpx.TimeoutException:
             raise MyDiseaseError("Request timed out. Please try again.")
@@ -164,11 +380,11 @@ class MyDiseaseClient:
         try:
             response = await (await self._ensure_client_open()).post(
                 endpoint.lstrip("/"),
-                json=json_data,
+                content=_encode_json(json_data),
                 headers=headers,
             )
             response.raise_for_status()
-            data = response.json()
+            data = _decode_json(response.content)
             if use_cache:
                 self._update_cache(cache_key, data)
             return data
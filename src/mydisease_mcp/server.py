@@ -239,6 +239,15 @@ async def sse_message_fallback(_: Request) -> Response:
     return Response(status_code=204)
 
 
+def _event_loop_options() -> Dict[str, Any]:
+    """Run the asyncio backend on uvloop when the optional package is installed."""
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return {}
+    return {"use_uvloop": True}
+
+
 def main() -> None:
     import argparse
 
@@ -293,9 +302,12 @@ def main() -> None:
             async def run_http() -> None:
                 await mcp.run_http_async(host=args.host, port=args.port)
 
-            anyio.run(run_http)
+            anyio.run(run_http, backend_options=_event_loop_options())
         else:
-            mcp.run(transport=args.transport)
+            anyio.run(
+                functools.partial(mcp.run_async, transport=args.transport),
+                backend_options=_event_loop_options(),
+            )
     except KeyboardInterrupt:  # pragma: no cover - user interaction
         logger.info("Server interrupted by user")
     except Exception:  # pragma: no cover - unexpected runtime failure
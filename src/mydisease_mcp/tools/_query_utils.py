@@ -3,9 +3,20 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
+from typing import Iterable
 
 _FIELD_RE = re.compile(r"^[A-Za-z0-9_.]+$")
-_TERM_SPECIAL_CHARS = set(r'+-!(){}[]^"~*?:\/&|')
+_TERM_SPECIAL_CHARS = r'+-!(){}[]^"~*?:\/&|'
+# Backslash-escape every special and whitespace character in one translate
+# pass; no code point above U+3000 is whitespace.
+_TERM_ESCAPE_TABLE = str.maketrans({
+    char: f"\\{char}"
+    for char in map(chr, range(0x3001))
+    if char in _TERM_SPECIAL_CHARS or char.isspace()
+})
+# The same character set as a regex (\s matches what str.isspace() accepts)
+_TERM_META_RE = re.compile(f"[{re.escape(_TERM_SPECIAL_CHARS)}\\s]")
 
 
 def escape_lucene_phrase(value: str) -> str:
@@ -15,13 +26,16 @@ def escape_lucene_phrase(value: str) -> str:
 
 def escape_lucene_term(value: str) -> str:
     """Escape a user-provided value for use as an unquoted Lucene term."""
-    escaped = []
-    for char in value:
-        if char in _TERM_SPECIAL_CHARS or char.isspace():
-            escaped.append(f"\\{char}")
-        else:
-            escaped.append(char)
-    return "".join(escaped)
+    # A regex scan is cheaper than translate, which always builds a new string
+    if _TERM_META_RE.search(value) is None:
+        return value
+    return _translate_term(value)
+
+
+# Identifiers such as MONDO:0007739 contain ':' and recur across queries
+@lru_cache(maxsize=4096)
+def _translate_term(value: str) -> str:
+    return value.translate(_TERM_ESCAPE_TABLE)
 
 
 def quote_lucene_phrase(value: str) -> str:
@@ -29,6 +43,11 @@ def quote_lucene_phrase(value: str) -> str:
     return f'"{escape_lucene_phrase(value)}"'
 
 
+def lucene_any_of(field_name: str, values: Iterable[str]) -> str:
+    """Match any of several phrases on one field, e.g. field:("a" OR "b")."""
+    return f"{field_name}:(" + " OR ".join(quote_lucene_phrase(v) for v in values) + ")"
+
+
 def maybe_quote_field_value(value: str) -> str:
     """Preserve existing field query style while preventing quote injection."""
     if len(value) >= 2 and value.startswith('"') and value.endswith('"'):
@@ -0,0 +1,12 @@
+"""Helpers for reading MyDisease annotation records."""
+
+from __future__ import annotations
+
+from typing import Any, List
+
+
+def as_list(value: Any) -> List[Any]:
+    """Normalize a field that may hold one object, a list of objects, or nothing."""
+    if type(value) is list:
+        return value
+    return [] if value is None else [value]
@@ -8,6 +8,80 @@ import mcp.types as types
 from ..client import MyDiseaseClient
 from ._query_utils import quote_lucene_phrase
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _dumps(data: Any) -> str:
+    """Serialize export payloads as JSON, keeping non-ASCII text unescaped."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            # e.g. integers beyond 64 bits, which only the stdlib encoder handles
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _lookup_field(record: Dict[str, Any], field: str, default: Any = None) -> Any:
+    """Read a dotted field from a dotfield-flattened or nested record."""
+    if field in record:
+        return record[field]
+    value: Any = record
+    for part in field.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            break
+    else:
+        return value
+    # A parent field of a flattened record only survives as "field.*" keys
+    prefix = field + "."
+    nested: Dict[str, Any] = {}
+    for key, child in record.items():
+        if key.startswith(prefix):
+            *parents, leaf = key[len(prefix):].split(".")
+            target = nested
+            for part in parents:
+                target = target.setdefault(part, {})
+            target[leaf] = child
+    return nested or default
+
+
+def _truncate(value: Any, limit: int = 50, suffix: str = "...") -> str:
+    """Render a table cell, shortening it to ``limit`` characters."""
+    text = value if isinstance(value, str) else str(value)
+    if len(text) <= limit:
+        return text
+    return text[:limit - len(suffix)] + suffix
+
+
+def _write_delimited(rows: List[List[Any]], delimiter: str) -> str:
+    """Render rows as CSV/TSV, skipping the csv module when nothing needs quoting."""
+    lines = []
+    for row in rows:
+        cells = ["" if value is None else str(value) for value in row]
+        line = delimiter.join(cells)
+        # csv quotes cells holding the delimiter, quotes or line breaks, and a
+        # lone empty cell; any of those sends the whole export through csv.
+        if (
+            line.count(delimiter) != len(cells) - 1
+            or '"' in line
+            or "\n" in line
+            or "\r" in line
+            or cells == [""]
+        ):
+            output = io.StringIO()
+            csv.writer(output, delimiter=delimiter).writerows(rows)
+            return output.getvalue()
+        lines.append(line)
+    lines.append("")
+    return "\r\n".join(lines)
+
 
 class ExportApi:
     """Tools for exporting disease data."""
@@ -31,44 +105,25 @@ class ExportApi:
             "ids": disease_ids,
             "fields": fields_str
         }
+        if format in ["tsv", "csv"]:
+            # Let the server flatten nested fields into dotted keys
+            post_data["dotfield"] = True
         
         results = await client.post("disease", post_data)
         
         # Format based on requested type
         if format == "json":
-            return json.dumps(results, indent=2)
+            return _dumps(results)
         
         elif format in ["tsv", "csv"]:
-            # Flatten nested fields
-            flattened_results = []
-            for disease in results:
-                flat_disease = {}
-                for field in fields:
-                    if "." in field:
-                        # Handle nested fields
-                        parts = field.split(".")
-                        value = disease
-                        for part in parts:
-                            if isinstance(value, dict) and part in value:
-                                value = value[part]
-                            else:
-                                value = None
-                                break
-                        flat_disease[field] = value
-                    else:
-                        flat_disease[field] = disease.get(field)
-                
-                flattened_results.append(flat_disease)
+            rows = [fields]
+            rows.extend(
+                [_lookup_field(disease, field) for field in fields]
+                for disease in results
+            )
             
-            # Create CSV/TSV
-            output = io.StringIO()
             delimiter = "\t" if format == "tsv" else ","
-            writer = csv.DictWriter(output, fieldnames=fields, delimiter=delimiter)
-            
-            writer.writeheader()
-            writer.writerows(flattened_results)
-            
-            return output.getvalue()
+            return _write_delimited(rows, delimiter)
         
         elif format == "markdown":
             # Create markdown table
@@ -84,18 +139,7 @@ class ExportApi:
             for disease in results:
                 values = []
                 for field in fields:
-                    if "." in field:
-                        parts = field.split(".")
-                        value = disease
-                        for part in parts:
-                            if isinstance(value, dict) and part in value:
-                                value = value[part]
-                            else:
-                                value = ""
-                                break
-                    else:
-                        value = disease.get(field, "")
-                    
+                    value = _lookup_field(disease, field, "")
                     values.append(str(value) if value is not None else "")
                 
                 lines.append("| " + " | ".join(values) + " |")
@@ -209,7 +253,7 @@ class ExportApi:
         
         # Format output
         if format == "json":
-            return json.dumps(comparison_data, indent=2)
+            return _dumps(comparison_data)
         
         elif format == "markdown":
             lines = []
@@ -228,27 +272,23 @@ class ExportApi:
                 values = [row["disease_id"], row["name"]]
                 for field in comparison_fields:
                     if field != "name":
-                        val = row.get(field, "")
-                        # Truncate long values
-                        if len(str(val)) > 50:
-                            val = str(val)[:47] + "..."
-                        values.append(str(val))
+                        values.append(_truncate(row.get(field, "")))
                 
                 lines.append("| " + " | ".join(values) + " |")
             
             return "\n".join(lines)
         
         elif format in ["csv", "tsv"]:
-            output = io.StringIO()
             delimiter = "\t" if format == "tsv" else ","
             
             fieldnames = ["disease_id", "name"] + comparison_fields
-            writer = csv.DictWriter(output, fieldnames=fieldnames, delimiter=delimiter)
+            rows = [fieldnames]
+            rows.extend(
+                [row.get(field, "") for field in fieldnames]
+                for row in comparison_data
+            )
             
-            writer.writeheader()
-            writer.writerows(comparison_data)
-            
-            return output.getvalue()
+            return _write_delimited(rows, delimiter)
         
         else:
             raise ValueError(f"Unsupported format: {format}")
@@ -292,53 +332,48 @@ class ExportApi:
         results = await client.post("disease", post_data)
         
         # Build matrix
+        gene_set = set(gene_list)
         for disease in results:
             disease_id = disease.get("_id")
+            gene_flags = dict.fromkeys(gene_list, 0)
             matrix[disease_id] = {
                 "name": disease.get("name", ""),
-                "genes": {}
+                "genes": gene_flags
             }
             
-            # Initialize all genes to 0
-            for gene in gene_list:
-                matrix[disease_id]["genes"][gene] = 0
-            
             # Mark associated genes
             if "gene" in disease:
                 genes = disease["gene"]
                 genes = genes if isinstance(genes, list) else [genes]
                 for g in genes:
-                    if g.get("symbol") in gene_list:
-                        matrix[disease_id]["genes"][g["symbol"]] = 1
+                    if (symbol := g.get("symbol")) in gene_set:
+                        gene_flags[symbol] = 1
             
             if "causal_gene" in disease:
                 genes = disease["causal_gene"]
                 genes = genes if isinstance(genes, list) else [genes]
                 for g in genes:
-                    if g.get("symbol") in gene_list:
-                        matrix[disease_id]["genes"][g["symbol"]] = 2  # 2 for causal
+                    if (symbol := g.get("symbol")) in gene_set:
+                        gene_flags[symbol] = 2  # 2 for causal
         
         # Format output
         if format == "json":
-            return json.dumps(matrix, indent=2)
+            return _dumps(matrix)
         
         elif format in ["csv", "tsv"]:
-            output = io.StringIO()
             delimiter = "\t" if format == "tsv" else ","
             
             # Headers
-            headers = ["Disease ID", "Disease Name"] + gene_list
-            writer = csv.writer(output, delimiter=delimiter)
-            writer.writerow(headers)
+            rows = [["Disease ID", "Disease Name"] + gene_list]
             
             # Data rows
             for disease_id, data in matrix.items():
                 row = [disease_id, data["name"]]
                 for gene in gene_list:
                     row.append(data["genes"][gene])
-                writer.writerow(row)
+                rows.append(row)
             
-            return output.getvalue()
+            return _write_delimited(rows, delimiter)
         
         elif format == "markdown":
             lines = []
@@ -402,7 +437,7 @@ class ExportApi:
         if "inheritance" in result:
             inh = result["inheritance"]
             inh = inh if isinstance(inh, list) else [inh]
-            profile["inheritance"] = [i.get("inheritance_type") for i in inh]
+            profile["inheritance"] = [t for i in inh if (t := i.get("inheritance_type"))]
         
         # Process phenotypes
         if "phenotype_related_to_disease" in result:
@@ -410,9 +445,14 @@ class ExportApi:
             phenos = phenos if isinstance(phenos, list) else [phenos]
             
             for pheno in phenos:
+                hpo_id = pheno.get("hpo_id")
+                phenotype = pheno.get("hpo_phenotype")
+                if not hpo_id and not phenotype:
+                    continue
+                
                 phenotype_info = {
-                    "hpo_id": pheno.get("hpo_id"),
-                    "phenotype": pheno.get("hpo_phenotype"),
+                    "hpo_id": hpo_id,
+                    "phenotype": phenotype,
                     "frequency": pheno.get("frequency"),
                     "onset": pheno.get("onset")
                 }
@@ -426,7 +466,7 @@ class ExportApi:
         
         # Format output
         if format == "json":
-            return json.dumps(profile, indent=2)
+            return _dumps(profile)
         
         elif format == "markdown":
             lines = []
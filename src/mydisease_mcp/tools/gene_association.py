@@ -1,9 +1,83 @@
 """Gene-disease association tools."""
 
-from typing import Any, Dict, Optional, List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 import mcp.types as types
-from ..client import MyDiseaseClient
+from ..client import MyDiseaseClient, MyDiseaseError
 from ._query_utils import quote_lucene_phrase, validate_lucene_field_name
+from ._record_utils import as_list
+from .batch import MAX_BATCH_SIZE
+
+# Field projections, trimmed to the subfields each tool reads
+DISEASE_GENE_FIELDS = "gene,causal_gene,disgenet.gene,ctd.gene_info"
+GENE_QUERY_FIELDS = (
+    "_id,name,gene.symbol,gene.id,causal_gene.symbol,"
+    "disgenet.gene.gene_name,disgenet.gene.gene_id,disgenet.gene.score"
+)
+GENE_PANEL_FIELDS = "_id,name,gene.symbol,causal_gene.symbol,disgenet.gene.gene_name"
+GENE_SCORE_FIELDS = (
+    "gene.symbol,causal_gene.symbol,disgenet.gene.gene_name,disgenet.gene.score,"
+    "disgenet.gene.pmids,ctd.gene_info.symbol,ctd.gene_info.inference_score"
+)
+
+
+# (record path, symbol key, source label) for every gene-bearing block
+_GENE_SOURCES = (
+    (("gene",), "symbol", "primary"),
+    (("causal_gene",), "symbol", "causal"),
+    (("disgenet", "gene"), "gene_name", "disgenet"),
+    (("ctd", "gene_info"), "symbol", "ctd"),
+)
+
+
+def _get_path(record: Dict[str, Any], path: Tuple[str, ...]) -> List[Any]:
+    """Return the gene list stored under a nested record path."""
+    node: Any = record
+    for part in path:
+        if not isinstance(node, dict):
+            return []
+        node = node.get(part)
+    return as_list(node)
+
+
+def _iter_gene_records(record: Dict[str, Any]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Yield (source, symbol key, gene) for every gene entry in a disease record."""
+    for path, symbol_key, source in _GENE_SOURCES:
+        for gene in _get_path(record, path):
+            yield source, symbol_key, gene
+
+
+_ASSOCIATION_BUILDERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "primary": lambda gene: {
+        "source": "primary",
+        "relationship": "associated",
+        "confidence": "high"
+    },
+    "causal": lambda gene: {
+        "source": "causal",
+        "relationship": "causal",
+        "confidence": "very_high"
+    },
+    "disgenet": lambda gene: {
+        "source": "disgenet",
+        "score": gene.get("score"),
+        "pmid_count": len(gene.get("pmids", [])),
+        "confidence": "high" if gene.get("score", 0) > 0.7 else "medium"
+    },
+    "ctd": lambda gene: {
+        "source": "ctd",
+        "inference_score": gene.get("inference_score"),
+        "confidence": "medium"
+    },
+}
+
+
+def _extract_associations(result: Dict[str, Any], gene_symbol: str) -> List[Dict[str, Any]]:
+    """Collect every source-specific association for a gene in a disease record."""
+    return [
+        _ASSOCIATION_BUILDERS[source](gene)
+        for source, symbol_key, gene in _iter_gene_records(result)
+        if gene.get(symbol_key) == gene_symbol
+    ]
 
 
 class GeneAssociationApi:
@@ -13,7 +87,7 @@ class GeneAssociationApi:
         self,
         client: MyDiseaseClient,
         gene_symbol: str,
-        source: Optional[str] = None,
+        source: Optional[Union[str, List[str]]] = None,
         min_score: Optional[float] = None,
         size: int = 20
     ) -> Dict[str, Any]:
@@ -32,13 +106,22 @@ class GeneAssociationApi:
         query_parts.append(f"({' OR '.join(gene_fields)})")
         
         if source:
-            query_parts.append(f"_exists_:{validate_lucene_field_name(source)}")
+            sources = [source] if isinstance(source, str) else source
+            exists = [f"_exists_:{validate_lucene_field_name(s)}" for s in sources]
+            query_parts.append(f"({' OR '.join(exists)})")
+        
+        if min_score is not None:
+            # Unscored primary/causal links always pass, so only DisGeNET is ranged
+            query_parts.append(
+                f"(gene.symbol:{gene_term} OR causal_gene.symbol:{gene_term} "
+                f"OR disgenet.gene.score:[{float(min_score)} TO *])"
+            )
         
         q = " AND ".join(query_parts)
         
         params = {
             "q": q,
-            "fields": "_id,name,gene,causal_gene,disgenet.gene,ctd.gene_info",
+            "fields": GENE_QUERY_FIELDS,
             "size": size
         }
         
@@ -55,7 +138,7 @@ class GeneAssociationApi:
             
             # Extract gene associations from different sources
             if "gene" in hit:
-                genes = hit["gene"] if isinstance(hit["gene"], list) else [hit["gene"]]
+                genes = as_list(hit["gene"])
                 for gene in genes:
                     if gene.get("symbol") == gene_symbol:
                         disease_info["gene_associations"].append({
@@ -65,7 +148,7 @@ class GeneAssociationApi:
                         })
             
             if "causal_gene" in hit:
-                causal = hit["causal_gene"] if isinstance(hit["causal_gene"], list) else [hit["causal_gene"]]
+                causal = as_list(hit["causal_gene"])
                 for gene in causal:
                     if gene.get("symbol") == gene_symbol:
                         disease_info["gene_associations"].append({
@@ -75,8 +158,7 @@ class GeneAssociationApi:
                         })
             
             if "disgenet" in hit and "gene" in hit["disgenet"]:
-                genes = hit["disgenet"]["gene"]
-                genes = genes if isinstance(genes, list) else [genes]
+                genes = as_list(hit["disgenet"]["gene"])
                 for gene in genes:
                     if gene.get("gene_name") == gene_symbol:
                         disease_info["gene_associations"].append({
@@ -107,52 +189,36 @@ class GeneAssociationApi:
     ) -> Dict[str, Any]:
         """Get all genes associated with a disease."""
         params = {
-            "fields": "gene,causal_gene,disgenet.gene,ctd.gene_info"
+            "fields": DISEASE_GENE_FIELDS
         }
         
         result = await client.get(f"disease/{disease_id}", params=params)
         
         genes = {
             "disease_id": disease_id,
-            "primary_genes": [],
-            "causal_genes": [],
+            "primary_genes": _get_path(result, ("gene",)),
+            "causal_genes": _get_path(result, ("causal_gene",)),
             "associated_genes": []
         }
         
-        # Extract primary genes
-        if "gene" in result:
-            primary = result["gene"] if isinstance(result["gene"], list) else [result["gene"]]
-            genes["primary_genes"] = primary
-        
-        # Extract causal genes
-        if "causal_gene" in result:
-            causal = result["causal_gene"] if isinstance(result["causal_gene"], list) else [result["causal_gene"]]
-            genes["causal_genes"] = causal
-        
         # Extract DisGeNET associations
-        if "disgenet" in result and "gene" in result["disgenet"]:
-            disgenet = result["disgenet"]["gene"]
-            disgenet = disgenet if isinstance(disgenet, list) else [disgenet]
-            for gene in disgenet:
-                genes["associated_genes"].append({
-                    "source": "disgenet",
-                    "symbol": gene.get("gene_name"),
-                    "gene_id": gene.get("gene_id"),
-                    "score": gene.get("score") if include_scores else None,
-                    "pmids": gene.get("pmids", [])
-                })
+        for gene in _get_path(result, ("disgenet", "gene")):
+            genes["associated_genes"].append({
+                "source": "disgenet",
+                "symbol": gene.get("gene_name"),
+                "gene_id": gene.get("gene_id"),
+                "score": gene.get("score") if include_scores else None,
+                "pmids": gene.get("pmids", [])
+            })
         
         # Extract CTD associations
-        if "ctd" in result and "gene_info" in result["ctd"]:
-            ctd = result["ctd"]["gene_info"]
-            ctd = ctd if isinstance(ctd, list) else [ctd]
-            for gene in ctd:
-                genes["associated_genes"].append({
-                    "source": "ctd",
-                    "symbol": gene.get("symbol"),
-                    "gene_id": gene.get("gene_id"),
-                    "inference_score": gene.get("inference_score") if include_scores else None
-                })
+        for gene in _get_path(result, ("ctd", "gene_info")):
+            genes["associated_genes"].append({
+                "source": "ctd",
+                "symbol": gene.get("symbol"),
+                "gene_id": gene.get("gene_id"),
+                "inference_score": gene.get("inference_score") if include_scores else None
+            })
         
         return {
             "success": True,
@@ -167,6 +233,9 @@ class GeneAssociationApi:
         size: int = 50
     ) -> Dict[str, Any]:
         """Search diseases by a panel of genes."""
+        panel_set = frozenset(gene_symbols)
+        panel_size = len(panel_set)
+        
         # Build query for gene panel
         gene_queries = []
         for gene in gene_symbols:
@@ -180,7 +249,7 @@ class GeneAssociationApi:
         
         params = {
             "q": q,
-            "fields": "_id,name,gene,causal_gene,disgenet.gene",
+            "fields": GENE_PANEL_FIELDS,
             "size": size
         }
         
@@ -191,32 +260,21 @@ class GeneAssociationApi:
         for hit in result.get("hits", []):
             matching_genes = set()
             
-            # Check primary genes
-            if "gene" in hit:
-                genes = hit["gene"] if isinstance(hit["gene"], list) else [hit["gene"]]
-                for gene in genes:
-                    if gene.get("symbol") in gene_symbols:
-                        matching_genes.add(gene.get("symbol"))
-            
-            # Check causal genes
-            if "causal_gene" in hit:
-                genes = hit["causal_gene"] if isinstance(hit["causal_gene"], list) else [hit["causal_gene"]]
-                for gene in genes:
-                    if gene.get("symbol") in gene_symbols:
-                        matching_genes.add(gene.get("symbol"))
-            
-            # Check DisGeNET genes
-            if "disgenet" in hit and "gene" in hit["disgenet"]:
-                genes = hit["disgenet"]["gene"]
-                genes = genes if isinstance(genes, list) else [genes]
-                for gene in genes:
-                    if gene.get("gene_name") in gene_symbols:
-                        matching_genes.add(gene.get("gene_name"))
+            # Check primary, causal and DisGeNET genes in turn; the sources are
+            # lazy, so later ones are skipped once the whole panel has matched
+            for symbols in (
+                (gene.get("symbol") for gene in as_list(hit.get("gene"))),
+                (gene.get("symbol") for gene in as_list(hit.get("causal_gene"))),
+                (gene.get("gene_name") for gene in as_list(hit.get("disgenet", {}).get("gene"))),
+            ):
+                matching_genes.update(panel_set.intersection(symbols))
+                if len(matching_genes) == panel_size:
+                    break
             
             diseases.append({
                 "disease_id": hit.get("_id"),
                 "disease_name": hit.get("name"),
-                "matching_genes": list(matching_genes),
+                "matching_genes": sorted(matching_genes),
                 "match_count": len(matching_genes)
             })
         
@@ -239,71 +297,66 @@ class GeneAssociationApi:
         disease_id: str
     ) -> Dict[str, Any]:
         """Get association score between a gene and disease."""
-        # Get disease information
-        params = {
-            "fields": "gene,causal_gene,disgenet.gene,ctd.gene_info"
-        }
+        params = {"fields": GENE_SCORE_FIELDS}
         
         result = await client.get(f"disease/{disease_id}", params=params)
         
-        association_data = {
-            "gene_symbol": gene_symbol,
-            "disease_id": disease_id,
-            "associations": []
-        }
+        matches = _extract_associations(result, gene_symbol)
         
-        # Check primary genes
-        if "gene" in result:
-            genes = result["gene"] if isinstance(result["gene"], list) else [result["gene"]]
-            for gene in genes:
-                if gene.get("symbol") == gene_symbol:
-                    association_data["associations"].append({
-                        "source": "primary",
-                        "relationship": "associated",
-                        "confidence": "high"
-                    })
+        return {
+            "success": True,
+            "association": {
+                "gene_symbol": gene_symbol,
+                "disease_id": disease_id,
+                "associations": matches,
+                "is_associated": len(matches) > 0
+            }
+        }
+    
+    async def get_gene_disease_scores_batch(
+        self,
+        client: MyDiseaseClient,
+        gene_symbol: str,
+        disease_ids: List[str]
+    ) -> Dict[str, Any]:
+        """Get association scores between a gene and several diseases in one request."""
+        if len(disease_ids) > MAX_BATCH_SIZE:
+            raise MyDiseaseError(f"Batch size exceeds maximum of {MAX_BATCH_SIZE}")
         
-        # Check causal genes
-        if "causal_gene" in result:
-            genes = result["causal_gene"] if isinstance(result["causal_gene"], list) else [result["causal_gene"]]
-            for gene in genes:
-                if gene.get("symbol") == gene_symbol:
-                    association_data["associations"].append({
-                        "source": "causal",
-                        "relationship": "causal",
-                        "confidence": "very_high"
-                    })
+        post_data = {
+            "ids": disease_ids,
+            "fields": GENE_SCORE_FIELDS
+        }
         
-        # Check DisGeNET
-        if "disgenet" in result and "gene" in result["disgenet"]:
-            genes = result["disgenet"]["gene"]
-            genes = genes if isinstance(genes, list) else [genes]
-            for gene in genes:
-                if gene.get("gene_name") == gene_symbol:
-                    association_data["associations"].append({
-                        "source": "disgenet",
-                        "score": gene.get("score"),
-                        "pmid_count": len(gene.get("pmids", [])),
-                        "confidence": "high" if gene.get("score", 0) > 0.7 else "medium"
-                    })
+        results = await client.post("disease", post_data)
         
-        # Check CTD
-        if "ctd" in result and "gene_info" in result["ctd"]:
-            genes = result["ctd"]["gene_info"]
-            genes = genes if isinstance(genes, list) else [genes]
-            for gene in genes:
-                if gene.get("symbol") == gene_symbol:
-                    association_data["associations"].append({
-                        "source": "ctd",
-                        "inference_score": gene.get("inference_score"),
-                        "confidence": "medium"
-                    })
+        # A query can match several records, so pair results by their query id
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        for result in results:
+            if not result.get("notfound"):
+                found.setdefault(result.get("query"), []).append(result)
         
-        association_data["is_associated"] = len(association_data["associations"]) > 0
+        associations = []
+        for disease_id in disease_ids:
+            records = found.get(disease_id, [])
+            matches = [
+                match
+                for record in records
+                for match in _extract_associations(record, gene_symbol)
+            ]
+            associations.append({
+                "gene_symbol": gene_symbol,
+                "disease_id": disease_id,
+                "associations": matches,
+                "is_associated": len(matches) > 0,
+                "notfound": not records
+            })
         
         return {
             "success": True,
-            "association": association_data
+            "gene_symbol": gene_symbol,
+            "total": len(associations),
+            "associations": associations
         }
 
 
@@ -319,8 +372,11 @@ GENE_ASSOCIATION_TOOLS = [
                     "description": "Gene symbol (e.g., 'BRCA1', 'TP53')"
                 },
                 "source": {
-                    "type": "string",
-                    "description": "Filter by data source (e.g., 'disgenet', 'ctd')"
+                    "description": "Filter by data source(s) (e.g., 'disgenet', ['disgenet', 'ctd'])",
+                    "anyOf": [
+                        {"type": "string"},
+                        {"type": "array", "items": {"type": "string"}}
+                    ]
                 },
                 "min_score": {
                     "type": "number",
@@ -396,5 +452,24 @@ GENE_ASSOCIATION_TOOLS = [
             },
             "required": ["gene_symbol", "disease_id"]
         }
+    ),
+    types.Tool(
+        name="get_gene_disease_scores_batch",
+        description="Get association scores between a gene and multiple diseases in one request",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "gene_symbol": {
+                    "type": "string",
+                    "description": "Gene symbol"
+                },
+                "disease_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of disease IDs (up to 1000)"
+                }
+            },
+            "required": ["gene_symbol", "disease_ids"]
+        }
     )
 ]
@@ -1,9 +1,69 @@
 """GWAS (Genome-Wide Association Studies) tools."""
 
+from collections import Counter
+from operator import itemgetter
+from statistics import median_high
 from typing import Any, Dict, Optional, List
 import mcp.types as types
-from ..client import MyDiseaseClient
+from ..client import MyDiseaseClient, MyDiseaseError
 from ._query_utils import quote_lucene_phrase
+from ._record_utils import as_list
+from .batch import MAX_BATCH_SIZE
+
+# Shared projection for per-disease GWAS lookups, so the client cache can
+# serve every GWAS view of a disease from one fetched document.
+GWAS_DISEASE_FIELDS = "gwas_catalog,gwas,gene"
+GWAS_TRAIT_FIELDS = (
+    "_id,name,gwas_catalog.trait,gwas_catalog.rsid,gwas_catalog.p_value,"
+    "gwas_catalog.odds_ratio,gwas_catalog.sample_size,gwas_catalog.ancestry,"
+    "gwas_catalog.pubmed_id"
+)
+
+
+def _gwas_statistics(result: Dict[str, Any], disease_id: str) -> Dict[str, Any]:
+    """Summarize the GWAS catalog entries of a disease record."""
+    statistics = {
+        "disease_id": disease_id,
+        "total_associations": 0,
+        "significant_associations": 0,
+        "unique_variants": 0,
+        "ancestry_distribution": {},
+        "year_distribution": {},
+        "top_genes": {},
+        "median_odds_ratio": None,
+        "strongest_association": None
+    }
+    
+    if "gwas_catalog" in result:
+        gwas = as_list(result["gwas_catalog"])
+        
+        # Parse numeric columns once instead of re-converting per use
+        p_values = [(float(a["p_value"]), a) for a in gwas if a.get("p_value")]
+        odds_ratios = [float(a["odds_ratio"]) for a in gwas if a.get("odds_ratio")]
+        
+        statistics["total_associations"] = len(gwas)
+        statistics["significant_associations"] = sum(1 for p, _ in p_values if p < 5e-8)
+        statistics["unique_variants"] = len({a["rsid"] for a in gwas if a.get("rsid")})
+        
+        statistics["ancestry_distribution"] = dict(
+            Counter(a.get("ancestry", "Unknown") for a in gwas)
+        )
+        # Year comes from study info when present
+        statistics["year_distribution"] = dict(
+            Counter(year for a in gwas if (year := a.get("year")))
+        )
+        gene_counts = Counter(gene for a in gwas if (gene := a.get("mapped_gene")))
+        
+        if odds_ratios:
+            statistics["median_odds_ratio"] = median_high(odds_ratios)
+        
+        if p_values:
+            statistics["strongest_association"] = min(p_values, key=itemgetter(0))[1]
+        
+        # Get top genes (most_common selects with a bounded heap)
+        statistics["top_genes"] = dict(gene_counts.most_common(10))
+    
+    return statistics
 
 
 class GWASApi:
@@ -17,7 +77,7 @@ class GWASApi:
     ) -> Dict[str, Any]:
         """Get GWAS associations for a disease."""
         params = {
-            "fields": "gwas_catalog,gwas"
+            "fields": GWAS_DISEASE_FIELDS
         }
         
         result = await client.get(f"disease/{disease_id}", params=params)
@@ -31,16 +91,18 @@ class GWASApi:
         
         # Extract GWAS catalog data
         if "gwas_catalog" in result:
-            gwas = result["gwas_catalog"]
-            gwas = gwas if isinstance(gwas, list) else [gwas]
+            gwas = as_list(result["gwas_catalog"])
             
             traits = set()
+            ranked = []
             
             for assoc in gwas:
                 p_val = assoc.get("p_value")
+                # Parse once; the value drives both the filter and the ranking
+                p_f = float(p_val) if p_val not in (None, "") else None
                 
                 # Apply p-value filter if specified
-                if p_value_threshold is None or (p_val and float(p_val) <= p_value_threshold):
+                if p_value_threshold is None or (p_val and p_f <= p_value_threshold):
                     association = {
                         "rsid": assoc.get("rsid"),
                         "p_value": p_val,
@@ -55,20 +117,20 @@ class GWASApi:
                         "ancestry": assoc.get("ancestry")
                     }
                     
-                    gwas_data["associations"].append(association)
+                    ranked.append((1.0 if p_f is None else p_f, association))
                     
                     if assoc.get("trait"):
                         traits.add(assoc.get("trait"))
             
             # Sort by p-value to get top variants
-            gwas_data["associations"].sort(key=lambda x: float(x.get("p_value", 1)))
+            ranked.sort(key=itemgetter(0))
+            gwas_data["associations"] = [association for _, association in ranked]
             gwas_data["top_variants"] = gwas_data["associations"][:10]
             gwas_data["associated_traits"] = list(traits)
         
         # Extract general GWAS data
         if "gwas" in result:
-            general_gwas = result["gwas"]
-            general_gwas = general_gwas if isinstance(general_gwas, list) else [general_gwas]
+            general_gwas = as_list(result["gwas"])
             gwas_data["associations"].extend(general_gwas)
         
         return {
@@ -91,26 +153,33 @@ class GWASApi:
         if ancestry:
             query_parts.append(f"gwas_catalog.ancestry:{quote_lucene_phrase(ancestry)}")
         
+        if min_sample_size is not None:
+            # Let the index drop diseases with no large-enough study
+            query_parts.append(f"gwas_catalog.sample_size:[{int(min_sample_size)} TO *]")
+        
         q = " AND ".join(query_parts)
         
         params = {
             "q": q,
-            "fields": "_id,name,gwas_catalog",
-            "size": 100  # Get more to filter by sample size
+            "fields": GWAS_TRAIT_FIELDS,
+            # One disease can carry many studies, and the trait match is
+            # applied per study below, so fetch more diseases than studies
+            "size": max(size, 100)
         }
         
         result = await client.get("query", params=params)
         
         # Process and filter results
         studies = []
+        trait_lower = trait.lower()
         
         for hit in result.get("hits", []):
             if "gwas_catalog" in hit:
-                gwas = hit["gwas_catalog"]
-                gwas = gwas if isinstance(gwas, list) else [gwas]
+                gwas = as_list(hit["gwas_catalog"])
                 
                 for study in gwas:
-                    if study.get("trait") and trait.lower() in study["trait"].lower():
+                    study_trait = study.get("trait")
+                    if study_trait and trait_lower in study_trait.lower():
                         sample_size = study.get("sample_size")
                         
                         # Apply sample size filter
@@ -118,7 +187,7 @@ class GWASApi:
                             studies.append({
                                 "disease_id": hit.get("_id"),
                                 "disease_name": hit.get("name"),
-                                "trait": study.get("trait"),
+                                "trait": study_trait,
                                 "rsid": study.get("rsid"),
                                 "p_value": study.get("p_value"),
                                 "odds_ratio": study.get("odds_ratio"),
@@ -149,7 +218,7 @@ class GWASApi:
     ) -> Dict[str, Any]:
         """Get GWAS variants for a disease, optionally filtered by gene."""
         params = {
-            "fields": "gwas_catalog,gene"
+            "fields": GWAS_DISEASE_FIELDS
         }
         
         result = await client.get(f"disease/{disease_id}", params=params)
@@ -160,40 +229,33 @@ class GWASApi:
             "all_variants": []
         }
         
-        # Get gene list if needed for filtering
-        gene_list = []
-        if gene_symbol and "gene" in result:
-            genes = result["gene"]
-            genes = genes if isinstance(genes, list) else [genes]
-            gene_list = [g.get("symbol") for g in genes if g.get("symbol")]
-        
         # Extract GWAS variants
         if "gwas_catalog" in result:
-            gwas = result["gwas_catalog"]
-            gwas = gwas if isinstance(gwas, list) else [gwas]
+            gwas = as_list(result["gwas_catalog"])
+            all_variants = variants["all_variants"]
+            variants_by_gene = variants["variants_by_gene"]
             
             for var in gwas:
+                mapped_gene = var.get("mapped_gene")
+                
+                # Filter by gene if specified
+                if gene_symbol and mapped_gene != gene_symbol:
+                    continue
+                
                 variant_info = {
                     "rsid": var.get("rsid"),
                     "position": var.get("position"),
                     "chromosome": var.get("chromosome"),
                     "p_value": var.get("p_value"),
-                    "mapped_gene": var.get("mapped_gene"),
+                    "mapped_gene": mapped_gene,
                     "effect_size": var.get("odds_ratio") or var.get("beta")
                 }
                 
-                # Filter by gene if specified
-                if gene_symbol:
-                    if var.get("mapped_gene") == gene_symbol:
-                        variants["all_variants"].append(variant_info)
-                else:
-                    variants["all_variants"].append(variant_info)
+                all_variants.append(variant_info)
                 
                 # Group by gene
-                mapped_gene = var.get("mapped_gene", "intergenic")
-                if mapped_gene not in variants["variants_by_gene"]:
-                    variants["variants_by_gene"][mapped_gene] = []
-                variants["variants_by_gene"][mapped_gene].append(variant_info)
+                group = mapped_gene if "mapped_gene" in var else "intergenic"
+                variants_by_gene.setdefault(group, []).append(variant_info)
         
         return {
             "success": True,
@@ -208,92 +270,54 @@ class GWASApi:
     ) -> Dict[str, Any]:
         """Get statistical summary of GWAS findings for a disease."""
         params = {
-            "fields": "gwas_catalog"
+            "fields": GWAS_DISEASE_FIELDS
         }
         
         result = await client.get(f"disease/{disease_id}", params=params)
         
-        statistics = {
-            "disease_id": disease_id,
-            "total_associations": 0,
-            "significant_associations": 0,
-            "unique_variants": set(),
-            "ancestry_distribution": {},
-            "year_distribution": {},
-            "top_genes": {},
-            "median_odds_ratio": None,
-            "strongest_association": None
+        return {
+            "success": True,
+            "statistics": _gwas_statistics(result, disease_id)
         }
+    
+    async def get_gwas_statistics_many(
+        self,
+        client: MyDiseaseClient,
+        disease_ids: List[str]
+    ) -> Dict[str, Any]:
+        """Get GWAS statistical summaries for several diseases in one request."""
+        if len(disease_ids) > MAX_BATCH_SIZE:
+            raise MyDiseaseError(f"Batch size exceeds maximum of {MAX_BATCH_SIZE}")
         
-        if "gwas_catalog" in result:
-            gwas = result["gwas_catalog"]
-            gwas = gwas if isinstance(gwas, list) else [gwas]
-            
-            odds_ratios = []
-            p_values = []
-            
-            for assoc in gwas:
-                statistics["total_associations"] += 1
-                
-                # Count significant associations
-                p_val = assoc.get("p_value")
-                if p_val and float(p_val) < 5e-8:
-                    statistics["significant_associations"] += 1
-                
-                # Track unique variants
-                if assoc.get("rsid"):
-                    statistics["unique_variants"].add(assoc["rsid"])
-                
-                # Ancestry distribution
-                ancestry = assoc.get("ancestry", "Unknown")
-                statistics["ancestry_distribution"][ancestry] = \
-                    statistics["ancestry_distribution"].get(ancestry, 0) + 1
-                
-                # Year distribution (from study info)
-                year = assoc.get("year")
-                if year:
-                    statistics["year_distribution"][year] = \
-                        statistics["year_distribution"].get(year, 0) + 1
-                
-                # Gene distribution
-                gene = assoc.get("mapped_gene")
-                if gene:
-                    statistics["top_genes"][gene] = \
-                        statistics["top_genes"].get(gene, 0) + 1
-                
-                # Collect odds ratios
-                if assoc.get("odds_ratio"):
-                    odds_ratios.append(float(assoc["odds_ratio"]))
-                
-                # Track p-values for strongest association
-                if p_val:
-                    p_values.append((float(p_val), assoc))
-            
-            # Calculate statistics
-            statistics["unique_variants"] = len(statistics["unique_variants"])
-            
-            if odds_ratios:
-                odds_ratios.sort()
-                statistics["median_odds_ratio"] = odds_ratios[len(odds_ratios)//2]
-            
-            if p_values:
-                p_values.sort(key=lambda x: x[0])
-                statistics["strongest_association"] = p_values[0][1]
-            
-            # Get top genes
-            top_genes_list = sorted(
-                statistics["top_genes"].items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:10]
-            statistics["top_genes"] = dict(top_genes_list)
+        post_data = {
+            "ids": disease_ids,
+            "fields": GWAS_DISEASE_FIELDS
+        }
+        
+        results = await client.post("disease", post_data)
+        
+        # A query can match several records, so pair results by their query id
+        found: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            if not result.get("notfound"):
+                found.setdefault(result.get("query"), result)
+        
+        statistics = []
+        missing = []
+        for disease_id in disease_ids:
+            result = found.get(disease_id)
+            if result is None:
+                missing.append(disease_id)
+            else:
+                statistics.append(_gwas_statistics(result, disease_id))
         
         return {
             "success": True,
-            "statistics": statistics
+            "total": len(statistics),
+            "statistics": statistics,
+            "missing_ids": missing
         }
 
-
 GWAS_TOOLS = [
     types.Tool(
         name="get_gwas_associations",
@@ -372,5 +396,20 @@ GWAS_TOOLS = [
             },
             "required": ["disease_id"]
         }
+    ),
+    types.Tool(
+        name="get_gwas_statistics_many",
+        description="Get statistical summaries of GWAS findings for multiple diseases",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "disease_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of disease IDs (up to 1000)"
+                }
+            },
+            "required": ["disease_ids"]
+        }
     )
 ]
@@ -1,13 +1,137 @@
 """Disease identifier mapping tools."""
 
-from typing import Any, Dict, List, Optional
+import asyncio
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import mcp.types as types
 from ..client import MyDiseaseClient, MyDiseaseError
+from ._record_utils import as_list
+from .batch import MAX_BATCH_SIZE
+
+# Maximum number of chunked mapping POSTs in flight at once
+MAPPING_CONCURRENCY = 8
+
+# Query field(s) holding each supported identifier type
+_ID_FIELD_MAP = {
+    "mondo": "mondo.mondo,mondo.id",
+    "omim": "omim",
+    "orphanet": "orphanet.id,orphanet.orphanet",
+    "doid": "disease_ontology.doid",
+    "umls": "umls.cui",
+    "mesh": "mesh",
+    "icd10": "icd10",
+    "icd11": "icd11",
+    "hp": "hpo.hpo_id"
+}
+
+# Validation reports only the name and MONDO ID of each hit
+_VALIDATION_FIELDS = "_id,name,mondo.mondo,mondo.id"
+
+# Substring hints for inferring an ID type from a list name, checked in order
+_FROM_TYPE_HINTS = (
+    ("omim", "omim"),
+    ("orphanet", "orphanet"),
+    ("mondo", "mondo"),
+    ("doid", "doid"),
+    ("disease_ontology", "doid"),
+    ("umls", "umls"),
+    ("icd10", "icd10"),
+)
+
+
+def _extract_hp(result: Dict[str, Any]) -> Optional[str]:
+    """Return the first HPO ID from a record's hpo block."""
+    hpo = as_list(result.get("hpo"))
+    if hpo and type(hpo[0]) is dict:
+        return hpo[0].get("hpo_id")
+    return None
+
+
+# Pull each supported identifier type out of a mapping result
+_ID_EXTRACTORS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "mondo": lambda r: (r.get("mondo") or {}).get("mondo") or (r.get("mondo") or {}).get("id"),
+    "omim": lambda r: r.get("omim"),
+    "orphanet": lambda r: (r.get("orphanet") or {}).get("id") or (r.get("orphanet") or {}).get("orphanet"),
+    "doid": lambda r: (r.get("disease_ontology") or {}).get("doid"),
+    "umls": lambda r: (r.get("umls") or {}).get("cui"),
+    "mesh": lambda r: r.get("mesh"),
+    "icd10": lambda r: r.get("icd10"),
+    "icd11": lambda r: r.get("icd11"),
+    "hp": _extract_hp,
+}
+
+
+@lru_cache(maxsize=64)
+def _return_fields(to_types: Tuple[str, ...]) -> str:
+    """Build the fields projection for a set of requested identifier types."""
+    return ",".join(
+        ["_id", "name"]
+        + [_ID_FIELD_MAP[to_type] for to_type in to_types if to_type in _ID_FIELD_MAP]
+    )
+
+
+def _infer_from_type(list_name: str) -> str:
+    """Infer the identifier type of a named list, e.g. 'omim_ids' -> 'omim'."""
+    lowered = list_name.lower()
+    from_type = next((t for hint, t in _FROM_TYPE_HINTS if hint in lowered), None)
+    if from_type is None:
+        raise ValueError(f"Cannot determine identifier type from: {list_name}")
+    return from_type
 
 
 class MappingApi:
     """Tools for mapping between disease identifiers."""
     
+    async def _fetch_mapping_results(
+        self,
+        client: MyDiseaseClient,
+        input_ids: List[str],
+        from_type: str,
+        fields: str
+    ) -> List[Dict[str, Any]]:
+        """Post the mapping queries and return the raw hits in input order."""
+        # Build scope for searching
+        scope = _ID_FIELD_MAP.get(from_type)
+        if not scope:
+            raise MyDiseaseError(f"Unsupported from_type: {from_type}")
+        
+        # Query each distinct identifier once, splitting lists beyond the server batch limit
+        unique_ids = list(dict.fromkeys(input_ids))
+        chunks = [
+            unique_ids[i:i + MAX_BATCH_SIZE]
+            for i in range(0, len(unique_ids), MAX_BATCH_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(MAPPING_CONCURRENCY)
+        
+        async def post_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await client.post("query", {
+                    "ids": chunk,
+                    "scopes": scope,
+                    "fields": fields
+                })
+        
+        if len(chunks) <= 1:
+            results = await post_chunk(unique_ids)
+        else:
+            results = list(chain.from_iterable(
+                await asyncio.gather(*(post_chunk(chunk) for chunk in chunks))
+            ))
+        
+        if len(unique_ids) != len(input_ids):
+            # Fan the shared hits back out so repeated inputs keep their own entries
+            by_query: Dict[Any, List[Dict[str, Any]]] = {}
+            for result in results:
+                by_query.setdefault(result.get("query"), []).append(result)
+            results = [
+                result
+                for input_id in input_ids
+                for result in by_query.get(input_id, ())
+            ]
+        
+        return results
+    
     async def map_disease_ids(
         self,
         client: MyDiseaseClient,
@@ -29,92 +153,41 @@ class MappingApi:
         - icd11: ICD-11 code
         - hp: HPO ID (for phenotypes)
         """
-        # Define field mappings
-        field_map = {
-            "mondo": "mondo.mondo,mondo.id",
-            "omim": "omim",
-            "orphanet": "orphanet.id,orphanet.orphanet",
-            "doid": "disease_ontology.doid",
-            "umls": "umls.cui",
-            "mesh": "mesh",
-            "icd10": "icd10",
-            "icd11": "icd11",
-            "hp": "hpo.hpo_id"
-        }
-        
-        # Build scope for searching
-        scope = field_map.get(from_type)
-        if not scope:
-            raise MyDiseaseError(f"Unsupported from_type: {from_type}")
-        
-        # Build fields to return
-        return_fields = ["_id", "name"]
-        for to_type in to_types:
-            if to_type in field_map:
-                return_fields.append(field_map[to_type])
-        
-        # Query for all identifiers
-        post_data = {
-            "ids": input_ids,
-            "scopes": scope,
-            "fields": ",".join(return_fields)
-        }
-        
-        results = await client.post("query", post_data)
+        results = await self._fetch_mapping_results(
+            client, input_ids, from_type, _return_fields(tuple(to_types))
+        )
         
         # Process results
         mappings = []
         unmapped = []
+        extractors = [
+            (to_type, _ID_EXTRACTORS[to_type])
+            for to_type in to_types
+            if to_type in _ID_EXTRACTORS
+        ]
+        # Bound once; the loop below runs per returned hit
+        append_mapping = mappings.append
+        append_unmapped = unmapped.append
         
         for result in results:
-            if result.get("found", False):
-                mapping = {
-                    "input": result.get("query"),
-                    "from_type": from_type,
-                    "disease_name": result.get("name"),
-                    "mappings": {}
-                }
+            get = result.get
+            if get("found", False):
+                found_ids = {}
                 
                 # Extract each requested identifier type
-                for to_type in to_types:
-                    value = None
-                    
-                    if to_type == "mondo":
-                        if "mondo" in result:
-                            mondo = result["mondo"]
-                            value = mondo.get("mondo") or mondo.get("id")
-                    elif to_type == "omim":
-                        value = result.get("omim")
-                    elif to_type == "orphanet":
-                        if "orphanet" in result:
-                            orph = result["orphanet"]
-                            value = orph.get("id") or orph.get("orphanet")
-                    elif to_type == "doid":
-                        if "disease_ontology" in result:
-                            value = result["disease_ontology"].get("doid")
-                    elif to_type == "umls":
-                        if "umls" in result:
-                            value = result["umls"].get("cui")
-                    elif to_type == "mesh":
-                        value = result.get("mesh")
-                    elif to_type == "icd10":
-                        value = result.get("icd10")
-                    elif to_type == "icd11":
-                        value = result.get("icd11")
-                    elif to_type == "hp":
-                        if "hpo" in result:
-                            hpo = result["hpo"]
-                            if isinstance(hpo, list) and hpo:
-                                value = hpo[0].get("hpo_id")
-                            elif isinstance(hpo, dict):
-                                value = hpo.get("hpo_id")
-                    
+                for to_type, extract in extractors:
+                    value = extract(result)
                     if value:
-                        mapping["mappings"][to_type] = value
+                        found_ids[to_type] = value
                 
-                mappings.append(mapping)
+                append_mapping({
+                    "input": get("query"),
+                    "from_type": from_type,
+                    "disease_name": get("name"),
+                    "mappings": found_ids
+                })
             else:
-                unmapped.append(result.get("query", "Unknown"))
+                append_unmapped(get("query", "Unknown"))
         
         return {
             "success": True,
@@ -132,26 +205,24 @@ class MappingApi:
         identifier_type: str
     ) -> Dict[str, Any]:
         """Validate a list of disease identifiers."""
-        # Use mapping to check validity
-        result = await self.map_disease_ids(
-            client=client,
-            input_ids=identifiers,
-            from_type=identifier_type,
-            to_types=["mondo"],  # Just need to check if found
-            missing_ok=True
+        # Only the MONDO ID is needed, so read it straight off each hit
+        results = await self._fetch_mapping_results(
+            client, identifiers, identifier_type, _VALIDATION_FIELDS
         )
+        extract_mondo = _ID_EXTRACTORS["mondo"]
         
         valid = []
         invalid = []
         
-        for mapping in result["mappings"]:
-            valid.append({
-                "identifier": mapping["input"],
-                "disease_name": mapping["disease_name"],
-                "mondo_id": mapping["mappings"].get("mondo")
-            })
-        
-        invalid = result.get("unmapped_ids", [])
+        for result in results:
+            if result.get("found", False):
+                valid.append({
+                    "identifier": result.get("query"),
+                    "disease_name": result.get("name"),
+                    "mondo_id": extract_mondo(result) or None
+                })
+            else:
+                invalid.append(result.get("query", "Unknown"))
         
         return {
             "success": True,
@@ -178,52 +249,60 @@ class MappingApi:
         """
         all_diseases = {}
         
-        # Map all identifiers to internal disease IDs
-        for id_type, id_list in identifier_lists.items():
-            # Determine the identifier type
-            if "omim" in id_type.lower():
-                from_type = "omim"
-            elif "orphanet" in id_type.lower():
-                from_type = "orphanet"
-            elif "mondo" in id_type.lower():
-                from_type = "mondo"
-            elif "doid" in id_type.lower() or "disease_ontology" in id_type.lower():
-                from_type = "doid"
-            elif "umls" in id_type.lower():
-                from_type = "umls"
-            elif "icd10" in id_type.lower():
-                from_type = "icd10"
-            else:
-                raise ValueError(f"Cannot determine identifier type from: {id_type}")
-            
-            mapping_result = await self.map_disease_ids(
+        # Lists of the same identifier type share scopes, so each type is
+        # mapped with one request covering all of its lists
+        list_types = [
+            (id_type, _infer_from_type(id_type)) for id_type in identifier_lists
+        ]
+        ids_by_type: Dict[str, Dict[str, None]] = {}
+        for id_type, from_type in list_types:
+            ids_by_type.setdefault(from_type, {}).update(
+                dict.fromkeys(identifier_lists[id_type])
+            )
+        mapping_results = await asyncio.gather(*(
+            self.map_disease_ids(
                 client=client,
-                input_ids=id_list,
+                input_ids=list(input_ids),
                 from_type=from_type,
                 to_types=["mondo", "omim", "orphanet"]
             )
-            
+            for from_type, input_ids in ids_by_type.items()
+        ))
+        mappings_by_type: Dict[str, Dict[Any, List[Dict[str, Any]]]] = {}
+        for from_type, mapping_result in zip(ids_by_type, mapping_results):
+            by_input = mappings_by_type[from_type] = {}
             for mapping in mapping_result["mappings"]:
+                by_input.setdefault(mapping["input"], []).append(mapping)
+        
+        for id_type, from_type in list_types:
+            by_input = mappings_by_type[from_type]
+            list_mappings = chain.from_iterable(
+                by_input.get(input_id, ()) for input_id in identifier_lists[id_type]
+            )
+            for mapping in list_mappings:
                 # Use internal _id or MONDO as canonical ID
                 disease_id = mapping.get("_id") or mapping["mappings"].get("mondo")
                 if disease_id:
-                    if disease_id not in all_diseases:
-                        all_diseases[disease_id] = {
+                    entry = all_diseases.get(disease_id)
+                    if entry is None:
+                        entry = all_diseases[disease_id] = {
                             "name": mapping["disease_name"],
-                            "found_in": []
+                            "found_in": [],
+                            "found_in_lists": set()
                         }
-                    all_diseases[disease_id]["found_in"].append({
+                    entry["found_in"].append({
                         "list": id_type,
                         "identifier": mapping["input"]
                     })
+                    entry["found_in_lists"].add(id_type)
         
         # Find common diseases
         common_diseases = []
         list_names = list(identifier_lists.keys())
+        required_lists = set(list_names)
         
         for disease_id, data in all_diseases.items():
-            found_lists = [item["list"] for item in data["found_in"]]
-            if all(list_name in found_lists for list_name in list_names):
+            if required_lists <= data["found_in_lists"]:
                 common_diseases.append({
                     "disease_id": disease_id,
                     "disease_name": data["name"],
@@ -1,16 +1,47 @@
 """Metadata and utility tools."""
 
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 import mcp.types as types
 from ..client import MyDiseaseClient
 
+# Build metadata and the field list only change with MyDisease data releases
+METADATA_CACHE_TTL = 6 * 3600
+
+# Field-name substrings per category, checked in order; unmatched fields are basic_info
+_FIELD_CATEGORY_TOKENS = (
+    ("identifiers", ("mondo", "omim", "orphanet", "doid", "umls", "mesh", "icd")),
+    ("genetic", ("gene", "variant", "causal")),
+    ("clinical", ("phenotype", "clinical", "treatment", "drug")),
+    ("epidemiology", ("prevalence", "incidence", "epidemiology")),
+    ("ontology", ("ontology", "parents", "children", "ancestors")),
+    ("sources", ("disgenet", "ctd", "kegg", "pharmgkb")),
+)
+_FIELD_CATEGORIES = (
+    "identifiers", "basic_info", "genetic", "clinical", "epidemiology", "ontology", "sources"
+)
+
+
+@lru_cache(maxsize=4)
+def _categorize_fields(fields: Tuple[str, ...]) -> Dict[str, Tuple[str, ...]]:
+    """Group field names by category; cached since the field list rarely changes."""
+    categories: Dict[str, List[str]] = {name: [] for name in _FIELD_CATEGORIES}
+    for field in fields:
+        for category, tokens in _FIELD_CATEGORY_TOKENS:
+            if any(token in field for token in tokens):
+                categories[category].append(field)
+                break
+        else:
+            categories["basic_info"].append(field)
+    return {name: tuple(members) for name, members in categories.items()}
+
 
 class MetadataApi:
     """Tools for retrieving MyDisease.info metadata."""
     
     async def get_mydisease_metadata(self, client: MyDiseaseClient) -> Dict[str, Any]:
         """Get metadata about the MyDisease.info API service."""
-        result = await client.get("metadata")
+        result = await client.get("metadata", cache_ttl=METADATA_CACHE_TTL)
         
         return {
             "success": True,
@@ -19,35 +50,14 @@ class MetadataApi:
     
     async def get_available_fields(self, client: MyDiseaseClient) -> Dict[str, Any]:
         """Get a list of all available fields in MyDisease.info."""
-        result = await client.get("metadata/fields")
+        result = await client.get("metadata/fields", cache_ttl=METADATA_CACHE_TTL)
         
         # Organize fields by category
         field_categories = {
-            "identifiers": [],
-            "basic_info": [],
-            "genetic": [],
-            "clinical": [],
-            "epidemiology": [],
-            "ontology": [],
-            "sources": []
+            name: list(members)
+            for name, members in _categorize_fields(tuple(result)).items()
         }
         
-        for field, info in result.items():
-            if any(id_type in field for id_type in ["mondo", "omim", "orphanet", "doid", "umls", "mesh", "icd"]):
-                field_categories["identifiers"].append(field)
-            elif any(term in field for term in ["gene", "variant", "causal"]):
-                field_categories["genetic"].append(field)
-            elif any(term in field for term in ["phenotype", "clinical", "treatment", "drug"]):
-                field_categories["clinical"].append(field)
-            elif any(term in field for term in ["prevalence", "incidence", "epidemiology"]):
-                field_categories["epidemiology"].append(field)
-            elif any(term in field for term in ["ontology", "parents", "children", "ancestors"]):
-                field_categories["ontology"].append(field)
-            elif any(source in field for source in ["disgenet", "ctd", "kegg", "pharmgkb"]):
-                field_categories["sources"].append(field)
-            else:
-                field_categories["basic_info"].append(field)
-        
         return {
             "success": True,
             "total_fields": len(result),
@@ -57,7 +67,7 @@ class MetadataApi:
     
     async def get_database_statistics(self, client: MyDiseaseClient) -> Dict[str, Any]:
         """Get statistics about the database."""
-        metadata = await client.get("metadata")
+        metadata = await client.get("metadata", cache_ttl=METADATA_CACHE_TTL)
         
         stats = {
             "total_diseases": metadata.get("stats", {}).get("total", 0),
@@ -1,9 +1,31 @@
 """Disease ontology and classification tools."""
 
-from typing import Any, Dict, Optional, List
+import asyncio
+from typing import Any, Dict, List
 import mcp.types as types
 from ..client import MyDiseaseClient
-from ._query_utils import quote_lucene_phrase
+from ._query_utils import lucene_any_of
+from ._record_utils import as_list
+
+# Projection for per-disease ontology lookups
+ONTOLOGY_DISEASE_FIELDS = "mondo,disease_ontology,icd10,icd11,umls,mesh,medgen"
+
+# The query endpoint returns at most this many hits per request
+QUERY_MAX_SIZE = 1000
+
+# Only the fields read from sibling hits
+SIBLING_FIELDS = "_id,name"
+
+# Child records fetched in total while walking down the hierarchy
+HIERARCHY_MAX_CHILDREN = 200
+
+
+def _mondo_terms(terms: Any) -> List[Dict[str, Any]]:
+    """Flatten a MONDO parents/children block into id/label entries."""
+    return [
+        {"source": "mondo", "id": term.get("id"), "label": term.get("label")}
+        for term in as_list(terms)
+    ]
 
 
 class OntologyApi:
@@ -16,7 +38,7 @@ class OntologyApi:
     ) -> Dict[str, Any]:
         """Get ontology information for a disease."""
         params = {
-            "fields": "mondo,disease_ontology,icd10,icd11,umls,mesh,medgen"
+            "fields": ONTOLOGY_DISEASE_FIELDS
         }
         
         result = await client.get(f"disease/{disease_id}", params=params)
@@ -28,8 +50,7 @@ class OntologyApi:
         }
         
         # Extract MONDO
-        if "mondo" in result:
-            mondo = result["mondo"]
+        if (mondo := result.get("mondo")) is not None:
             ontology_data["ontologies"]["mondo"] = {
                 "id": mondo.get("mondo") or mondo.get("id"),
                 "label": mondo.get("label"),
@@ -38,8 +59,7 @@ class OntologyApi:
             }
         
         # Extract Disease Ontology
-        if "disease_ontology" in result:
-            do = result["disease_ontology"]
+        if (do := result.get("disease_ontology")) is not None:
             ontology_data["ontologies"]["disease_ontology"] = {
                 "id": do.get("doid"),
                 "name": do.get("name"),
@@ -47,17 +67,14 @@ class OntologyApi:
             }
         
         # Extract ICD codes
-        if "icd10" in result:
-            icd10 = result["icd10"]
-            icd10 = icd10 if isinstance(icd10, list) else [icd10]
-            ontology_data["ontologies"]["icd10"] = icd10
+        if (icd10 := result.get("icd10")) is not None:
+            ontology_data["ontologies"]["icd10"] = as_list(icd10)
         
-        if "icd11" in result:
-            ontology_data["ontologies"]["icd11"] = result["icd11"]
+        if (icd11 := result.get("icd11")) is not None:
+            ontology_data["ontologies"]["icd11"] = icd11
         
         # Extract UMLS
-        if "umls" in result:
-            umls = result["umls"]
+        if (umls := result.get("umls")) is not None:
             ontology_data["ontologies"]["umls"] = {
                 "cui": umls.get("cui"),
                 "name": umls.get("name"),
@@ -65,16 +82,16 @@ class OntologyApi:
             }
         
         # Extract other identifiers
-        if "mesh" in result:
+        if (mesh := result.get("mesh")) is not None:
             ontology_data["cross_references"].append({
                 "source": "mesh",
-                "id": result["mesh"]
+                "id": mesh
             })
         
-        if "medgen" in result:
+        if (medgen := result.get("medgen")) is not None:
             ontology_data["cross_references"].append({
                 "source": "medgen",
-                "id": result["medgen"]
+                "id": medgen
             })
         
         return {
@@ -104,35 +121,21 @@ class OntologyApi:
         }
         
         # Extract MONDO hierarchy
-        if "mondo" in result:
-            mondo = result["mondo"]
+        if (mondo := result.get("mondo")) is not None:
             if "parents" in mondo:
-                parents = mondo["parents"]
-                parents = parents if isinstance(parents, list) else [parents]
-                classification["hierarchy"]["parents"].extend([
-                    {"source": "mondo", "id": p.get("id"), "label": p.get("label")}
-                    for p in parents
-                ])
+                classification["hierarchy"]["parents"].extend(_mondo_terms(mondo["parents"]))
             
             if "children" in mondo:
-                children = mondo["children"]
-                children = children if isinstance(children, list) else [children]
-                classification["hierarchy"]["children"].extend([
-                    {"source": "mondo", "id": c.get("id"), "label": c.get("label")}
-                    for c in children
-                ])
+                classification["hierarchy"]["children"].extend(_mondo_terms(mondo["children"]))
             
             if "ancestors" in mondo:
-                ancestors = mondo["ancestors"]
-                ancestors = ancestors if isinstance(ancestors, list) else [ancestors]
+                ancestors = as_list(mondo["ancestors"])
                 classification["hierarchy"]["ancestors"] = ancestors
         
         # Extract Disease Ontology hierarchy
-        if "disease_ontology" in result:
-            do = result["disease_ontology"]
+        if (do := result.get("disease_ontology")) is not None:
             if "parents" in do:
-                parents = do["parents"]
-                parents = parents if isinstance(parents, list) else [parents]
+                parents = as_list(do["parents"])
                 classification["hierarchy"]["parents"].extend([
                     {"source": "disease_ontology", "id": p}
                     for p in parents
@@ -166,103 +169,101 @@ class OntologyApi:
             "related_by_phenotypes": []
         }
         
-        # Get hierarchically related diseases
+        # Build every relationship search first, then run them concurrently
+        searches = {}
+        
+        # Search for siblings (same parent) with one size-limited query per
+        # parent, so no parent's children can crowd out another's
+        parent_ids = []
         if relationship_type in ["all", "hierarchy"] and "mondo" in disease_result:
             mondo = disease_result["mondo"]
-            
-            # Search for siblings (same parent)
             if "parents" in mondo:
-                parents = mondo["parents"]
-                parents = parents if isinstance(parents, list) else [parents]
-                
-                for parent in parents:
-                    parent_id = parent.get("id")
-                    if parent_id:
-                        # Find diseases with same parent
-                        q = f"mondo.parents.id:{quote_lucene_phrase(parent_id)}"
-                        params = {
-                            "q": q,
-                            "fields": "_id,name,mondo",
-                            "size": size
-                        }
-                        
-                        siblings_result = await client.get("query", params=params)
-                        
-                        for hit in siblings_result.get("hits", []):
-                            if hit.get("_id") != disease_id:
-                                related_diseases["related_by_hierarchy"].append({
-                                    "disease_id": hit.get("_id"),
-                                    "disease_name": hit.get("name"),
-                                    "relationship": "sibling",
-                                    "via_parent": parent_id
-                                })
+                parents = as_list(mondo["parents"])
+                parent_ids = list(dict.fromkeys(parent.get("id") for parent in parents if parent.get("id")))
+            
+            if parent_ids:
+                # One extra hit makes up for the disease itself being skipped
+                searches["hierarchy"] = asyncio.gather(*(
+                    client.get("query", params={
+                        "q": lucene_any_of("mondo.parents.id", [parent_id]),
+                        "fields": SIBLING_FIELDS,
+                        "size": min(size + 1, QUERY_MAX_SIZE)
+                    })
+                    for parent_id in parent_ids
+                ))
         
-        # Get diseases with shared genes
+        # Search for diseases with shared genes
+        gene_symbols = []
         if relationship_type in ["all", "genes"] and "gene" in disease_result:
-            genes = disease_result["gene"]
-            genes = genes if isinstance(genes, list) else [genes]
+            genes = as_list(disease_result["gene"])
             
             gene_symbols = [g.get("symbol") for g in genes if g.get("symbol")][:5]  # Limit to 5 genes
             
             if gene_symbols:
-                gene_queries = [f"gene.symbol:{quote_lucene_phrase(symbol)}" for symbol in gene_symbols]
-                q = " OR ".join(gene_queries)
-                
-                params = {
-                    "q": q,
+                searches["genes"] = client.get("query", params={
+                    "q": lucene_any_of("gene.symbol", gene_symbols),
                     "fields": "_id,name,gene",
                     "size": size
-                }
-                
-                gene_result = await client.get("query", params=params)
-                
-                for hit in gene_result.get("hits", []):
-                    if hit.get("_id") != disease_id:
-                        # Find shared genes
-                        hit_genes = hit.get("gene", [])
-                        hit_genes = hit_genes if isinstance(hit_genes, list) else [hit_genes]
-                        hit_symbols = {g.get("symbol") for g in hit_genes}
-                        
-                        shared = set(gene_symbols) & hit_symbols
-                        if shared:
-                            related_diseases["related_by_genes"].append({
-                                "disease_id": hit.get("_id"),
-                                "disease_name": hit.get("name"),
-                                "shared_genes": list(shared),
-                                "shared_count": len(shared)
-                            })
+                })
         
-        # Get diseases with shared phenotypes
+        # Search for diseases with shared phenotypes
         if relationship_type in ["all", "phenotypes"] and "phenotype_related_to_disease" in disease_result:
-            phenotypes = disease_result["phenotype_related_to_disease"]
-            phenotypes = phenotypes if isinstance(phenotypes, list) else [phenotypes]
+            phenotypes = as_list(disease_result["phenotype_related_to_disease"])
             
             # Get top phenotypes
             hpo_ids = [p.get("hpo_id") for p in phenotypes if p.get("hpo_id")][:5]
             
             if hpo_ids:
-                pheno_queries = [
-                    f"phenotype_related_to_disease.hpo_id:{quote_lucene_phrase(hpo)}"
-                    for hpo in hpo_ids
-                ]
-                q = " OR ".join(pheno_queries)
-                
-                params = {
-                    "q": q,
-                    "fields": "_id,name,phenotype_related_to_disease",
+                searches["phenotypes"] = client.get("query", params={
+                    "q": lucene_any_of("phenotype_related_to_disease.hpo_id", hpo_ids),
+                    # Hits are only listed, so skip their phenotype annotations
+                    "fields": "_id,name",
                     "size": size
-                }
-                
-                pheno_result = await client.get("query", params=params)
-                
-                for hit in pheno_result.get("hits", []):
-                    if hit.get("_id") != disease_id:
-                        related_diseases["related_by_phenotypes"].append({
+                })
+        
+        responses = dict(zip(searches, await asyncio.gather(*searches.values())))
+        
+        if "hierarchy" in responses:
+            for parent_id, siblings_result in zip(parent_ids, responses["hierarchy"]):
+                siblings = [
+                    hit for hit in siblings_result.get("hits", [])
+                    if hit.get("_id") is not None and hit.get("_id") != disease_id
+                ]
+                related_diseases["related_by_hierarchy"].extend(
+                    {
+                        "disease_id": hit["_id"],
+                        "disease_name": hit.get("name"),
+                        "relationship": "sibling",
+                        "via_parent": parent_id
+                    }
+                    for hit in siblings[:size]
+                )
+        
+        if "genes" in responses:
+            query_gene_set = frozenset(gene_symbols)
+            for hit in responses["genes"].get("hits", []):
+                if hit.get("_id") != disease_id:
+                    # Find shared genes
+                    shared = query_gene_set.intersection(
+                        g.get("symbol") for g in as_list(hit.get("gene"))
+                    )
+                    if shared:
+                        related_diseases["related_by_genes"].append({
                             "disease_id": hit.get("_id"),
                             "disease_name": hit.get("name"),
-                            "relationship": "phenotypic_similarity"
+                            "shared_genes": list(shared),
+                            "shared_count": len(shared)
                         })
         
+        if "phenotypes" in responses:
+            for hit in responses["phenotypes"].get("hits", []):
+                if hit.get("_id") != disease_id:
+                    related_diseases["related_by_phenotypes"].append({
+                        "disease_id": hit.get("_id"),
+                        "disease_name": hit.get("name"),
+                        "relationship": "phenotypic_similarity"
+                    })
+        
         return {
             "success": True,
             "related_diseases": related_diseases
@@ -281,14 +282,123 @@ class OntologyApi:
             "path": []
         }
         
+        if direction == "up":
+            result = await client.get(
+                f"disease/{disease_id}",
+                params={"fields": "name,mondo.parents,mondo.ancestors"}
+            )
+            ancestors = (result.get("mondo") or {}).get("ancestors")
+            
+            if ancestors:
+                # Fetch every ancestor in one batch and walk first parents locally
+                # instead of one round-trip per level
+                ancestors = as_list(ancestors)
+                ancestor_ids = [
+                    a if isinstance(a, str) else a.get("id")
+                    for a in ancestors
+                ]
+                ancestor_ids = [a for a in ancestor_ids if a]
+                records = {}
+                if levels > 1 and ancestor_ids:
+                    batch = await client.post("disease", {
+                        "ids": ancestor_ids,
+                        "fields": "_id,name,mondo.parents"
+                    })
+                    records = {
+                        record.get("query") or record.get("_id"): record
+                        for record in batch
+                        if not record.get("notfound")
+                    }
+                
+                hierarchy["path"].append({
+                    "level": 0,
+                    "disease_id": disease_id,
+                    "disease_name": result.get("name")
+                })
+                
+                current = result
+                for level in range(levels):
+                    parents = as_list((current.get("mondo") or {}).get("parents"))
+                    if not parents:
+                        break
+                    
+                    next_item = parents[0]
+                    next_id = next_item.get("id")
+                    hierarchy["path"].append({
+                        "level": level + 1,
+                        "disease_id": next_id,
+                        "disease_name": next_item.get("label")
+                    })
+                    
+                    if level + 1 < levels:
+                        current = records.get(next_id) or await client.get(
+                            f"disease/{next_id}", params={"fields": "name,mondo.parents"}
+                        )
+                
+                return {
+                    "success": True,
+                    "hierarchy": hierarchy,
+                    "direction": direction
+                }
+        else:
+            # Walk down breadth-first, fetching each level's children in one batch
+            params = {"fields": "name,mondo.children"}
+            result = await client.get(f"disease/{disease_id}", params=params)
+            hierarchy["path"].append({
+                "level": 0,
+                "disease_id": disease_id,
+                "disease_name": result.get("name")
+            })
+            
+            records = [result]
+            seen = {disease_id}
+            fetched = 0
+            for level in range(levels):
+                children = {}
+                for record in records:
+                    for child in as_list((record.get("mondo") or {}).get("children")):
+                        child_id = child.get("id")
+                        if child_id and child_id not in seen and child_id not in children:
+                            children[child_id] = child.get("label")
+                if not children:
+                    break
+                
+                hierarchy["path"].append({
+                    "level": level + 1,
+                    "diseases": [
+                        {"disease_id": child_id, "disease_name": label}
+                        for child_id, label in children.items()
+                    ]
+                })
+                seen.update(children)
+                
+                # Stop expanding once the fetch budget is spent; the children
+                # found so far are still listed
+                child_ids = list(children)[:HIERARCHY_MAX_CHILDREN - fetched]
+                if level + 1 == levels or not child_ids:
+                    break
+                
+                fetched += len(child_ids)
+                batch = await client.post("disease", {
+                    "ids": child_ids,
+                    "fields": "_id,name,mondo.children"
+                })
+                records = [record for record in batch if not record.get("notfound")]
+            
+            return {
+                "success": True,
+                "hierarchy": hierarchy,
+                "direction": direction
+            }
+        
+        # Without ancestors, follow first parents one level at a time
         current_id = disease_id
+        params = {"fields": "name,mondo.parents"}
         
         for level in range(levels):
-            params = {
-                "fields": f"name,mondo.{'parents' if direction == 'up' else 'children'}"
-            }
-            
-            result = await client.get(f"disease/{current_id}", params=params)
+            # The starting record was already fetched above
+            if level > 0:
+                result = await client.get(f"disease/{current_id}", params=params)
             
             if level == 0:
                 hierarchy["path"].append({
@@ -297,36 +407,18 @@ class OntologyApi:
                     "disease_name": result.get("name")
                 })
             
-            if "mondo" in result:
-                mondo = result["mondo"]
-                next_level = mondo.get("parents" if direction == "up" else "children", [])
-                next_level = next_level if isinstance(next_level, list) else [next_level]
-                
-                if next_level:
-                    # For parents, usually take the first one
-                    # For children, return all
-                    if direction == "up" and next_level:
-                        next_item = next_level[0]
-                        hierarchy["path"].append({
-                            "level": level + 1,
-                            "disease_id": next_item.get("id"),
-                            "disease_name": next_item.get("label")
-                        })
-                        current_id = next_item.get("id")
-                    else:
-                        hierarchy["path"].append({
-                            "level": level + 1,
-                            "diseases": [
-                                {
-                                    "disease_id": item.get("id"),
-                                    "disease_name": item.get("label")
-                                }
-                                for item in next_level
-                            ]
-                        })
-                        break
-                else:
-                    break
+            parents = as_list((result.get("mondo") or {}).get("parents"))
+            if not parents:
+                break
+            
+            # For parents, usually take the first one
+            next_item = parents[0]
+            hierarchy["path"].append({
+                "level": level + 1,
+                "disease_id": next_item.get("id"),
+                "disease_name": next_item.get("label")
+            })
+            current_id = next_item.get("id")
         
         return {
             "success": True,
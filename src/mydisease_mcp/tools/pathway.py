@@ -1,9 +1,32 @@
 """Pathway and biological process tools."""
 
+import asyncio
+import heapq
+from collections import defaultdict
+from itertools import chain
+from operator import itemgetter
 from typing import Any, Dict, Optional, List
 import mcp.types as types
 from ..client import MyDiseaseClient
-from ._query_utils import quote_lucene_phrase
+from ._query_utils import lucene_any_of, quote_lucene_phrase
+from ._record_utils import as_list
+
+# Shared projection for per-disease pathway lookups, so the client cache can
+# serve both pathway views of a disease from one fetched document.
+PATHWAY_DISEASE_FIELDS = "gene,pathway,kegg_pathway,reactome_pathway,wikipathways"
+
+# Genes per enrichment query; longer gene lists are split into concurrent queries
+ENRICHMENT_QUERY_TERMS = 50
+ENRICHMENT_CONCURRENCY = 8
+
+# Source-specific pathway fields and the source name they are reported under
+_SOURCED_PATHWAY_FIELDS = (
+    ("kegg_pathway", "kegg"),
+    ("reactome_pathway", "reactome"),
+    ("wikipathways", "wikipathways"),
+)
+# Every pathway field searched on a hit, including the untyped general field
+_PATHWAY_FIELD_SOURCES = (("pathway", "pathway"),) + _SOURCED_PATHWAY_FIELDS
 
 
 class PathwayApi:
@@ -17,60 +40,34 @@ class PathwayApi:
     ) -> Dict[str, Any]:
         """Get pathways associated with a disease."""
         params = {
-            "fields": "pathway,kegg_pathway,reactome_pathway,wikipathways"
+            "fields": PATHWAY_DISEASE_FIELDS
         }
         
         result = await client.get(f"disease/{disease_id}", params=params)
         
-        pathways = {
-            "disease_id": disease_id,
-            "all_pathways": [],
-            "pathways_by_source": {}
-        }
+        all_pathways: List[Dict[str, Any]] = []
+        by_source: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         
         # Extract general pathway data
-        if "pathway" in result:
-            pathway_data = result["pathway"]
-            pathway_data = pathway_data if isinstance(pathway_data, list) else [pathway_data]
-            
-            for pathway in pathway_data:
-                if source is None or pathway.get("source") == source:
-                    pathways["all_pathways"].append(pathway)
-                    
-                    src = pathway.get("source", "unknown")
-                    if src not in pathways["pathways_by_source"]:
-                        pathways["pathways_by_source"][src] = []
-                    pathways["pathways_by_source"][src].append(pathway)
+        for pathway in as_list(result.get("pathway")):
+            if source is None or pathway.get("source") == source:
+                all_pathways.append(pathway)
+                by_source[pathway.get("source", "unknown")].append(pathway)
         
-        # Extract KEGG pathways
-        if "kegg_pathway" in result and (source is None or source == "kegg"):
-            kegg = result["kegg_pathway"]
-            kegg = kegg if isinstance(kegg, list) else [kegg]
-            
-            pathways["pathways_by_source"]["kegg"] = kegg
-            pathways["all_pathways"].extend([
-                {**p, "source": "kegg"} for p in kegg
-            ])
-        
-        # Extract Reactome pathways
-        if "reactome_pathway" in result and (source is None or source == "reactome"):
-            reactome = result["reactome_pathway"]
-            reactome = reactome if isinstance(reactome, list) else [reactome]
-            
-            pathways["pathways_by_source"]["reactome"] = reactome
-            pathways["all_pathways"].extend([
-                {**p, "source": "reactome"} for p in reactome
-            ])
+        # Extract KEGG, Reactome and WikiPathways entries, tagging each with its source
+        for field, field_source in _SOURCED_PATHWAY_FIELDS:
+            entries = result.get(field)
+            if entries is not None and (source is None or source == field_source):
+                entries = as_list(entries)
+                by_source[field_source] = entries
+                # Copy rather than tag in place: the record may be a shared cache entry
+                all_pathways.extend([dict(p, source=field_source) for p in entries])
         
-        # Extract WikiPathways
-        if "wikipathways" in result and (source is None or source == "wikipathways"):
-            wiki = result["wikipathways"]
-            wiki = wiki if isinstance(wiki, list) else [wiki]
-            
-            pathways["pathways_by_source"]["wikipathways"] = wiki
-            pathways["all_pathways"].extend([
-                {**p, "source": "wikipathways"} for p in wiki
-            ])
+        pathways = {
+            "disease_id": disease_id,
+            "all_pathways": all_pathways,
+            "pathways_by_source": dict(by_source)
+        }
         
         return {
             "success": True,
@@ -118,30 +115,27 @@ class PathwayApi:
         
         # Process results
         diseases = []
+        name_needle = pathway_name.lower() if pathway_name else None
         for hit in result.get("hits", []):
-            disease_info = {
-                "disease_id": hit.get("_id"),
-                "disease_name": hit.get("name"),
-                "pathway_associations": []
-            }
+            associations = []
             
             # Check all pathway fields
-            for field in ["pathway", "kegg_pathway", "reactome_pathway", "wikipathways"]:
-                if field in hit:
-                    pathways = hit[field]
-                    pathways = pathways if isinstance(pathways, list) else [pathways]
-                    
-                    for pathway in pathways:
-                        if (pathway.get("id") == pathway_id or 
-                            (pathway_name and pathway_name.lower() in pathway.get("name", "").lower())):
-                            disease_info["pathway_associations"].append({
-                                "source": field.replace("_pathway", ""),
-                                "pathway_id": pathway.get("id"),
-                                "pathway_name": pathway.get("name")
-                            })
+            for field, field_source in _PATHWAY_FIELD_SOURCES:
+                for pathway in as_list(hit.get(field)):
+                    if (pathway.get("id") == pathway_id or
+                        (name_needle and name_needle in pathway.get("name", "").lower())):
+                        associations.append({
+                            "source": field_source,
+                            "pathway_id": pathway.get("id"),
+                            "pathway_name": pathway.get("name")
+                        })
             
-            if disease_info["pathway_associations"]:
-                diseases.append(disease_info)
+            if associations:
+                diseases.append({
+                    "disease_id": hit.get("_id"),
+                    "disease_name": hit.get("name"),
+                    "pathway_associations": associations
+                })
         
         return {
             "success": True,
@@ -160,58 +154,33 @@ class PathwayApi:
     ) -> Dict[str, Any]:
         """Get genes involved in disease pathways."""
         params = {
-            "fields": "gene,pathway,kegg_pathway.genes,reactome_pathway.genes"
+            "fields": PATHWAY_DISEASE_FIELDS
         }
         
         result = await client.get(f"disease/{disease_id}", params=params)
         
-        pathway_genes = {
-            "disease_id": disease_id,
-            "disease_genes": [],
-            "pathway_specific_genes": {},
-            "all_pathway_genes": set()
-        }
-        
         # Get disease genes
-        if "gene" in result:
-            genes = result["gene"]
-            genes = genes if isinstance(genes, list) else [genes]
-            pathway_genes["disease_genes"] = [g.get("symbol") for g in genes if g.get("symbol")]
+        disease_genes = [g.get("symbol") for g in as_list(result.get("gene")) if g.get("symbol")]
         
-        # Extract genes from pathways
-        if "kegg_pathway" in result:
-            kegg = result["kegg_pathway"]
-            kegg = kegg if isinstance(kegg, list) else [kegg]
-            
-            for pathway in kegg:
-                if "genes" in pathway:
-                    pathway_id = pathway.get("id")
-                    genes = pathway["genes"]
-                    genes = genes if isinstance(genes, list) else [genes]
-                    
-                    pathway_genes["pathway_specific_genes"][pathway_id] = genes
-                    pathway_genes["all_pathway_genes"].update(genes)
+        # Extract genes from KEGG and Reactome pathways
+        gene_lists = [
+            (pathway.get("id"), as_list(genes))
+            for pathway in chain(
+                as_list(result.get("kegg_pathway")), as_list(result.get("reactome_pathway"))
+            )
+            if (genes := pathway.get("genes")) is not None
+        ]
+        pathway_specific_genes = dict(gene_lists)
+        all_pathway_genes = set(chain.from_iterable(genes for _, genes in gene_lists))
         
-        if "reactome_pathway" in result:
-            reactome = result["reactome_pathway"]
-            reactome = reactome if isinstance(reactome, list) else [reactome]
-            
-            for pathway in reactome:
-                if "genes" in pathway:
-                    pathway_id = pathway.get("id")
-                    genes = pathway["genes"]
-                    genes = genes if isinstance(genes, list) else [genes]
-                    
-                    pathway_genes["pathway_specific_genes"][pathway_id] = genes
-                    pathway_genes["all_pathway_genes"].update(genes)
-        
-        # Convert set to list
-        pathway_genes["all_pathway_genes"] = list(pathway_genes["all_pathway_genes"])
-        
-        # Find overlap between disease genes and pathway genes
-        disease_gene_set = set(pathway_genes["disease_genes"])
-        pathway_gene_set = set(pathway_genes["all_pathway_genes"])
-        pathway_genes["overlapping_genes"] = list(disease_gene_set & pathway_gene_set)
+        pathway_genes = {
+            "disease_id": disease_id,
+            "disease_genes": disease_genes,
+            "pathway_specific_genes": pathway_specific_genes,
+            "all_pathway_genes": list(all_pathway_genes),
+            # Overlap between disease genes and pathway genes
+            "overlapping_genes": list(all_pathway_genes.intersection(disease_genes))
+        }
         
         return {
             "success": True,
@@ -226,91 +195,99 @@ class PathwayApi:
         size: int = 20
     ) -> Dict[str, Any]:
         """Find diseases with pathways enriched for given gene list."""
-        # Search for diseases associated with these genes
-        gene_queries = [f"gene.symbol:{quote_lucene_phrase(gene)}" for gene in gene_list]
-        q = " OR ".join(gene_queries)
+        # Search for diseases associated with these genes, keeping each query
+        # to a bounded number of OR'd terms
+        chunks = [
+            gene_list[i:i + ENRICHMENT_QUERY_TERMS]
+            for i in range(0, len(gene_list), ENRICHMENT_QUERY_TERMS)
+        ]
+        semaphore = asyncio.Semaphore(ENRICHMENT_CONCURRENCY)
         
-        params = {
-            "q": q,
-            "fields": "_id,name,gene,pathway,kegg_pathway",
-            "size": 100
-        }
+        async def query_chunk(genes: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await client.get("query", params={
+                    "q": lucene_any_of("gene.symbol", genes),
+                    "fields": "_id,name,gene,pathway,kegg_pathway",
+                    "size": 100
+                })
         
-        result = await client.get("query", params=params)
+        responses = await asyncio.gather(*(query_chunk(chunk) for chunk in chunks))
+        
+        # A disease matching genes from several chunks is analyzed once
+        hits: Dict[Any, Dict[str, Any]] = {}
+        for response in responses:
+            for hit in response.get("hits", []):
+                hits.setdefault(hit.get("_id"), hit)
         
         # Analyze pathway enrichment
         pathway_counts = {}
         disease_pathways = {}
+        query_genes = frozenset(gene_list)
         
-        for hit in result.get("hits", []):
+        for hit in hits.values():
             disease_id = hit.get("_id")
             
             # Count genes per disease
-            if "gene" in hit:
-                genes = hit["gene"]
-                genes = genes if isinstance(genes, list) else [genes]
-                gene_symbols = {g.get("symbol") for g in genes if g.get("symbol")}
+            genes = hit.get("gene")
+            if genes is not None:
+                gene_symbols = {g.get("symbol") for g in as_list(genes) if g.get("symbol")}
                 
-                overlap = len(set(gene_list) & gene_symbols)
+                overlap = len(query_genes & gene_symbols)
                 
                 if overlap > 0:
                     # Extract pathways
-                    pathways = []
-                    
-                    if "pathway" in hit:
-                        pw = hit["pathway"]
-                        pw = pw if isinstance(pw, list) else [pw]
-                        pathways.extend(pw)
-                    
-                    if "kegg_pathway" in hit:
-                        kegg = hit["kegg_pathway"]
-                        kegg = kegg if isinstance(kegg, list) else [kegg]
-                        pathways.extend(kegg)
+                    pathways = as_list(hit.get("pathway")) + as_list(hit.get("kegg_pathway"))
                     
                     for pathway in pathways:
                         pathway_id = pathway.get("id") or pathway.get("name")
                         if pathway_id:
-                            if pathway_id not in pathway_counts:
-                                pathway_counts[pathway_id] = {
+                            counts = pathway_counts.get(pathway_id)
+                            if counts is None:
+                                counts = pathway_counts[pathway_id] = {
                                     "count": 0,
                                     "diseases": [],
                                     "pathway_name": pathway.get("name")
                                 }
                             
-                            pathway_counts[pathway_id]["count"] += overlap
-                            pathway_counts[pathway_id]["diseases"].append({
+                            counts["count"] += overlap
+                            counts["diseases"].append({
                                 "disease_id": disease_id,
                                 "disease_name": hit.get("name"),
                                 "gene_overlap": overlap
                             })
         
         # Calculate enrichment scores (simplified)
-        enriched_pathways = []
         total_genes = len(gene_list)
+        scored = []
         
         for pathway_id, data in pathway_counts.items():
             # Simple enrichment score based on gene overlap
             enrichment_score = data["count"] / total_genes
             
             if enrichment_score >= p_value_cutoff:
-                enriched_pathways.append({
-                    "pathway_id": pathway_id,
-                    "pathway_name": data["pathway_name"],
-                    "enrichment_score": round(enrichment_score, 3),
-                    "gene_count": data["count"],
-                    "disease_count": len(data["diseases"]),
-                    "diseases": data["diseases"][:5]  # Top 5 diseases
-                })
+                scored.append((round(enrichment_score, 3), pathway_id, data))
         
-        # Sort by enrichment score
-        enriched_pathways.sort(key=lambda x: x["enrichment_score"], reverse=True)
+        # Keep the top pathways by enrichment score; only those are rendered
+        enriched_pathways = [
+            {
+                "pathway_id": pathway_id,
+                "pathway_name": data["pathway_name"],
+                "enrichment_score": enrichment_score,
+                "gene_count": data["count"],
+                "disease_count": len(data["diseases"]),
+                "diseases": data["diseases"][:5]  # Top 5 diseases
+            }
+            for enrichment_score, pathway_id, data in heapq.nlargest(
+                max(size, 0), scored, key=itemgetter(0)
+            )
+        ]
         
         return {
             "success": True,
             "query_genes": gene_list,
             "total_genes": total_genes,
             "p_value_cutoff": p_value_cutoff,
-            "enriched_pathways": enriched_pathways[:size]
+            "enriched_pathways": enriched_pathways
         }
 
 
@@ -1,9 +1,33 @@
 """Phenotype and clinical feature tools."""
 
+import asyncio
 from typing import Any, Dict, Optional, List
 import mcp.types as types
 from ..client import MyDiseaseClient
-from ._query_utils import quote_lucene_phrase
+from ._query_utils import lucene_any_of, quote_lucene_phrase
+from ._record_utils import as_list
+
+# Shared projection for per-disease phenotype lookups, so the client cache can
+# serve both phenotype views of a disease from one fetched document.
+PHENOTYPE_DISEASE_FIELDS = "hpo,phenotype_related_to_disease,clinical_features"
+
+# Phenotypes per similarity query; longer lists are split into concurrent queries
+SIMILARITY_QUERY_TERMS = 50
+SIMILARITY_CONCURRENCY = 8
+
+
+def _phenotype_any_of(phenotypes: List[str]) -> str:
+    """Match diseases carrying any of the given HPO IDs or phenotype names."""
+    hpo_ids = [p for p in phenotypes if p.startswith("HP:")]
+    names = [p for p in phenotypes if not p.startswith("HP:")]
+    clauses = []
+    if hpo_ids:
+        clauses.append(lucene_any_of("hpo.hpo_id", hpo_ids))
+        clauses.append(lucene_any_of("phenotype_related_to_disease.hpo_id", hpo_ids))
+    if names:
+        clauses.append(lucene_any_of("hpo.phenotype_name", names))
+        clauses.append(lucene_any_of("phenotype_related_to_disease.hpo_phenotype", names))
+    return " OR ".join(clauses)
 
 
 class PhenotypeApi:
@@ -17,7 +41,7 @@ class PhenotypeApi:
     ) -> Dict[str, Any]:
         """Get phenotypes/clinical features for a disease."""
         params = {
-            "fields": "hpo,phenotype_related_to_disease,clinical_features"
+            "fields": PHENOTYPE_DISEASE_FIELDS
         }
         
         result = await client.get(f"disease/{disease_id}", params=params)
@@ -29,31 +53,24 @@ class PhenotypeApi:
         }
         
         # Extract HPO phenotypes
-        if "hpo" in result:
-            hpo_data = result["hpo"]
+        hpo_data = result.get("hpo")
+        if hpo_data is not None:
             if isinstance(hpo_data, list):
                 phenotypes["hpo_phenotypes"] = hpo_data
             elif isinstance(hpo_data, dict) and "phenotype" in hpo_data:
                 phenotypes["hpo_phenotypes"] = hpo_data["phenotype"]
         
         # Extract phenotype relations
-        if "phenotype_related_to_disease" in result:
-            pheno_rel = result["phenotype_related_to_disease"]
-            pheno_rel = pheno_rel if isinstance(pheno_rel, list) else [pheno_rel]
-            
-            for rel in pheno_rel:
-                phenotypes["clinical_features"].append({
-                    "hpo_id": rel.get("hpo_id"),
-                    "hpo_term": rel.get("hpo_phenotype"),
-                    "frequency": rel.get("frequency") if include_frequency else None,
-                    "source": rel.get("source")
-                })
+        for rel in as_list(result.get("phenotype_related_to_disease")):
+            phenotypes["clinical_features"].append({
+                "hpo_id": rel.get("hpo_id"),
+                "hpo_term": rel.get("hpo_phenotype"),
+                "frequency": rel.get("frequency") if include_frequency else None,
+                "source": rel.get("source")
+            })
         
         # Extract general clinical features
-        if "clinical_features" in result:
-            features = result["clinical_features"]
-            features = features if isinstance(features, list) else [features]
-            phenotypes["clinical_features"].extend(features)
+        phenotypes["clinical_features"].extend(as_list(result.get("clinical_features")))
         
         return {
             "success": True,
@@ -89,46 +106,35 @@ class PhenotypeApi:
         # Process results
         diseases = []
         for hit in result.get("hits", []):
-            disease_info = {
-                "disease_id": hit.get("_id"),
-                "disease_name": hit.get("name"),
-                "phenotype_matches": []
-            }
-            
-            # Check HPO matches
-            if "hpo" in hit:
-                hpo = hit["hpo"]
-                if isinstance(hpo, dict) and hpo.get("hpo_id") == hpo_id:
-                    disease_info["phenotype_matches"].append({
-                        "source": "hpo",
-                        "hpo_id": hpo_id,
-                        "match_type": "exact"
-                    })
-                elif isinstance(hpo, list):
-                    for item in hpo:
-                        if item.get("hpo_id") == hpo_id or item.get("phenotype_name") == hpo_id:
-                            disease_info["phenotype_matches"].append({
-                                "source": "hpo",
-                                "hpo_id": item.get("hpo_id"),
-                                "match_type": "exact"
-                            })
+            # Check HPO matches; a single HPO object is treated as a one-item list
+            matches = [
+                {
+                    "source": "hpo",
+                    "hpo_id": item.get("hpo_id"),
+                    "match_type": "exact"
+                }
+                for item in as_list(hit.get("hpo"))
+                if item.get("hpo_id") == hpo_id or item.get("phenotype_name") == hpo_id
+            ]
             
             # Check phenotype relations
-            if "phenotype_related_to_disease" in hit:
-                relations = hit["phenotype_related_to_disease"]
-                relations = relations if isinstance(relations, list) else [relations]
-                
-                for rel in relations:
-                    if rel.get("hpo_id") == hpo_id or rel.get("hpo_phenotype") == hpo_id:
-                        disease_info["phenotype_matches"].append({
-                            "source": "phenotype_relation",
-                            "hpo_id": rel.get("hpo_id"),
-                            "frequency": rel.get("frequency"),
-                            "match_type": "exact"
-                        })
+            matches.extend(
+                {
+                    "source": "phenotype_relation",
+                    "hpo_id": rel.get("hpo_id"),
+                    "frequency": rel.get("frequency"),
+                    "match_type": "exact"
+                }
+                for rel in as_list(hit.get("phenotype_related_to_disease"))
+                if rel.get("hpo_id") == hpo_id or rel.get("hpo_phenotype") == hpo_id
+            )
             
-            if disease_info["phenotype_matches"]:
-                diseases.append(disease_info)
+            if matches:
+                diseases.append({
+                    "disease_id": hit.get("_id"),
+                    "disease_name": hit.get("name"),
+                    "phenotype_matches": matches
+                })
         
         return {
             "success": True,
@@ -146,57 +152,54 @@ class PhenotypeApi:
         size: int = 20
     ) -> Dict[str, Any]:
         """Find diseases with similar phenotype profiles."""
-        # First, search for diseases with any of the phenotypes
-        phenotype_queries = []
-        for phenotype in phenotype_list:
-            phenotype_term = quote_lucene_phrase(phenotype)
-            if phenotype.startswith("HP:"):
-                phenotype_queries.append(f"hpo.hpo_id:{phenotype_term}")
-                phenotype_queries.append(f"phenotype_related_to_disease.hpo_id:{phenotype_term}")
-            else:
-                phenotype_queries.append(f"hpo.phenotype_name:{phenotype_term}")
-                phenotype_queries.append(
-                    f"phenotype_related_to_disease.hpo_phenotype:{phenotype_term}"
-                )
+        # First, search for diseases with any of the phenotypes, keeping each
+        # query to a bounded number of terms
+        unique_phenotypes = list(dict.fromkeys(phenotype_list))
+        chunks = [
+            unique_phenotypes[i:i + SIMILARITY_QUERY_TERMS]
+            for i in range(0, len(unique_phenotypes), SIMILARITY_QUERY_TERMS)
+        ]
+        semaphore = asyncio.Semaphore(SIMILARITY_CONCURRENCY)
         
-        q = " OR ".join(phenotype_queries)
+        async def query_chunk(phenotypes: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await client.get("query", params={
+                    "q": _phenotype_any_of(phenotypes),
+                    "fields": "_id,name,hpo,phenotype_related_to_disease",
+                    "size": 100  # Get more results for similarity calculation
+                })
         
-        params = {
-            "q": q,
-            "fields": "_id,name,hpo,phenotype_related_to_disease",
-            "size": 100  # Get more results for similarity calculation
-        }
+        responses = await asyncio.gather(*(query_chunk(chunk) for chunk in chunks))
         
-        result = await client.get("query", params=params)
+        # A disease matching phenotypes from several chunks is scored once
+        hits: Dict[Any, Dict[str, Any]] = {}
+        for response in responses:
+            for hit in response.get("hits", []):
+                hits.setdefault(hit.get("_id"), hit)
         
         # Calculate similarity scores
         disease_scores = []
+        query_phenotypes = frozenset(phenotype_list)
         
-        for hit in result.get("hits", []):
-            disease_phenotypes = set()
-            
+        for hit in hits.values():
             # Extract all phenotypes for this disease
-            if "hpo" in hit:
-                hpo = hit["hpo"]
-                if isinstance(hpo, dict):
-                    disease_phenotypes.add(hpo.get("hpo_id") or hpo.get("phenotype_name"))
-                elif isinstance(hpo, list):
-                    for h in hpo:
-                        disease_phenotypes.add(h.get("hpo_id") or h.get("phenotype_name"))
-            
-            if "phenotype_related_to_disease" in hit:
-                relations = hit["phenotype_related_to_disease"]
-                relations = relations if isinstance(relations, list) else [relations]
-                for rel in relations:
-                    disease_phenotypes.add(rel.get("hpo_id") or rel.get("hpo_phenotype"))
+            disease_phenotypes = {
+                h.get("hpo_id") or h.get("phenotype_name") for h in as_list(hit.get("hpo"))
+            }
+            disease_phenotypes.update(
+                rel.get("hpo_id") or rel.get("hpo_phenotype")
+                for rel in as_list(hit.get("phenotype_related_to_disease"))
+            )
+            disease_phenotypes.discard(None)
             
             # Calculate similarity
+            matching = query_phenotypes & disease_phenotypes
+            intersection = len(matching)
             if algorithm == "jaccard":
-                intersection = len(set(phenotype_list) & disease_phenotypes)
-                union = len(set(phenotype_list) | disease_phenotypes)
+                # The union size is |A| + |B| - |A & B|, so no union set is built
+                union = len(query_phenotypes) + len(disease_phenotypes) - intersection
                 similarity = intersection / union if union > 0 else 0
             else:  # dice
-                intersection = len(set(phenotype_list) & disease_phenotypes)
                 similarity = (2 * intersection) / (len(phenotype_list) + len(disease_phenotypes))
             
             if similarity >= min_similarity:
@@ -204,7 +207,7 @@ class PhenotypeApi:
                     "disease_id": hit.get("_id"),
                     "disease_name": hit.get("name"),
                     "similarity_score": round(similarity, 3),
-                    "matching_phenotypes": list(set(phenotype_list) & disease_phenotypes),
+                    "matching_phenotypes": list(matching),
                     "total_phenotypes": len(disease_phenotypes)
                 })
         
@@ -228,32 +231,31 @@ class PhenotypeApi:
     ) -> Dict[str, Any]:
         """Get frequency information for a phenotype in a disease."""
         params = {
-            "fields": "phenotype_related_to_disease,hpo"
+            "fields": PHENOTYPE_DISEASE_FIELDS
         }
         
         result = await client.get(f"disease/{disease_id}", params=params)
         
+        # Check phenotype relations, stopping at the first match
+        rel = next(
+            (
+                r for r in as_list(result.get("phenotype_related_to_disease"))
+                if r.get("hpo_id") == phenotype_id or r.get("hpo_phenotype") == phenotype_id
+            ),
+            None
+        )
+        
         frequency_data = {
             "disease_id": disease_id,
             "phenotype_id": phenotype_id,
-            "frequency_info": None
+            "frequency_info": None if rel is None else {
+                "frequency": rel.get("frequency"),
+                "frequency_hp": rel.get("frequency_hp"),
+                "source": rel.get("source"),
+                "evidence": rel.get("evidence")
+            }
         }
         
-        # Check phenotype relations
-        if "phenotype_related_to_disease" in result:
-            relations = result["phenotype_related_to_disease"]
-            relations = relations if isinstance(relations, list) else [relations]
-            
-            for rel in relations:
-                if rel.get("hpo_id") == phenotype_id or rel.get("hpo_phenotype") == phenotype_id:
-                    frequency_data["frequency_info"] = {
-                        "frequency": rel.get("frequency"),
-                        "frequency_hp": rel.get("frequency_hp"),
-                        "source": rel.get("source"),
-                        "evidence": rel.get("evidence")
-                    }
-                    break
-        
         return {
             "success": True,
             "frequency": frequency_data
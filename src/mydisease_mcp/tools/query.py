@@ -1,6 +1,7 @@
 """Disease query tools."""
 
-from typing import Any, Dict, Optional, List
+from functools import lru_cache
+from typing import Any, Dict, Optional, List, Tuple
 import mcp.types as types
 from ..client import MyDiseaseClient
 from ._query_utils import (
@@ -10,6 +11,47 @@ from ._query_utils import (
 )
 
 
+# Projection used by search_disease when the caller does not pick fields
+DEFAULT_SEARCH_FIELDS = "_id,name,mondo,orphanet,omim,umls.cui,disgenet"
+
+# Corpus-wide facet counts only move with MyDisease data releases
+FIELD_STATISTICS_CACHE_TTL = 6 * 3600
+
+
+@lru_cache(maxsize=256)
+def _build_field_q(field_queries: Tuple[Tuple[str, str], ...], operator: str) -> str:
+    """Join field:value clauses with a boolean operator."""
+    return f" {operator} ".join(
+        f"{validate_lucene_field_name(field)}:{maybe_quote_field_value(value)}"
+        for field, value in field_queries
+    )
+
+
+# One parenthesised clause per phenotype; {0} is the quoted phrase
+_PHENOTYPE_CLAUSE = "(hpo.phenotype_name:{0} OR phenotype_related_to_disease.hpo_phenotype:{0})"
+
+
+@lru_cache(maxsize=256)
+def _build_phenotype_q(phenotypes: Tuple[str, ...], match_all: bool) -> str:
+    """Match each phenotype against HPO names and phenotype relations."""
+    operator = " AND " if match_all else " OR "
+    render = _PHENOTYPE_CLAUSE.format
+    return operator.join(render(quote_lucene_phrase(phenotype)) for phenotype in phenotypes)
+
+
+def _format_range_bound(value: Any) -> str:
+    """Render a range bound, quoting anything that is not numeric or a wildcard."""
+    if value == "*":
+        return "*"
+    if isinstance(value, (int, float)):
+        return str(value)
+    text = str(value)
+    numeric_text = text.replace(".", "", 1).replace("-", "", 1)
+    if numeric_text.isdigit():
+        return text
+    return quote_lucene_phrase(text)
+
+
 class QueryApi:
     """Tools for querying diseases."""
     
@@ -17,7 +59,7 @@ class QueryApi:
         self,
         client: MyDiseaseClient,
         q: str,
-        fields: Optional[str] = "_id,name,mondo,orphanet,omim,umls.cui,disgenet",
+        fields: Optional[str] = DEFAULT_SEARCH_FIELDS,
         size: Optional[int] = 10,
         from_: Optional[int] = None,
         sort: Optional[str] = None,
@@ -57,13 +99,10 @@ class QueryApi:
         size: Optional[int] = 10
     ) -> Dict[str, Any]:
         """Search by specific fields with boolean operators."""
-        query_parts = []
-        for field, value in field_queries.items():
-            query_parts.append(
-                f"{validate_lucene_field_name(field)}:{maybe_quote_field_value(str(value))}"
-            )
-        
-        q = f" {operator} ".join(query_parts)
+        q = _build_field_q(
+            tuple((field, str(value)) for field, value in field_queries.items()),
+            operator
+        )
         
         return await self.search_disease(
             client=client,
@@ -87,10 +126,15 @@ class QueryApi:
             "size": 0
         }
         
-        result = await client.get("query", params=params)
+        result = await client.get(
+            "query", params=params, cache_ttl=FIELD_STATISTICS_CACHE_TTL
+        )
         
         facet_data = result.get("facets", {}).get(field_name, {})
         terms = facet_data.get("terms", [])
+        total = result.get("total", 0)
+        # One division up front instead of one per facet term
+        scale = 100.0 / max(total, 1)
         
         return {
             "success": True,
@@ -100,11 +144,11 @@ class QueryApi:
                 {
                     "value": term["term"],
                     "count": term["count"],
-                    "percentage": round(term["count"] / result.get("total", 1) * 100, 2)
+                    "percentage": round(term["count"] * scale, 2)
                 }
                 for term in terms
             ],
-            "total_diseases": result.get("total", 0)
+            "total_diseases": total
         }
     
     async def search_by_phenotype(
@@ -117,15 +161,7 @@ class QueryApi:
     ) -> Dict[str, Any]:
         """Search diseases by phenotype/symptom terms."""
         # Build query for phenotypes
-        phenotype_queries = []
-        for phenotype in phenotypes:
-            escaped = quote_lucene_phrase(phenotype)
-            phenotype_queries.append(
-                f"hpo.phenotype_name:{escaped} OR phenotype_related_to_disease.hpo_phenotype:{escaped}"
-            )
-        
-        operator = " AND " if match_all else " OR "
-        q = operator.join([f"({pq})" for pq in phenotype_queries])
+        q = _build_phenotype_q(tuple(phenotypes), match_all)
         
         return await self.search_disease(
             client=client,
@@ -158,18 +194,6 @@ class QueryApi:
                 field = validate_lucene_field_name(criterion["field"])
                 min_val = criterion.get("min", "*")
                 max_val = criterion.get("max", "*")
-
-                def _format_range_bound(value: Any) -> str:
-                    if value == "*":
-                        return "*"
-                    if isinstance(value, (int, float)):
-                        return str(value)
-                    text = str(value)
-                    numeric_text = text.replace(".", "", 1).replace("-", "", 1)
-                    if numeric_text.isdigit():
-                        return text
-                    return quote_lucene_phrase(text)
-
                 query_parts.append(
                     f"{field}:[{_format_range_bound(min_val)} TO {_format_range_bound(max_val)}]"
                 )
@@ -212,7 +236,7 @@ QUERY_TOOLS = [
                 "fields": {
                     "type": "string",
                     "description": "Comma-separated fields to return",
-                    "default": "_id,name,mondo,orphanet,omim,umls.cui,disgenet"
+                    "default": DEFAULT_SEARCH_FIELDS
                 },
                 "size": {
                     "type": "integer",
@@ -2,8 +2,117 @@
 
 from typing import Any, Dict, Optional, List
 import mcp.types as types
-from ..client import MyDiseaseClient
+from ..client import MyDiseaseClient, MyDiseaseError
 from ._query_utils import quote_lucene_phrase
+from ._record_utils import as_list
+from .batch import MAX_BATCH_SIZE
+
+VARIANT_DISEASE_FIELDS = "clinvar.variant,pathogenic_variants,gwas_catalog"
+VARIANT_HIT_FIELDS = "_id,name,clinvar.variant,pathogenic_variants,gwas_catalog"
+# Every field a variant ID can match, for multi-variant POST /query lookups
+VARIANT_ID_SCOPES = "clinvar.variant.rsid,gwas_catalog.rsid,clinvar.variant.hgvs,pathogenic_variants.hgvs"
+
+
+def _clinvar_variants(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return a record's ClinVar variant entries as a list."""
+    clinvar = record.get("clinvar")
+    return as_list(clinvar.get("variant")) if type(clinvar) is dict else []
+
+
+def _variant_id_key(variant_id: str) -> str:
+    """Name the variant field an ID is compared against: rsIDs vs HGVS notation."""
+    return "rsid" if variant_id.startswith("rs") else "hgvs"
+
+
+def _variant_associations(
+    hit: Dict[str, Any],
+    variant_id: str,
+    id_key: str
+) -> List[Dict[str, Any]]:
+    """Collect the ClinVar, pathogenic and GWAS entries of a hit that match a variant.
+    
+    Pathogenic entries are keyed by HGVS and GWAS entries by rsID, so only the
+    source matching ``id_key`` is scanned.
+    """
+    # Extract ClinVar variants
+    associations = [
+        {
+            "source": "clinvar",
+            "variant_id": var.get("rsid") or var.get("hgvs"),
+            "clinical_significance": var.get("clinical_significance"),
+            "review_status": var.get("review_status")
+        }
+        for var in _clinvar_variants(hit)
+        if var.get(id_key) == variant_id
+    ]
+    
+    if id_key == "hgvs":
+        # Extract pathogenic variants
+        associations.extend(
+            {
+                "source": "pathogenic_db",
+                "variant_id": var.get("hgvs"),
+                "pathogenicity": "pathogenic"
+            }
+            for var in as_list(hit.get("pathogenic_variants"))
+            if var.get("hgvs") == variant_id
+        )
+        return associations
+    
+    # Extract GWAS catalog
+    associations.extend(
+        {
+            "source": "gwas",
+            "variant_id": variant_id,
+            "p_value": gwas.get("p_value"),
+            "trait": gwas.get("trait")
+        }
+        for gwas in as_list(hit.get("gwas_catalog"))
+        if gwas.get("rsid") == variant_id
+    )
+    
+    return associations
+
+
+def _disease_variants(
+    result: Dict[str, Any],
+    disease_id: str,
+    pathogenicity_filter: Optional[str]
+) -> Dict[str, Any]:
+    """Split a disease record's variant fields into ClinVar, pathogenic and GWAS lists."""
+    variants = {
+        "disease_id": disease_id,
+        "clinvar_variants": [],
+        "pathogenic_variants": [],
+        "gwas_variants": []
+    }
+    
+    # Extract ClinVar variants, lowering the filter and binding append once
+    wanted = pathogenicity_filter.lower() if pathogenicity_filter is not None else None
+    append = variants["clinvar_variants"].append
+    for var in _clinvar_variants(result):
+        get = var.get
+        if wanted is None or get("clinical_significance", "").lower() == wanted:
+            append({
+                "rsid": get("rsid"),
+                "hgvs": get("hgvs"),
+                "gene": get("gene"),
+                "clinical_significance": get("clinical_significance"),
+                "review_status": get("review_status"),
+                "last_evaluated": get("last_evaluated")
+            })
+    
+    # Extract pathogenic variants
+    if "pathogenic_variants" in result:
+        path_vars = as_list(result["pathogenic_variants"])
+        variants["pathogenic_variants"] = path_vars
+    
+    # Extract GWAS variants
+    if "gwas_catalog" in result:
+        gwas = as_list(result["gwas_catalog"])
+        variants["gwas_variants"] = gwas
+    
+    return variants
 
 
 class VariantApi:
@@ -21,8 +130,9 @@ class VariantApi:
         # Variant ID could be rsID, HGVS notation, etc.
         query_parts = []
         variant_term = quote_lucene_phrase(variant_id)
+        id_key = _variant_id_key(variant_id)
         
-        if variant_id.startswith("rs"):
+        if id_key == "rsid":
             # dbSNP rsID
             query_parts.append(f"clinvar.variant.rsid:{variant_term}")
             query_parts.append(f"gwas_catalog.rsid:{variant_term}")
@@ -35,7 +145,7 @@ class VariantApi:
         
         params = {
             "q": q,
-            "fields": "_id,name,clinvar.variant,pathogenic_variants,gwas_catalog",
+            "fields": VARIANT_HIT_FIELDS,
             "size": size
         }
         
@@ -44,53 +154,13 @@ class VariantApi:
         # Process results
         diseases = []
         for hit in result.get("hits", []):
-            disease_info = {
-                "disease_id": hit.get("_id"),
-                "disease_name": hit.get("name"),
-                "variant_associations": []
-            }
-            
-            # Extract ClinVar variants
-            if "clinvar" in hit and "variant" in hit["clinvar"]:
-                variants = hit["clinvar"]["variant"]
-                variants = variants if isinstance(variants, list) else [variants]
-                for var in variants:
-                    if (var.get("rsid") == variant_id or 
-                        var.get("hgvs") == variant_id):
-                        disease_info["variant_associations"].append({
-                            "source": "clinvar",
-                            "variant_id": var.get("rsid") or var.get("hgvs"),
-                            "clinical_significance": var.get("clinical_significance"),
-                            "review_status": var.get("review_status")
-                        })
-            
-            # Extract pathogenic variants
-            if "pathogenic_variants" in hit:
-                variants = hit["pathogenic_variants"]
-                variants = variants if isinstance(variants, list) else [variants]
-                for var in variants:
-                    if var.get("hgvs") == variant_id:
-                        disease_info["variant_associations"].append({
-                            "source": "pathogenic_db",
-                            "variant_id": var.get("hgvs"),
-                            "pathogenicity": "pathogenic"
-                        })
-            
-            # Extract GWAS catalog
-            if "gwas_catalog" in hit:
-                gwas_entries = hit["gwas_catalog"]
-                gwas_entries = gwas_entries if isinstance(gwas_entries, list) else [gwas_entries]
-                for gwas in gwas_entries:
-                    if gwas.get("rsid") == variant_id:
-                        disease_info["variant_associations"].append({
-                            "source": "gwas",
-                            "variant_id": variant_id,
-                            "p_value": gwas.get("p_value"),
-                            "trait": gwas.get("trait")
-                        })
-            
-            if disease_info["variant_associations"]:
-                diseases.append(disease_info)
+            associations = _variant_associations(hit, variant_id, id_key)
+            if associations:
+                diseases.append({
+                    "disease_id": hit.get("_id"),
+                    "disease_name": hit.get("name"),
+                    "variant_associations": associations
+                })
         
         return {
             "success": True,
@@ -99,6 +169,55 @@ class VariantApi:
             "diseases": diseases
         }
     
+    async def get_diseases_by_variants(
+        self,
+        client: MyDiseaseClient,
+        variant_ids: List[str],
+        size: int = 20
+    ) -> Dict[str, Any]:
+        """Get diseases associated with several variants in one request."""
+        if len(variant_ids) > MAX_BATCH_SIZE:
+            raise MyDiseaseError(f"Batch size exceeds maximum of {MAX_BATCH_SIZE}")
+        
+        post_data = {
+            "ids": variant_ids,
+            "scopes": VARIANT_ID_SCOPES,
+            "fields": VARIANT_HIT_FIELDS
+        }
+        
+        results = await client.post("query", post_data)
+        
+        # Each hit echoes the variant it matched, so bucket diseases by it
+        diseases_by_variant: Dict[str, List[Dict[str, Any]]] = {
+            variant_id: [] for variant_id in variant_ids
+        }
+        id_keys = {variant_id: _variant_id_key(variant_id) for variant_id in diseases_by_variant}
+        for hit in results:
+            variant_id = hit.get("query")
+            diseases = diseases_by_variant.get(variant_id)
+            if diseases is None or not hit.get("found", False) or len(diseases) >= size:
+                continue
+            associations = _variant_associations(hit, variant_id, id_keys[variant_id])
+            if associations:
+                diseases.append({
+                    "disease_id": hit.get("_id"),
+                    "disease_name": hit.get("name"),
+                    "variant_associations": associations
+                })
+        
+        return {
+            "success": True,
+            "total_variants": len(diseases_by_variant),
+            "variants": [
+                {
+                    "variant_id": variant_id,
+                    "total_diseases": len(diseases),
+                    "diseases": diseases
+                }
+                for variant_id, diseases in diseases_by_variant.items()
+            ]
+        }
+    
     async def get_disease_variants(
         self,
         client: MyDiseaseClient,
@@ -107,50 +226,53 @@ class VariantApi:
     ) -> Dict[str, Any]:
         """Get all variants associated with a disease."""
         params = {
-            "fields": "clinvar.variant,pathogenic_variants,gwas_catalog"
+            "fields": VARIANT_DISEASE_FIELDS
         }
         
         result = await client.get(f"disease/{disease_id}", params=params)
         
-        variants = {
-            "disease_id": disease_id,
-            "clinvar_variants": [],
-            "pathogenic_variants": [],
-            "gwas_variants": []
+        return {
+            "success": True,
+            "variants": _disease_variants(result, disease_id, pathogenicity_filter)
         }
+    
+    async def get_disease_variants_batch(
+        self,
+        client: MyDiseaseClient,
+        disease_ids: List[str],
+        pathogenicity_filter: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get the variants of several diseases in one request."""
+        if len(disease_ids) > MAX_BATCH_SIZE:
+            raise MyDiseaseError(f"Batch size exceeds maximum of {MAX_BATCH_SIZE}")
         
-        # Extract ClinVar variants
-        if "clinvar" in result and "variant" in result["clinvar"]:
-            clinvar = result["clinvar"]["variant"]
-            clinvar = clinvar if isinstance(clinvar, list) else [clinvar]
-            
-            for var in clinvar:
-                if pathogenicity_filter is None or \
-                   var.get("clinical_significance", "").lower() == pathogenicity_filter.lower():
-                    variants["clinvar_variants"].append({
-                        "rsid": var.get("rsid"),
-                        "hgvs": var.get("hgvs"),
-                        "gene": var.get("gene"),
-                        "clinical_significance": var.get("clinical_significance"),
-                        "review_status": var.get("review_status"),
-                        "last_evaluated": var.get("last_evaluated")
-                    })
+        post_data = {
+            "ids": disease_ids,
+            "fields": VARIANT_DISEASE_FIELDS
+        }
         
-        # Extract pathogenic variants
-        if "pathogenic_variants" in result:
-            path_vars = result["pathogenic_variants"]
-            path_vars = path_vars if isinstance(path_vars, list) else [path_vars]
-            variants["pathogenic_variants"] = path_vars
+        results = await client.post("disease", post_data)
+        
+        # A query can match several records, so pair results by their query id
+        found: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            if not result.get("notfound"):
+                found.setdefault(result.get("query"), result)
         
-        # Extract GWAS variants
-        if "gwas_catalog" in result:
-            gwas = result["gwas_catalog"]
-            gwas = gwas if isinstance(gwas, list) else [gwas]
-            variants["gwas_variants"] = gwas
+        variants = []
+        missing = []
+        for disease_id in disease_ids:
+            result = found.get(disease_id)
+            if result is None:
+                missing.append(disease_id)
+            else:
+                variants.append(_disease_variants(result, disease_id, pathogenicity_filter))
         
         return {
             "success": True,
-            "variants": variants
+            "total": len(variants),
+            "variants": variants,
+            "missing_ids": missing
         }
     
     async def get_variant_pathogenicity(
@@ -161,7 +283,8 @@ class VariantApi:
         """Get pathogenicity information for a variant across diseases."""
         # Search for the variant
         variant_term = quote_lucene_phrase(variant_id)
-        if variant_id.startswith("rs"):
+        id_key = _variant_id_key(variant_id)
+        if id_key == "rsid":
             q = f"clinvar.variant.rsid:{variant_term}"
         else:
             q = f"clinvar.variant.hgvs:{variant_term} OR pathogenic_variants.hgvs:{variant_term}"
@@ -174,37 +297,31 @@ class VariantApi:
         
         result = await client.get("query", params=params)
         
-        pathogenicity_data = {
-            "variant_id": variant_id,
-            "pathogenicity_summary": {},
-            "disease_associations": []
-        }
+        associations = [
+            {
+                "disease_id": hit.get("_id"),
+                "disease_name": hit.get("name"),
+                "clinical_significance": var.get("clinical_significance", "Unknown"),
+                "review_status": var.get("review_status")
+            }
+            for hit in result.get("hits", [])
+            for var in _clinvar_variants(hit)
+            if var.get(id_key) == variant_id
+        ]
         
         # Collect pathogenicity across diseases
-        pathogenicity_counts = {}
-        
-        for hit in result.get("hits", []):
-            if "clinvar" in hit and "variant" in hit["clinvar"]:
-                variants = hit["clinvar"]["variant"]
-                variants = variants if isinstance(variants, list) else [variants]
-                
-                for var in variants:
-                    if var.get("rsid") == variant_id or var.get("hgvs") == variant_id:
-                        sig = var.get("clinical_significance", "Unknown")
-                        pathogenicity_counts[sig] = pathogenicity_counts.get(sig, 0) + 1
-                        
-                        pathogenicity_data["disease_associations"].append({
-                            "disease_id": hit.get("_id"),
-                            "disease_name": hit.get("name"),
-                            "clinical_significance": sig,
-                            "review_status": var.get("review_status")
-                        })
-        
-        pathogenicity_data["pathogenicity_summary"] = pathogenicity_counts
+        pathogenicity_counts: Dict[str, int] = {}
+        for association in associations:
+            sig = association["clinical_significance"]
+            pathogenicity_counts[sig] = pathogenicity_counts.get(sig, 0) + 1
         
         return {
             "success": True,
-            "pathogenicity": pathogenicity_data
+            "pathogenicity": {
+                "variant_id": variant_id,
+                "pathogenicity_summary": pathogenicity_counts,
+                "disease_associations": associations
+            }
         }
     
     async def search_by_variant_type(
@@ -233,31 +350,27 @@ class VariantApi:
         # Process results
         diseases = []
         for hit in result.get("hits", []):
-            variant_count = 0
-            example_variants = []
-            
-            if "clinvar" in hit and "variant" in hit["clinvar"]:
-                variants = hit["clinvar"]["variant"]
-                variants = variants if isinstance(variants, list) else [variants]
-                
-                for var in variants:
-                    if var.get("variant_type") == variant_type:
-                        if not gene_symbol or var.get("gene") == gene_symbol:
-                            variant_count += 1
-                            if len(example_variants) < 3:
-                                example_variants.append({
-                                    "rsid": var.get("rsid"),
-                                    "gene": var.get("gene"),
-                                    "hgvs": var.get("hgvs")
-                                })
+            matching = [
+                var for var in _clinvar_variants(hit)
+                if var.get("variant_type") == variant_type
+                and (not gene_symbol or var.get("gene") == gene_symbol)
+            ]
+            if not matching:
+                continue
             
-            if variant_count > 0:
-                diseases.append({
-                    "disease_id": hit.get("_id"),
-                    "disease_name": hit.get("name"),
-                    "variant_count": variant_count,
-                    "example_variants": example_variants
-                })
+            diseases.append({
+                "disease_id": hit.get("_id"),
+                "disease_name": hit.get("name"),
+                "variant_count": len(matching),
+                "example_variants": [
+                    {
+                        "rsid": var.get("rsid"),
+                        "gene": var.get("gene"),
+                        "hgvs": var.get("hgvs")
+                    }
+                    for var in matching[:3]
+                ]
+            })
         
         return {
             "success": True,
@@ -293,6 +406,26 @@ VARIANT_TOOLS = [
             "required": ["variant_id"]
         }
     ),
+    types.Tool(
+        name="get_diseases_by_variants",
+        description="Find diseases associated with several genetic variants in one request",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "variant_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of variant IDs, rsIDs or HGVS (up to 1000)"
+                },
+                "size": {
+                    "type": "integer",
+                    "description": "Maximum diseases per variant",
+                    "default": 20
+                }
+            },
+            "required": ["variant_ids"]
+        }
+    ),
     types.Tool(
         name="get_disease_variants",
         description="Get all variants associated with a disease",
@@ -312,6 +445,26 @@ VARIANT_TOOLS = [
             "required": ["disease_id"]
         }
     ),
+    types.Tool(
+        name="get_disease_variants_batch",
+        description="Get all variants associated with several diseases in one request",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "disease_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of disease IDs (up to 1000)"
+                },
+                "pathogenicity_filter": {
+                    "type": "string",
+                    "description": "Filter by pathogenicity",
+                    "enum": ["pathogenic", "likely_pathogenic", "benign", "likely_benign", "uncertain_significance"]
+                }
+            },
+            "required": ["disease_ids"]
+        }
+    ),
     types.Tool(
         name="get_variant_pathogenicity",
         description="Get pathogenicity information for a variant across diseases",
@@ -4,18 +4,21 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 import sys
 import os
-from datetime import datetime, timedelta
 
 # Add the src directory to Python path for testing
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
 
-from mydisease_mcp.client import MyDiseaseClient, CacheEntry
+
+# The client surface tools use; a name list spec skips per-test class introspection
+_MOCK_CLIENT_SPEC = ("get", "post", "close")
 
 
 @pytest.fixture
 def mock_client():
     """Create a mock MyDisease client."""
-    client = MagicMock(spec=MyDiseaseClient)
+    client = MagicMock(spec=_MOCK_CLIENT_SPEC)
     client.get = AsyncMock()
     client.post = AsyncMock()
     return client
@@ -24,10 +27,136 @@ def mock_client():
 @pytest.fixture
 def real_client():
     """Create a real client instance for testing caching."""
+    from mydisease_mcp.client import MyDiseaseClient
     return MyDiseaseClient(cache_enabled=True, cache_ttl=60)
 
 
-@pytest.fixture
+try:
+    import uvloop
+except ImportError:  # optional speedup, as in the server
+    uvloop = None
+
+if uvloop is not None:
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop, as the server does when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+# Tool API classes hold no state, so one instance serves the whole session.
+# Imports are deferred so a test module only loads the tools it exercises.
+
+
+@pytest.fixture(scope="session")
+def annotation_api():
+    """Shared AnnotationApi instance."""
+    from mydisease_mcp.tools.annotation import AnnotationApi
+    return AnnotationApi()
+
+
+@pytest.fixture(scope="session")
+def batch_api():
+    """Shared BatchApi instance."""
+    from mydisease_mcp.tools.batch import BatchApi
+    return BatchApi()
+
+
+@pytest.fixture(scope="session")
+def clinical_api():
+    """Shared ClinicalApi instance."""
+    from mydisease_mcp.tools.clinical import ClinicalApi
+    return ClinicalApi()
+
+
+@pytest.fixture(scope="session")
+def drug_api():
+    """Shared DrugApi instance."""
+    from mydisease_mcp.tools.drug import DrugApi
+    return DrugApi()
+
+
+@pytest.fixture(scope="session")
+def epidemiology_api():
+    """Shared EpidemiologyApi instance."""
+    from mydisease_mcp.tools.epidemiology import EpidemiologyApi
+    return EpidemiologyApi()
+
+
+@pytest.fixture(scope="session")
+def export_api():
+    """Shared ExportApi instance."""
+    from mydisease_mcp.tools.export import ExportApi
+    return ExportApi()
+
+
+@pytest.fixture(scope="session")
+def gene_association_api():
+    """Shared GeneAssociationApi instance."""
+    from mydisease_mcp.tools.gene_association import GeneAssociationApi
+    return GeneAssociationApi()
+
+
+@pytest.fixture(scope="session")
+def gwas_api():
+    """Shared GWASApi instance."""
+    from mydisease_mcp.tools.gwas import GWASApi
+    return GWASApi()
+
+
+@pytest.fixture(scope="session")
+def mapping_api():
+    """Shared MappingApi instance."""
+    from mydisease_mcp.tools.mapping import MappingApi
+    return MappingApi()
+
+
+@pytest.fixture(scope="session")
+def metadata_api():
+    """Shared MetadataApi instance."""
+    from mydisease_mcp.tools.metadata import MetadataApi
+    return MetadataApi()
+
+
+@pytest.fixture(scope="session")
+def ontology_api():
+    """Shared OntologyApi instance."""
+    from mydisease_mcp.tools.ontology import OntologyApi
+    return OntologyApi()
+
+
+@pytest.fixture(scope="session")
+def pathway_api():
+    """Shared PathwayApi instance."""
+    from mydisease_mcp.tools.pathway import PathwayApi
+    return PathwayApi()
+
+
+@pytest.fixture(scope="session")
+def phenotype_api():
+    """Shared PhenotypeApi instance."""
+    from mydisease_mcp.tools.phenotype import PhenotypeApi
+    return PhenotypeApi()
+
+
+@pytest.fixture(scope="session")
+def query_api():
+    """Shared QueryApi instance."""
+    from mydisease_mcp.tools.query import QueryApi
+    return QueryApi()
+
+
+@pytest.fixture(scope="session")
+def variant_api():
+    """Shared VariantApi instance."""
+    from mydisease_mcp.tools.variant import VariantApi
+    return VariantApi()
+
+
+# The sample_* payloads below are built once per session and shared by every
+# test that requests them. Treat them as read-only; copy before modifying.
+
+
+@pytest.fixture(scope="session")
 def sample_disease_hit():
     """Sample disease hit from query results."""
     return {
@@ -45,7 +174,7 @@ def sample_disease_hit():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_disease_annotation():
     """Sample full disease annotation."""
     return {
@@ -75,7 +204,7 @@ def sample_disease_annotation():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_batch_results():
     """Sample batch query results."""
     return [
@@ -100,7 +229,7 @@ def sample_batch_results():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_metadata():
     """Sample metadata response."""
     return {
@@ -127,7 +256,7 @@ def sample_metadata():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_gene_association():
     """Sample gene-disease association data."""
     return {
@@ -156,7 +285,7 @@ def sample_gene_association():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_variant_data():
     """Sample variant data."""
     return {
@@ -174,7 +303,7 @@ def sample_variant_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_phenotype_data():
     """Sample phenotype data."""
     return {
@@ -195,7 +324,7 @@ def sample_phenotype_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_clinical_data():
     """Sample clinical data."""
     return {
@@ -210,7 +339,7 @@ def sample_clinical_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_gwas_data():
     """Sample GWAS data."""
     return {
@@ -229,7 +358,7 @@ def sample_gwas_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_pathway_data():
     """Sample pathway data."""
     return {
@@ -249,7 +378,7 @@ def sample_pathway_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_drug_data():
     """Sample drug data."""
     return {
@@ -264,7 +393,7 @@ def sample_drug_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_epidemiology_data():
     """Sample epidemiology data."""
     return {
@@ -282,7 +411,7 @@ def sample_epidemiology_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_ontology_data():
     """Sample ontology data."""
     return {
@@ -304,7 +433,7 @@ def sample_ontology_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_fields_metadata():
     """Sample available fields metadata."""
     return {
@@ -331,7 +460,7 @@ def sample_fields_metadata():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_mapping_results():
     """Sample identifier mapping results."""
     return [
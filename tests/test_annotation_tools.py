@@ -1,19 +1,17 @@
 """Tests for annotation tools."""
 
 import pytest
-from mydisease_mcp.tools.annotation import AnnotationApi
 
 
 class TestAnnotationTools:
     """Test annotation tools."""
     
     @pytest.mark.asyncio
-    async def test_get_disease_by_id(self, mock_client, sample_disease_annotation):
+    async def test_get_disease_by_id(self, annotation_api, mock_client, sample_disease_annotation):
         """Test getting disease by ID."""
         mock_client.get.return_value = sample_disease_annotation
         
-        api = AnnotationApi()
-        result = await api.get_disease_by_id(
+        result = await annotation_api.get_disease_by_id(
             mock_client,
             disease_id="MONDO:0007739"
         )
@@ -28,15 +26,14 @@ class TestAnnotationTools:
         )
     
     @pytest.mark.asyncio
-    async def test_get_disease_by_id_with_fields(self, mock_client):
+    async def test_get_disease_by_id_with_fields(self, annotation_api, mock_client):
         """Test getting disease with specific fields."""
         mock_client.get.return_value = {
             "_id": "MONDO:0007739",
             "name": "Huntington disease"
         }
         
-        api = AnnotationApi()
-        result = await api.get_disease_by_id(
+        result = await annotation_api.get_disease_by_id(
             mock_client,
             disease_id="MONDO:0007739",
             fields="name"
@@ -1,7 +1,6 @@
 """Tests for batch operation tools."""
 
 import pytest
-from mydisease_mcp.tools.batch import BatchApi
 from mydisease_mcp.client import MyDiseaseError
 
 
@@ -9,12 +8,11 @@ class TestBatchTools:
     """Test batch operation tools."""
     
     @pytest.mark.asyncio
-    async def test_batch_query_diseases(self, mock_client, sample_batch_results):
+    async def test_batch_query_diseases(self, batch_api, mock_client, sample_batch_results):
         """Test batch query of diseases."""
         mock_client.post.return_value = sample_batch_results
         
-        api = BatchApi()
-        result = await api.batch_query_diseases(
+        result = await batch_api.batch_query_diseases(
             mock_client,
             disease_ids=["143100", "ORPHA:15", "INVALID_DISEASE"]
         )
@@ -31,18 +29,16 @@ class TestBatchTools:
         assert "ids" in call_args[1]
     
     @pytest.mark.asyncio
-    async def test_batch_query_diseases_max_size(self, mock_client):
+    async def test_batch_query_diseases_max_size(self, batch_api, mock_client):
         """Test batch query size limit."""
-        api = BatchApi()
-        
         # Create list with more than 1000 IDs
         too_many_ids = [f"disease_{i}" for i in range(1001)]
         
         with pytest.raises(MyDiseaseError, match="Batch size exceeds maximum"):
-            await api.batch_query_diseases(mock_client, disease_ids=too_many_ids)
+            await batch_api.batch_query_diseases(mock_client, disease_ids=too_many_ids)
     
     @pytest.mark.asyncio
-    async def test_batch_get_diseases(self, mock_client):
+    async def test_batch_get_diseases(self, batch_api, mock_client):
         """Test batch get diseases."""
         mock_results = [
             {"_id": "MONDO:0007739", "name": "Huntington disease"},
@@ -50,8 +46,7 @@ class TestBatchTools:
         ]
         mock_client.post.return_value = mock_results
         
-        api = BatchApi()
-        result = await api.batch_get_diseases(
+        result = await batch_api.batch_get_diseases(
             mock_client,
             disease_ids=["MONDO:0007739", "MONDO:0011122"],
             fields="name"
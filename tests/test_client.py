@@ -1,8 +1,13 @@
 """Tests for MyDisease client behavior."""
 
+import asyncio
+import json
+from types import SimpleNamespace
+
 import pytest
 import httpx
 
+from mydisease_mcp import client as client_module
 from mydisease_mcp.client import MyDiseaseClient, MyDiseaseError
 
 
@@ -57,15 +62,17 @@ async def test_rate_limiter_uses_monotonic_clock(monkeypatch):
         except StopIteration:
             return 101.2
 
-    monkeypatch.setattr("mydisease_mcp.client.time.monotonic", fake_monotonic)
-
     async def fake_sleep(duration: float) -> None:
         sleep_calls.append(duration)
 
-    monkeypatch.setattr("mydisease_mcp.client.asyncio.sleep", fake_sleep)
+    # Swap the client module's references only; patching time.monotonic itself
+    # would also move the clock of the event loop shared by the whole session.
+    with monkeypatch.context() as patch:
+        patch.setattr(client_module, "time", SimpleNamespace(monotonic=fake_monotonic))
+        patch.setattr(client_module, "asyncio", SimpleNamespace(sleep=fake_sleep))
 
-    await client._apply_rate_limit()
-    await client._apply_rate_limit()
+        await client._apply_rate_limit()
+        await client._apply_rate_limit()
 
     assert sleep_calls
     assert sleep_calls[0] > 0
@@ -90,3 +97,272 @@ async def test_cache_respects_max_entries():
     assert list(client._cache.keys()) == ["a", "c"]
     assert "b" not in client._cache
     await client.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_key_ignores_field_order():
+    """Requests that differ only in field order should share a cache entry."""
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params["fields"])
+        return httpx.Response(200, json={"gwas_catalog": []})
+
+    client = MyDiseaseClient(base_url="https://example.org", rate_limit=None)
+    client._http_client = httpx.AsyncClient(
+        base_url=client.base_url,
+        transport=httpx.MockTransport(handler),
+    )
+
+    await client.get("disease/MONDO:0005148", params={"fields": "gwas_catalog,gene"})
+    await client.get("disease/MONDO:0005148", params={"fields": "gene,gwas_catalog"})
+
+    assert requests == ["gwas_catalog,gene"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_lazy_http_client_builds_without_h2(monkeypatch):
+    """The pooled AsyncClient should fall back to HTTP/1.1 when h2 is missing."""
+    monkeypatch.setattr("mydisease_mcp.client.HTTP2_AVAILABLE", False)
+    client = MyDiseaseClient(base_url="https://example.org", cache_enabled=False, rate_limit=None)
+
+    http_client = await client._ensure_client_open()
+
+    assert http_client is await client._ensure_client_open()
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_post_sends_encoded_json_body():
+    """POST bodies should be pre-encoded JSON with a JSON content type."""
+    seen = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen["content_type"] = request.headers["content-type"]
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, json=[])
+
+    client = MyDiseaseClient(base_url="https://example.org", cache_enabled=False, rate_limit=None)
+    client._http_client = httpx.AsyncClient(
+        base_url=client.base_url,
+        transport=httpx.MockTransport(handler),
+    )
+
+    await client.post("query", {"ids": ["143100", "ORPHA:399"], "scopes": "omim"})
+
+    assert seen == {
+        "content_type": "application/json",
+        "body": {"ids": ["143100", "ORPHA:399"], "scopes": "omim"},
+    }
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_gets_share_one_request():
+    """Concurrent cache misses for the same GET should issue one HTTP request."""
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0)
+        return httpx.Response(200, json={"_id": "MONDO:0007739"})
+
+    client = MyDiseaseClient(base_url="https://example.org", rate_limit=None)
+    client._http_client = httpx.AsyncClient(
+        base_url=client.base_url,
+        transport=httpx.MockTransport(handler),
+    )
+
+    first, second = await asyncio.gather(
+        client.get("disease/MONDO:0007739", params={"fields": "mondo"}),
+        client.get("disease/MONDO:0007739", params={"fields": "mondo"}),
+    )
+
+    assert first == second == {"_id": "MONDO:0007739"}
+    assert calls == ["/disease/MONDO:0007739"]
+    assert client._inflight == {}
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_disease_lookups_are_batched_into_one_post():
+    """Concurrent single-disease GETs with one projection should share a POST."""
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        body = json.loads(request.content)
+        assert body["fields"] == "name"
+        return httpx.Response(200, json=[
+            {"query": disease_id, "_id": disease_id, "name": disease_id.lower()}
+            for disease_id in body["ids"]
+        ])
+
+    client = MyDiseaseClient(base_url="https://example.org", rate_limit=None)
+    client._http_client = httpx.AsyncClient(
+        base_url=client.base_url,
+        transport=httpx.MockTransport(handler),
+    )
+
+    first, second = await asyncio.gather(
+        client.get("disease/A", params={"fields": "name"}),
+        client.get("disease/B", params={"fields": "name"}),
+    )
+
+    assert first == {"_id": "A", "name": "a"}
+    assert second == {"_id": "B", "name": "b"}
+    assert calls == [("POST", "/disease")]
+    assert await client.get("disease/A", params={"fields": "name"}) == first
+    assert len(calls) == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_batched_lookup_falls_back_to_get_for_missing_ids():
+    """Ids a batch cannot resolve should surface the direct GET error."""
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.method == "POST":
+            return httpx.Response(200, json=[
+                {"query": "A", "_id": "A"},
+                {"query": "MISSING", "notfound": True},
+            ])
+        return httpx.Response(404, json={"success": False})
+
+    client = MyDiseaseClient(base_url="https://example.org", rate_limit=None)
+    client._http_client = httpx.AsyncClient(
+        base_url=client.base_url,
+        transport=httpx.MockTransport(handler),
+    )
+
+    found, missing = await asyncio.gather(
+        client.get("disease/A"),
+        client.get("disease/MISSING"),
+        return_exceptions=True,
+    )
+
+    assert found == {"_id": "A"}
+    assert isinstance(missing, MyDiseaseError)
+    assert calls == [("POST", "/disease"), ("GET", "/disease/MISSING")]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_key_treats_numeric_and_text_params_alike():
+    """Params that encode to the same query string should share a cache entry."""
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url.query))
+        return httpx.Response(200, json={"hits": []})
+
+    client = MyDiseaseClient(base_url="https://example.org", rate_limit=None)
+    client._http_client = httpx.AsyncClient(
+        base_url=client.base_url,
+        transport=httpx.MockTransport(handler),
+    )
+
+    await client.get("query", params={"q": "asthma", "size": 10})
+    await client.get("query", params={"q": "asthma", "size": "10"})
+    await client.get("query", params={"q": "asthma", "size": 20})
+
+    assert len(requests) == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_get_cache_ttl_overrides_client_default():
+    """A per-request TTL should keep a response cached past the default TTL."""
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["q"])
+        return httpx.Response(200, json={"facets": {}})
+
+    # A negative default TTL makes ordinary entries expire immediately
+    client = MyDiseaseClient(base_url="https://example.org", rate_limit=None, cache_ttl=-1)
+    client._http_client = httpx.AsyncClient(
+        base_url=client.base_url,
+        transport=httpx.MockTransport(handler),
+    )
+
+    await client.get("query", params={"q": "a"})
+    await client.get("query", params={"q": "a"})
+    await client.get("query", params={"q": "b"}, cache_ttl=60)
+    await client.get("query", params={"q": "b"}, cache_ttl=60)
+
+    assert calls == ["a", "a", "b"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_with_etag_is_revalidated():
+    """An expired response with an ETag should be renewed by a 304 reply."""
+    seen = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"build_version": "1"}, headers={"ETag": '"v1"'})
+
+    # A negative default TTL makes every entry stale on the next call
+    client = MyDiseaseClient(base_url="https://example.org", rate_limit=None, cache_ttl=-1)
+    client._http_client = httpx.AsyncClient(
+        base_url=client.base_url,
+        transport=httpx.MockTransport(handler),
+    )
+
+    first = await client.get("metadata")
+    second = await client.get("metadata")
+
+    assert seen == [None, '"v1"']
+    assert second == first == {"build_version": "1"}
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_shared_get_leaves_other_callers_waiting():
+    """Cancelling one caller of a coalesced GET should not cancel the others."""
+    release = asyncio.Event()
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await release.wait()
+        return httpx.Response(200, json={"total": 1})
+
+    client = MyDiseaseClient(base_url="https://example.org", rate_limit=None)
+    client._http_client = httpx.AsyncClient(
+        base_url=client.base_url,
+        transport=httpx.MockTransport(handler),
+    )
+
+    first = asyncio.ensure_future(client.get("query", params={"q": "asthma"}))
+    second = asyncio.ensure_future(client.get("query", params={"q": "asthma"}))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == {"total": 1}
+    assert first.cancelled()
+    assert calls == ["/query"]
+    assert client._inflight == {}
+    await client.close()
+
+
+def test_cache_key_follows_httpx_query_encoding():
+    """Cache keys should match the query string httpx sends for each value."""
+    client = MyDiseaseClient()
+
+    def key(params):
+        return client._get_cache_key("GET", "query", params)
+
+    assert key({"q": "a", "dotfield": True}) == key({"q": "a", "dotfield": "true"})
+    assert key({"q": "a", "dotfield": True}) != key({"q": "a", "dotfield": "True"})
+    assert key({"q": "a", "size": 10}) == key({"size": "10", "q": "a"})
+    assert key({"q": "a", "fields": "name,_id"}) == key({"q": "a", "fields": "_id,name"})
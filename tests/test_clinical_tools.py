@@ -1,14 +1,13 @@
 """Tests for clinical tools."""
 
 import pytest
-from mydisease_mcp.tools.clinical import ClinicalApi
 
 
 class TestClinicalTools:
     """Test clinical information tools."""
     
     @pytest.mark.asyncio
-    async def test_get_clinical_significance(self, mock_client):
+    async def test_get_clinical_significance(self, clinical_api, mock_client):
         """Test getting clinical significance."""
         mock_client.get.return_value = {
             "clinvar": {
@@ -20,8 +19,7 @@ class TestClinicalTools:
             }
         }
         
-        api = ClinicalApi()
-        result = await api.get_clinical_significance(
+        result = await clinical_api.get_clinical_significance(
             mock_client,
             disease_id="test-id"
         )
@@ -32,12 +30,11 @@ class TestClinicalTools:
         assert result["clinical_data"]["clinvar_summary"]["Pathogenic"] == 1
     
     @pytest.mark.asyncio
-    async def test_get_diagnostic_criteria(self, mock_client, sample_clinical_data):
+    async def test_get_diagnostic_criteria(self, clinical_api, mock_client, sample_clinical_data):
         """Test getting diagnostic criteria."""
         mock_client.get.return_value = sample_clinical_data
         
-        api = ClinicalApi()
-        result = await api.get_diagnostic_criteria(
+        result = await clinical_api.get_diagnostic_criteria(
             mock_client,
             disease_id="test-id"
         )
@@ -46,7 +43,7 @@ class TestClinicalTools:
         assert result["diagnostic_info"]["diagnostic_criteria"] == "Clinical diagnosis based on..."
     
     @pytest.mark.asyncio
-    async def test_get_disease_prognosis(self, mock_client):
+    async def test_get_disease_prognosis(self, clinical_api, mock_client):
         """Test getting disease prognosis."""
         mock_client.get.return_value = {
             "prognosis": "Generally favorable",
@@ -55,8 +52,7 @@ class TestClinicalTools:
             "severity": "Moderate"
         }
         
-        api = ClinicalApi()
-        result = await api.get_disease_prognosis(
+        result = await clinical_api.get_disease_prognosis(
             mock_client,
             disease_id="test-id"
         )
@@ -66,7 +62,7 @@ class TestClinicalTools:
         assert result["prognosis_data"]["life_expectancy"] == "Normal"
     
     @pytest.mark.asyncio
-    async def test_get_treatment_options(self, mock_client):
+    async def test_get_treatment_options(self, clinical_api, mock_client):
         """Test getting treatment options."""
         mock_client.get.return_value = {
             "treatment": ["Symptomatic treatment"],
@@ -75,8 +71,7 @@ class TestClinicalTools:
             ]
         }
         
-        api = ClinicalApi()
-        result = await api.get_treatment_options(
+        result = await clinical_api.get_treatment_options(
             mock_client,
             disease_id="test-id",
             include_experimental=False
@@ -87,7 +82,7 @@ class TestClinicalTools:
         assert len(result["treatment_options"]["drug_treatments"]) == 1
 
     @pytest.mark.asyncio
-    async def test_get_treatment_options_excludes_experimental_by_default(self, mock_client):
+    async def test_get_treatment_options_excludes_experimental_by_default(self, clinical_api, mock_client):
         """Test experimental treatment filtering default behavior."""
         mock_client.get.return_value = {
             "drug_treatment": [
@@ -96,8 +91,7 @@ class TestClinicalTools:
             ]
         }
 
-        api = ClinicalApi()
-        result = await api.get_treatment_options(
+        result = await clinical_api.get_treatment_options(
             mock_client,
             disease_id="test-id",
             include_experimental=False
@@ -108,7 +102,7 @@ class TestClinicalTools:
         assert names == ["Drug A"]
 
     @pytest.mark.asyncio
-    async def test_get_treatment_options_includes_experimental_when_enabled(self, mock_client):
+    async def test_get_treatment_options_includes_experimental_when_enabled(self, clinical_api, mock_client):
         """Test experimental treatment filtering opt-in behavior."""
         mock_client.get.return_value = {
             "drug_treatment": [
@@ -117,8 +111,7 @@ class TestClinicalTools:
             ]
         }
 
-        api = ClinicalApi()
-        result = await api.get_treatment_options(
+        result = await clinical_api.get_treatment_options(
             mock_client,
             disease_id="test-id",
             include_experimental=True
@@ -129,7 +122,7 @@ class TestClinicalTools:
         assert names == ["Drug A", "Drug B"]
     
     @pytest.mark.asyncio
-    async def test_get_clinical_trials(self, mock_client):
+    async def test_get_clinical_trials(self, clinical_api, mock_client):
         """Test getting clinical trials."""
         mock_client.get.return_value = {
             "clinical_trials": [
@@ -141,8 +134,7 @@ class TestClinicalTools:
             ]
         }
         
-        api = ClinicalApi()
-        result = await api.get_clinical_trials(
+        result = await clinical_api.get_clinical_trials(
             mock_client,
             disease_id="test-id",
             status="recruiting"
@@ -1,19 +1,17 @@
 """Tests for drug tools."""
 
 import pytest
-from mydisease_mcp.tools.drug import DrugApi
 
 
 class TestDrugTools:
     """Test drug and treatment tools."""
     
     @pytest.mark.asyncio
-    async def test_get_disease_drugs(self, mock_client, sample_drug_data):
+    async def test_get_disease_drugs(self, drug_api, mock_client, sample_drug_data):
         """Test getting drugs for a disease."""
         mock_client.get.return_value = sample_drug_data
         
-        api = DrugApi()
-        result = await api.get_disease_drugs(
+        result = await drug_api.get_disease_drugs(
             mock_client,
             disease_id="test-id",
             approved_only=True
@@ -24,7 +22,7 @@ class TestDrugTools:
         assert result["drugs"]["approved_drugs"][0]["name"] == "Riluzole"
     
     @pytest.mark.asyncio
-    async def test_search_drugs_by_indication(self, mock_client):
+    async def test_search_drugs_by_indication(self, drug_api, mock_client):
         """Test searching drugs by indication."""
         mock_client.get.return_value = {
             "hits": [
@@ -40,8 +38,7 @@ class TestDrugTools:
             ]
         }
         
-        api = DrugApi()
-        result = await api.search_drugs_by_indication(
+        result = await drug_api.search_drugs_by_indication(
             mock_client,
             indication="pain",
             drug_status="approved"
@@ -52,7 +49,7 @@ class TestDrugTools:
         assert result["results"][0]["drugs"][0]["name"] == "Drug A"
     
     @pytest.mark.asyncio
-    async def test_get_drug_targets(self, mock_client):
+    async def test_get_drug_targets(self, drug_api, mock_client):
         """Test getting drug targets."""
         mock_client.get.return_value = {
             "drug": {
@@ -68,8 +65,7 @@ class TestDrugTools:
             "gene": [{"symbol": "GENE1"}]
         }
         
-        api = DrugApi()
-        result = await api.get_drug_targets(
+        result = await drug_api.get_drug_targets(
             mock_client,
             disease_id="test-id"
         )
@@ -80,7 +76,7 @@ class TestDrugTools:
         assert "GENE1" in result["targets"]["disease_genes"]
     
     @pytest.mark.asyncio
-    async def test_get_pharmacogenomics(self, mock_client):
+    async def test_get_pharmacogenomics(self, drug_api, mock_client):
         """Test getting pharmacogenomics data."""
         mock_client.get.return_value = {
             "pharmgkb": {
@@ -89,8 +85,7 @@ class TestDrugTools:
             }
         }
         
-        api = DrugApi()
-        result = await api.get_pharmacogenomics(
+        result = await drug_api.get_pharmacogenomics(
             mock_client,
             disease_id="test-id"
         )
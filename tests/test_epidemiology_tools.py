@@ -1,19 +1,17 @@
 """Tests for epidemiology tools."""
 
 import pytest
-from mydisease_mcp.tools.epidemiology import EpidemiologyApi
 
 
 class TestEpidemiologyTools:
     """Test epidemiological data tools."""
     
     @pytest.mark.asyncio
-    async def test_get_disease_prevalence(self, mock_client, sample_epidemiology_data):
+    async def test_get_disease_prevalence(self, epidemiology_api, mock_client, sample_epidemiology_data):
         """Test getting disease prevalence."""
         mock_client.get.return_value = sample_epidemiology_data
         
-        api = EpidemiologyApi()
-        result = await api.get_disease_prevalence(
+        result = await epidemiology_api.get_disease_prevalence(
             mock_client,
             disease_id="test-id"
         )
@@ -23,7 +21,7 @@ class TestEpidemiologyTools:
         assert result["prevalence_data"]["global_prevalence"]["value"] == "1-9 / 100 000"
     
     @pytest.mark.asyncio
-    async def test_get_disease_incidence(self, mock_client):
+    async def test_get_disease_incidence(self, epidemiology_api, mock_client):
         """Test getting disease incidence."""
         mock_client.get.return_value = {
             "incidence": [
@@ -35,8 +33,7 @@ class TestEpidemiologyTools:
             ]
         }
         
-        api = EpidemiologyApi()
-        result = await api.get_disease_incidence(
+        result = await epidemiology_api.get_disease_incidence(
             mock_client,
             disease_id="test-id"
         )
@@ -46,7 +43,7 @@ class TestEpidemiologyTools:
         assert result["incidence_data"]["annual_incidence"][0]["year"] == "2020"
     
     @pytest.mark.asyncio
-    async def test_get_demographic_data(self, mock_client):
+    async def test_get_demographic_data(self, epidemiology_api, mock_client):
         """Test getting demographic data."""
         mock_client.get.return_value = {
             "age_of_onset": "Adult",
@@ -56,8 +53,7 @@ class TestEpidemiologyTools:
             ]
         }
         
-        api = EpidemiologyApi()
-        result = await api.get_demographic_data(
+        result = await epidemiology_api.get_demographic_data(
             mock_client,
             disease_id="test-id"
         )
@@ -68,7 +64,7 @@ class TestEpidemiologyTools:
         assert len(result["demographics"]["ethnic_distribution"]) == 1
     
     @pytest.mark.asyncio
-    async def test_get_geographic_distribution(self, mock_client):
+    async def test_get_geographic_distribution(self, epidemiology_api, mock_client):
         """Test getting geographic distribution."""
         mock_client.get.return_value = {
             "geographic_distribution": [
@@ -86,8 +82,7 @@ class TestEpidemiologyTools:
             ]
         }
         
-        api = EpidemiologyApi()
-        result = await api.get_geographic_distribution(
+        result = await epidemiology_api.get_geographic_distribution(
             mock_client,
             disease_id="test-id"
         )
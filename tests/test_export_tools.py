@@ -4,22 +4,20 @@ import pytest
 import json
 import csv
 import io
-from mydisease_mcp.tools.export import ExportApi
 
 
 class TestExportTools:
     """Test data export tools."""
     
     @pytest.mark.asyncio
-    async def test_export_disease_list_json(self, mock_client):
+    async def test_export_disease_list_json(self, export_api, mock_client):
         """Test exporting diseases as JSON."""
         mock_client.post.return_value = [
             {"_id": "MONDO:0007739", "name": "Huntington disease"},
             {"_id": "MONDO:0011122", "name": "Achondroplasia"}
         ]
         
-        api = ExportApi()
-        result = await api.export_disease_list(
+        result = await export_api.export_disease_list(
             mock_client,
             disease_ids=["MONDO:0007739", "MONDO:0011122"],
             format="json"
@@ -31,7 +29,7 @@ class TestExportTools:
         assert data[0]["name"] == "Huntington disease"
     
     @pytest.mark.asyncio
-    async def test_export_disease_comparison_markdown(self, mock_client):
+    async def test_export_disease_comparison_markdown(self, export_api, mock_client):
         """Test exporting disease comparison as markdown."""
         mock_client.post.return_value = [
             {
@@ -48,8 +46,7 @@ class TestExportTools:
             }
         ]
         
-        api = ExportApi()
-        result = await api.export_disease_comparison(
+        result = await export_api.export_disease_comparison(
             mock_client,
             disease_ids=["MONDO:0007739", "MONDO:0011122"],
             format="markdown"
@@ -62,7 +59,7 @@ class TestExportTools:
         assert "FGFR3" in result
     
     @pytest.mark.asyncio
-    async def test_export_gene_disease_matrix(self, mock_client):
+    async def test_export_gene_disease_matrix(self, export_api, mock_client):
         """Test exporting gene-disease matrix."""
         # Mock search results
         mock_client.get.side_effect = [
@@ -84,8 +81,7 @@ class TestExportTools:
             }
         ]
         
-        api = ExportApi()
-        result = await api.export_gene_disease_matrix(
+        result = await export_api.export_gene_disease_matrix(
             mock_client,
             gene_list=["GENE1", "GENE2"],
             format="csv"
@@ -96,4 +92,115 @@ class TestExportTools:
         rows = list(reader)
         
         assert rows[0] == ["Disease ID", "Disease Name", "GENE1", "GENE2"]
-        assert len(rows) == 3  # Header + 2 diseases
\ No newline at end of file
+        assert len(rows) == 3  # Header + 2 diseases
+    
+    @pytest.mark.asyncio
+    async def test_export_disease_list_json_keeps_non_ascii(self, export_api, mock_client):
+        """Test JSON export leaves non-ASCII disease names unescaped."""
+        mock_client.post.return_value = [
+            {"_id": "MONDO:0008608", "name": "Sjögren syndrome"}
+        ]
+        
+        result = await export_api.export_disease_list(
+            mock_client,
+            disease_ids=["MONDO:0008608"],
+            format="json"
+        )
+        
+        assert "Sjögren syndrome" in result
+        assert json.loads(result)[0]["name"] == "Sjögren syndrome"
+    
+    @pytest.mark.asyncio
+    async def test_export_disease_list_tsv_requests_dotfield(self, export_api, mock_client):
+        """Test TSV export reads server-flattened dotted keys."""
+        mock_client.post.return_value = [
+            {"_id": "MONDO:0007739", "name": "Huntington disease", "mondo.mondo": "MONDO:0007739"},
+            {"_id": "MONDO:0011122", "name": "Achondroplasia", "mondo": {"mondo": "MONDO:0011122"}}
+        ]
+        
+        result = await export_api.export_disease_list(
+            mock_client,
+            disease_ids=["MONDO:0007739", "MONDO:0011122"],
+            format="tsv",
+            fields=["_id", "mondo.mondo"]
+        )
+        
+        post_data = mock_client.post.call_args[0][1]
+        assert post_data["dotfield"] is True
+        rows = list(csv.reader(io.StringIO(result), delimiter="\t"))
+        assert rows == [
+            ["_id", "mondo.mondo"],
+            ["MONDO:0007739", "MONDO:0007739"],
+            ["MONDO:0011122", "MONDO:0011122"]
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_export_disease_list_csv_quotes_when_needed(self, export_api, mock_client):
+        """Test CSV export still quotes values containing the delimiter."""
+        mock_client.post.return_value = [
+            {"_id": "MONDO:0011122", "name": "Achondroplasia"},
+            {"_id": "MONDO:0019391", "name": "Fanconi anemia, complementation group A"}
+        ]
+        
+        result = await export_api.export_disease_list(
+            mock_client,
+            disease_ids=["MONDO:0011122", "MONDO:0019391"],
+            format="csv",
+            fields=["_id", "name"]
+        )
+        
+        assert '"Fanconi anemia, complementation group A"' in result
+        rows = list(csv.reader(io.StringIO(result)))
+        assert rows[2] == ["MONDO:0019391", "Fanconi anemia, complementation group A"]
+    
+    @pytest.mark.asyncio
+    async def test_export_phenotype_profile_skips_empty_entries(self, export_api, mock_client):
+        """Test phenotype profile drops inheritance and phenotype entries without data."""
+        mock_client.get.return_value = {
+            "name": "Huntington disease",
+            "inheritance": [{"inheritance_type": "Autosomal dominant"}, {}],
+            "phenotype_related_to_disease": [
+                {"hpo_id": "HP:0002072", "hpo_phenotype": "Chorea", "frequency": "Frequent"},
+                {"frequency": "Occasional"}
+            ]
+        }
+        
+        result = await export_api.export_phenotype_profile(
+            mock_client,
+            disease_id="MONDO:0007739",
+            format="markdown"
+        )
+        
+        assert "- **Inheritance**: Autosomal dominant" in result
+        assert "Chorea (HP:0002072)" in result
+        assert "Occasional" not in result
+    
+    def test_dumps_matches_stdlib_layout(self):
+        """Test JSON export text is laid out like json.dumps(indent=2) on any encoder."""
+        from mydisease_mcp.tools.export import _dumps
+        
+        record = {"name": "Sjögren syndrome", "gene": [{"symbol": "HLA-DRB1"}], "xrefs": {}, "score": 2.5}
+        assert _dumps(record) == json.dumps(record, indent=2, ensure_ascii=False)
+        assert json.loads(_dumps({"count": 2 ** 70})) == {"count": 2 ** 70}
+    
+    @pytest.mark.asyncio
+    async def test_export_disease_list_tsv_rebuilds_parent_fields(self, export_api, mock_client):
+        """Test a requested parent field is rebuilt from its flattened child keys."""
+        mock_client.post.return_value = [
+            {"_id": "MONDO:0007739", "mondo.mondo": "MONDO:0007739", "mondo.xrefs.omim": "143100"},
+            {"_id": "MONDO:0011122"}
+        ]
+        
+        result = await export_api.export_disease_list(
+            mock_client,
+            disease_ids=["MONDO:0007739", "MONDO:0011122"],
+            format="tsv",
+            fields=["_id", "mondo"]
+        )
+        
+        rows = list(csv.reader(io.StringIO(result), delimiter="\t"))
+        assert rows[1] == [
+            "MONDO:0007739",
+            str({"mondo": "MONDO:0007739", "xrefs": {"omim": "143100"}})
+        ]
+        assert rows[2] == ["MONDO:0011122", ""]
@@ -1,14 +1,14 @@
 """Tests for gene association tools."""
 
 import pytest
-from mydisease_mcp.tools.gene_association import GeneAssociationApi
+from mydisease_mcp.client import MyDiseaseError
 
 
 class TestGeneAssociationTools:
     """Test gene-disease association tools."""
     
     @pytest.mark.asyncio
-    async def test_get_diseases_by_gene(self, mock_client):
+    async def test_get_diseases_by_gene(self, gene_association_api, mock_client):
         """Test finding diseases by gene."""
         mock_client.get.return_value = {
             "hits": [
@@ -20,8 +20,7 @@ class TestGeneAssociationTools:
             ]
         }
         
-        api = GeneAssociationApi()
-        result = await api.get_diseases_by_gene(
+        result = await gene_association_api.get_diseases_by_gene(
             mock_client,
             gene_symbol="HTT"
         )
@@ -32,12 +31,11 @@ class TestGeneAssociationTools:
         assert result["diseases"][0]["disease_name"] == "Huntington disease"
     
     @pytest.mark.asyncio
-    async def test_get_disease_genes(self, mock_client, sample_gene_association):
+    async def test_get_disease_genes(self, gene_association_api, mock_client, sample_gene_association):
         """Test getting genes for a disease."""
         mock_client.get.return_value = sample_gene_association
         
-        api = GeneAssociationApi()
-        result = await api.get_disease_genes(
+        result = await gene_association_api.get_disease_genes(
             mock_client,
             disease_id="test-id"
         )
@@ -48,25 +46,106 @@ class TestGeneAssociationTools:
         assert len(result["genes"]["causal_genes"]) == 1
     
     @pytest.mark.asyncio
-    async def test_search_by_gene_panel(self, mock_client):
+    async def test_search_by_gene_panel(self, gene_association_api, mock_client):
         """Test searching by gene panel."""
         mock_client.get.return_value = {
             "hits": [
                 {
                     "_id": "disease1",
                     "name": "Disease 1",
-                    "gene": [{"symbol": "GENE1"}, {"symbol": "GENE2"}]
+                    "gene": [{"symbol": "GENE2"}, {"symbol": "GENE1"}]
                 }
             ]
         }
         
-        api = GeneAssociationApi()
-        result = await api.search_by_gene_panel(
+        result = await gene_association_api.search_by_gene_panel(
             mock_client,
             gene_symbols=["GENE1", "GENE2", "GENE3"]
         )
         
         assert result["success"] is True
         assert result["total_diseases"] == 1
-        assert set(result["diseases"][0]["matching_genes"]) == {"GENE1", "GENE2"}
-        assert result["diseases"][0]["match_count"] == 2
\ No newline at end of file
+        assert result["diseases"][0]["matching_genes"] == ["GENE1", "GENE2"]
+        assert result["diseases"][0]["match_count"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_gene_disease_scores_batch(self, gene_association_api, mock_client):
+        """Test scoring one gene against several diseases in a single POST."""
+        mock_client.post.return_value = [
+            {
+                "query": "disease1",
+                "_id": "disease1",
+                "disgenet": {"gene": [{"gene_name": "BRCA1", "score": 0.9, "pmids": [1, 2]}]}
+            },
+            {"query": "disease2", "notfound": True}
+        ]
+        
+        result = await gene_association_api.get_gene_disease_scores_batch(
+            mock_client,
+            gene_symbol="BRCA1",
+            disease_ids=["disease1", "disease2"]
+        )
+        
+        mock_client.post.assert_awaited_once()
+        assert mock_client.post.call_args[0][0] == "disease"
+        assert result["total"] == 2
+        first, second = result["associations"]
+        assert first["is_associated"] is True
+        assert first["notfound"] is False
+        assert first["associations"][0]["pmid_count"] == 2
+        assert second == {
+            "gene_symbol": "BRCA1",
+            "disease_id": "disease2",
+            "associations": [],
+            "is_associated": False,
+            "notfound": True
+        }
+    
+    @pytest.mark.asyncio
+    async def test_get_diseases_by_gene_pushes_filters_into_query(self, gene_association_api, mock_client):
+        """Test source lists and min_score become Lucene clauses."""
+        mock_client.get.return_value = {"hits": []}
+        
+        await gene_association_api.get_diseases_by_gene(
+            mock_client,
+            gene_symbol="BRCA1",
+            source=["disgenet", "ctd"],
+            min_score=0.5
+        )
+        
+        q = mock_client.get.call_args.kwargs["params"]["q"]
+        assert "(_exists_:disgenet OR _exists_:ctd)" in q
+        assert "disgenet.gene.score:[0.5 TO *]" in q
+    
+    @pytest.mark.asyncio
+    async def test_get_gene_disease_scores_batch_pairs_results_by_query(self, gene_association_api, mock_client):
+        """Test extra hits for one id do not shift the results of later ids."""
+        mock_client.post.return_value = [
+            {"query": "disease1", "_id": "a", "gene": [{"symbol": "BRCA1"}]},
+            {"query": "disease1", "_id": "b", "causal_gene": {"symbol": "BRCA1"}},
+            {"query": "disease2", "_id": "c"}
+        ]
+        
+        result = await gene_association_api.get_gene_disease_scores_batch(
+            mock_client,
+            gene_symbol="BRCA1",
+            disease_ids=["disease1", "disease2"]
+        )
+        
+        first, second = result["associations"]
+        assert [m["source"] for m in first["associations"]] == ["primary", "causal"]
+        assert second["disease_id"] == "disease2"
+        assert second["is_associated"] is False
+        assert second["notfound"] is False
+    
+    @pytest.mark.asyncio
+    async def test_get_gene_disease_score_unknown_disease_raises(self, gene_association_api, mock_client):
+        """Test an unknown disease id surfaces the client error."""
+        mock_client.get.side_effect = MyDiseaseError("HTTP error 404: not found")
+        
+        with pytest.raises(MyDiseaseError):
+            await gene_association_api.get_gene_disease_score(
+                mock_client,
+                gene_symbol="BRCA1",
+                disease_id="missing"
+            )
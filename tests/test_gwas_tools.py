@@ -1,19 +1,17 @@
 """Tests for GWAS tools."""
 
 import pytest
-from mydisease_mcp.tools.gwas import GWASApi
 
 
 class TestGWASTools:
     """Test GWAS data tools."""
     
     @pytest.mark.asyncio
-    async def test_get_gwas_associations(self, mock_client, sample_gwas_data):
+    async def test_get_gwas_associations(self, gwas_api, mock_client, sample_gwas_data):
         """Test getting GWAS associations."""
         mock_client.get.return_value = sample_gwas_data
         
-        api = GWASApi()
-        result = await api.get_gwas_associations(
+        result = await gwas_api.get_gwas_associations(
             mock_client,
             disease_id="test-id",
             p_value_threshold=5e-8
@@ -25,7 +23,7 @@ class TestGWASTools:
         assert float(result["gwas_data"]["associations"][0]["p_value"]) < 5e-8
     
     @pytest.mark.asyncio
-    async def test_search_gwas_by_trait(self, mock_client):
+    async def test_search_gwas_by_trait(self, gwas_api, mock_client):
         """Test searching GWAS by trait."""
         mock_client.get.return_value = {
             "hits": [
@@ -43,8 +41,7 @@ class TestGWASTools:
             ]
         }
         
-        api = GWASApi()
-        result = await api.search_gwas_by_trait(
+        result = await gwas_api.search_gwas_by_trait(
             mock_client,
             trait="Type 2 diabetes",
             min_sample_size=10000,
@@ -57,7 +54,7 @@ class TestGWASTools:
         assert result["studies"][0]["sample_size"] == "50000"
     
     @pytest.mark.asyncio
-    async def test_get_gwas_variants(self, mock_client):
+    async def test_get_gwas_variants(self, gwas_api, mock_client):
         """Test getting GWAS variants."""
         mock_client.get.return_value = {
             "gwas_catalog": [
@@ -71,8 +68,7 @@ class TestGWASTools:
             ]
         }
         
-        api = GWASApi()
-        result = await api.get_gwas_variants(
+        result = await gwas_api.get_gwas_variants(
             mock_client,
             disease_id="test-id",
             gene_symbol="GENE1"
@@ -83,7 +79,7 @@ class TestGWASTools:
         assert "GENE1" in result["variants"]["variants_by_gene"]
     
     @pytest.mark.asyncio
-    async def test_get_gwas_statistics(self, mock_client):
+    async def test_get_gwas_statistics(self, gwas_api, mock_client):
         """Test getting GWAS statistics."""
         mock_client.get.return_value = {
             "gwas_catalog": [
@@ -104,8 +100,7 @@ class TestGWASTools:
             ]
         }
         
-        api = GWASApi()
-        result = await api.get_gwas_statistics(
+        result = await gwas_api.get_gwas_statistics(
             mock_client,
             disease_id="test-id"
         )
@@ -115,4 +110,65 @@ class TestGWASTools:
         assert stats["total_associations"] == 2
         assert stats["significant_associations"] == 2
         assert stats["unique_variants"] == 2
-        assert "European" in stats["ancestry_distribution"]
\ No newline at end of file
+        assert "European" in stats["ancestry_distribution"]
+        assert stats["median_odds_ratio"] == 1.25
+        assert stats["strongest_association"]["rsid"] == "rs1"
+    
+    @pytest.mark.asyncio
+    async def test_get_gwas_statistics_many(self, gwas_api, mock_client):
+        """Test summarizing GWAS findings for several diseases in one request."""
+        mock_client.post.return_value = [
+            {"query": "d1", "_id": "d1", "gwas_catalog": [{"rsid": "rs1", "p_value": "1e-10"}]},
+            {"query": "bad", "notfound": True},
+            {"query": "d2", "_id": "d2"}
+        ]
+        
+        result = await gwas_api.get_gwas_statistics_many(
+            mock_client,
+            disease_ids=["d1", "bad", "d2"]
+        )
+        
+        mock_client.post.assert_called_once()
+        mock_client.get.assert_not_called()
+        assert mock_client.post.call_args.args[1]["ids"] == ["d1", "bad", "d2"]
+        assert result["total"] == 2
+        assert [s["disease_id"] for s in result["statistics"]] == ["d1", "d2"]
+        assert result["statistics"][0]["significant_associations"] == 1
+        assert result["statistics"][1]["total_associations"] == 0
+        assert result["missing_ids"] == ["bad"]
+    
+    @pytest.mark.asyncio
+    async def test_search_gwas_by_trait_filters_sample_size_server_side(self, gwas_api, mock_client):
+        """Test the sample size filter is sent as a Lucene range query."""
+        mock_client.get.return_value = {"hits": []}
+        
+        await gwas_api.search_gwas_by_trait(
+            mock_client,
+            trait="Asthma",
+            min_sample_size=10000,
+            size=5
+        )
+        
+        params = mock_client.get.call_args.kwargs["params"]
+        assert params["q"] == 'gwas_catalog.trait:"Asthma" AND gwas_catalog.sample_size:[10000 TO *]'
+        assert params["size"] == 100
+    
+    @pytest.mark.asyncio
+    async def test_search_gwas_by_trait_size_limits_studies(self, gwas_api, mock_client):
+        """Test size caps the returned studies rather than the disease hits."""
+        mock_client.get.return_value = {
+            "hits": [
+                {
+                    "_id": f"disease{i}",
+                    "name": f"Disease {i}",
+                    "gwas_catalog": {"trait": "Asthma", "p_value": f"1e-{i + 5}"}
+                }
+                for i in range(5)
+            ]
+        }
+        
+        result = await gwas_api.search_gwas_by_trait(mock_client, trait="Asthma", size=3)
+        
+        assert mock_client.get.call_args.kwargs["params"]["size"] == 100
+        assert result["total_studies"] == 5
+        assert [s["disease_id"] for s in result["studies"]] == ["disease4", "disease3", "disease2"]
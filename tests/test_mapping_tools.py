@@ -1,19 +1,17 @@
 """Tests for mapping tools."""
 
 import pytest
-from mydisease_mcp.tools.mapping import MappingApi
 
 
 class TestMappingTools:
     """Test disease identifier mapping tools."""
     
     @pytest.mark.asyncio
-    async def test_map_disease_ids(self, mock_client, sample_mapping_results):
+    async def test_map_disease_ids(self, mapping_api, mock_client, sample_mapping_results):
         """Test mapping disease identifiers."""
         mock_client.post.return_value = sample_mapping_results
         
-        api = MappingApi()
-        result = await api.map_disease_ids(
+        result = await mapping_api.map_disease_ids(
             mock_client,
             input_ids=["143100"],
             from_type="omim",
@@ -26,15 +24,14 @@ class TestMappingTools:
         assert result["mappings"][0]["mappings"]["orphanet"] == "ORPHA:399"
     
     @pytest.mark.asyncio
-    async def test_validate_disease_ids(self, mock_client):
+    async def test_validate_disease_ids(self, mapping_api, mock_client):
         """Test validating disease identifiers."""
         mock_client.post.return_value = [
             {"found": True, "query": "143100", "_id": "MONDO:0007739", "name": "Huntington disease", "mondo": {"mondo": "MONDO:0007739"}},
             {"found": False, "query": "999999"}
         ]
         
-        api = MappingApi()
-        result = await api.validate_disease_ids(
+        result = await mapping_api.validate_disease_ids(
             mock_client,
             identifiers=["143100", "999999"],
             identifier_type="omim"
@@ -47,7 +44,7 @@ class TestMappingTools:
         assert "999999" in result["invalid_identifiers"]
     
     @pytest.mark.asyncio
-    async def test_find_common_diseases(self, mock_client):
+    async def test_find_common_diseases(self, mapping_api, mock_client):
         """Test finding common diseases across lists."""
         # Mock the post responses for map_disease_ids calls
         mock_client.post.side_effect = [
@@ -90,8 +87,7 @@ class TestMappingTools:
             ]
         ]
         
-        api = MappingApi()
-        result = await api.find_common_diseases(
+        result = await mapping_api.find_common_diseases(
             mock_client,
             identifier_lists={
                 "omim_ids": ["143100", "104300"],
@@ -109,4 +105,148 @@ class TestMappingTools:
         common_disease = result["common_diseases"][0]
         identifier_lists = [id_info["list"] for id_info in common_disease["identifiers"]]
         assert "omim_ids" in identifier_lists
-        assert "orphanet_ids" in identifier_lists
\ No newline at end of file
+        assert "orphanet_ids" in identifier_lists
+    
+    @pytest.mark.asyncio
+    async def test_map_disease_ids_chunks_large_inputs(self, mapping_api, mock_client):
+        """Test inputs beyond the batch limit are split across several POSTs."""
+        async def post(endpoint, data):
+            return [{"found": False, "query": input_id} for input_id in data["ids"]]
+        
+        mock_client.post.side_effect = post
+        input_ids = [str(i) for i in range(2500)]
+        
+        result = await mapping_api.map_disease_ids(
+            mock_client,
+            input_ids=input_ids,
+            from_type="omim",
+            to_types=["mondo"]
+        )
+        
+        assert mock_client.post.await_count == 3
+        assert [len(call.args[1]["ids"]) for call in mock_client.post.call_args_list] == [1000, 1000, 500]
+        assert result["unmapped_ids"] == input_ids
+    
+    @pytest.mark.asyncio
+    async def test_find_common_diseases_rejects_unknown_list_before_querying(self, mapping_api, mock_client):
+        """Test list names are resolved up front so no mapping request is wasted."""
+        with pytest.raises(ValueError, match="Cannot determine identifier type"):
+            await mapping_api.find_common_diseases(
+                mock_client,
+                identifier_lists={
+                    "omim_ids": ["143100"],
+                    "mystery_ids": ["X1"]
+                }
+            )
+        
+        mock_client.post.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_map_disease_ids_extracts_nested_types(self, mapping_api, mock_client):
+        """Test nested and list-shaped identifier blocks are extracted."""
+        mock_client.post.return_value = [
+            {
+                "found": True,
+                "query": "143100",
+                "name": "Huntington disease",
+                "disease_ontology": {"doid": "DOID:12858"},
+                "umls": {"cui": "C0020179"},
+                "hpo": [{"hpo_id": "HP:0002072"}, {"hpo_id": "HP:0001300"}]
+            }
+        ]
+        
+        result = await mapping_api.map_disease_ids(
+            mock_client,
+            input_ids=["143100"],
+            from_type="omim",
+            to_types=["doid", "umls", "hp", "mesh", "unknown"]
+        )
+        
+        assert result["mappings"][0]["mappings"] == {
+            "doid": "DOID:12858",
+            "umls": "C0020179",
+            "hp": "HP:0002072"
+        }
+    
+    @pytest.mark.asyncio
+    async def test_map_disease_ids_posts_unique_ids(self, mapping_api, mock_client):
+        """Test duplicate inputs are queried once and reported per input."""
+        mock_client.post.return_value = [
+            {"found": True, "query": "143100", "name": "Huntington disease", "mondo": {"mondo": "MONDO:0007739"}},
+            {"found": False, "query": "999999"}
+        ]
+        
+        result = await mapping_api.map_disease_ids(
+            mock_client,
+            input_ids=["143100", "999999", "143100"],
+            from_type="omim",
+            to_types=["mondo"]
+        )
+        
+        assert mock_client.post.call_args[0][1]["ids"] == ["143100", "999999"]
+        assert result["total_input"] == 3
+        assert result["mapped"] == 2
+        assert [m["input"] for m in result["mappings"]] == ["143100", "143100"]
+        assert result["unmapped_ids"] == ["999999"]
+    
+    @pytest.mark.asyncio
+    async def test_validate_disease_ids_requests_narrow_projection(self, mapping_api, mock_client):
+        """Test validation only asks for the name and MONDO ID fields."""
+        mock_client.post.return_value = []
+        
+        await mapping_api.validate_disease_ids(
+            mock_client,
+            identifiers=["143100"],
+            identifier_type="omim"
+        )
+        
+        assert mock_client.post.call_args[0][1]["fields"] == "_id,name,mondo.mondo,mondo.id"
+    
+    @pytest.mark.asyncio
+    async def test_map_disease_ids_without_target_types(self, mapping_api, mock_client):
+        """Test an empty to_types list still reports found and missing inputs."""
+        mock_client.post.return_value = [
+            {"found": True, "query": "143100", "name": "Huntington disease", "mondo": {"mondo": "MONDO:0007739"}},
+            {"found": False, "query": "999999"}
+        ]
+        
+        result = await mapping_api.map_disease_ids(
+            mock_client,
+            input_ids=["143100", "999999"],
+            from_type="omim",
+            to_types=[]
+        )
+        
+        assert mock_client.post.call_args[0][1]["fields"] == "_id,name"
+        assert result["mappings"] == [{
+            "input": "143100",
+            "from_type": "omim",
+            "disease_name": "Huntington disease",
+            "mappings": {}
+        }]
+        assert result["unmapped_ids"] == ["999999"]
+    
+    @pytest.mark.asyncio
+    async def test_find_common_diseases_maps_same_type_lists_together(self, mapping_api, mock_client):
+        """Test lists sharing an identifier type are mapped in one request."""
+        mock_client.post.return_value = [
+            {"found": True, "query": "143100", "name": "Huntington disease", "mondo": {"mondo": "MONDO:0007739"}},
+            {"found": True, "query": "104300", "name": "Alzheimer disease", "mondo": {"mondo": "MONDO:0004975"}}
+        ]
+        
+        result = await mapping_api.find_common_diseases(
+            mock_client,
+            identifier_lists={
+                "omim_ids_cohort_a": ["143100", "104300"],
+                "omim_ids_cohort_b": ["143100"]
+            }
+        )
+        
+        mock_client.post.assert_awaited_once()
+        assert mock_client.post.call_args[0][1]["ids"] == ["143100", "104300"]
+        assert result["total_unique_diseases"] == 2
+        assert [d["disease_id"] for d in result["common_diseases"]] == ["MONDO:0007739"]
+        assert result["common_diseases"][0]["identifiers"] == [
+            {"list": "omim_ids_cohort_a", "identifier": "143100"},
+            {"list": "omim_ids_cohort_b", "identifier": "143100"}
+        ]
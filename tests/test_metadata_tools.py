@@ -1,33 +1,31 @@
 """Tests for metadata tools."""
 
 import pytest
-from mydisease_mcp.tools.metadata import MetadataApi
+from mydisease_mcp.tools.metadata import METADATA_CACHE_TTL
 
 
 class TestMetadataTools:
     """Test metadata and utility tools."""
     
     @pytest.mark.asyncio
-    async def test_get_mydisease_metadata(self, mock_client, sample_metadata):
+    async def test_get_mydisease_metadata(self, metadata_api, mock_client, sample_metadata):
         """Test getting MyDisease.info metadata."""
         mock_client.get.return_value = sample_metadata
         
-        api = MetadataApi()
-        result = await api.get_mydisease_metadata(mock_client)
+        result = await metadata_api.get_mydisease_metadata(mock_client)
         
         assert result["success"] is True
         assert result["metadata"]["build_version"] == "20240101"
         assert result["metadata"]["stats"]["total"] == 30000
         
-        mock_client.get.assert_called_once_with("metadata")
+        mock_client.get.assert_called_once_with("metadata", cache_ttl=METADATA_CACHE_TTL)
     
     @pytest.mark.asyncio
-    async def test_get_available_fields(self, mock_client, sample_fields_metadata):
+    async def test_get_available_fields(self, metadata_api, mock_client, sample_fields_metadata):
         """Test getting available fields."""
         mock_client.get.return_value = sample_fields_metadata
         
-        api = MetadataApi()
-        result = await api.get_available_fields(mock_client)
+        result = await metadata_api.get_available_fields(mock_client)
         
         assert result["success"] is True
         assert result["total_fields"] == len(sample_fields_metadata)
@@ -35,15 +33,14 @@ class TestMetadataTools:
         assert "identifiers" in result["field_categories"]
         assert "genetic" in result["field_categories"]
         
-        mock_client.get.assert_called_once_with("metadata/fields")
+        mock_client.get.assert_called_once_with("metadata/fields", cache_ttl=METADATA_CACHE_TTL)
     
     @pytest.mark.asyncio
-    async def test_get_database_statistics(self, mock_client, sample_metadata):
+    async def test_get_database_statistics(self, metadata_api, mock_client, sample_metadata):
         """Test getting database statistics."""
         mock_client.get.return_value = sample_metadata
         
-        api = MetadataApi()
-        result = await api.get_database_statistics(mock_client)
+        result = await metadata_api.get_database_statistics(mock_client)
         
         assert result["success"] is True
         stats = result["statistics"]
@@ -56,4 +53,23 @@ class TestMetadataTools:
         # Check coverage summary
         assert "coverage_summary" in stats
         assert stats["coverage_summary"]["genetic_diseases"] == 10000
-        assert stats["coverage_summary"]["rare_diseases"] == 7000
\ No newline at end of file
+        assert stats["coverage_summary"]["rare_diseases"] == 7000
+        mock_client.get.assert_called_once_with("metadata", cache_ttl=METADATA_CACHE_TTL)
+    
+    @pytest.mark.asyncio
+    async def test_get_available_fields_categories(self, metadata_api, mock_client):
+        """Test fields land in the first matching category and copies are returned."""
+        mock_client.get.return_value = {
+            "mondo.mondo": {}, "gene.symbol": {}, "disgenet.gene": {},
+            "clinical.features": {}, "name": {}
+        }
+        
+        first = await metadata_api.get_available_fields(mock_client)
+        first["field_categories"]["basic_info"].append("mutated")
+        second = await metadata_api.get_available_fields(mock_client)
+        
+        categories = second["field_categories"]
+        assert categories["identifiers"] == ["mondo.mondo"]
+        assert categories["genetic"] == ["gene.symbol", "disgenet.gene"]
+        assert categories["clinical"] == ["clinical.features"]
+        assert categories["basic_info"] == ["name"]
@@ -1,19 +1,17 @@
 """Tests for ontology tools."""
 
 import pytest
-from mydisease_mcp.tools.ontology import OntologyApi
 
 
 class TestOntologyTools:
     """Test disease ontology and classification tools."""
     
     @pytest.mark.asyncio
-    async def test_get_disease_ontology(self, mock_client, sample_ontology_data):
+    async def test_get_disease_ontology(self, ontology_api, mock_client, sample_ontology_data):
         """Test getting disease ontology."""
         mock_client.get.return_value = sample_ontology_data
         
-        api = OntologyApi()
-        result = await api.get_disease_ontology(
+        result = await ontology_api.get_disease_ontology(
             mock_client,
             disease_id="test-id"
         )
@@ -23,7 +21,7 @@ class TestOntologyTools:
         assert result["ontology_data"]["ontologies"]["mondo"]["id"] == "MONDO:0007739"
     
     @pytest.mark.asyncio
-    async def test_get_disease_classification(self, mock_client):
+    async def test_get_disease_classification(self, ontology_api, mock_client):
         """Test getting disease classification."""
         mock_client.get.return_value = {
             "mondo": {
@@ -32,8 +30,7 @@ class TestOntologyTools:
             }
         }
         
-        api = OntologyApi()
-        result = await api.get_disease_classification(
+        result = await ontology_api.get_disease_classification(
             mock_client,
             disease_id="test-id"
         )
@@ -43,7 +40,7 @@ class TestOntologyTools:
         assert len(result["classification"]["hierarchy"]["children"]) == 1
     
     @pytest.mark.asyncio
-    async def test_get_related_diseases(self, mock_client):
+    async def test_get_related_diseases(self, ontology_api, mock_client):
         """Test getting related diseases."""
         # Mock initial disease
         mock_client.get.side_effect = [
@@ -55,7 +52,7 @@ class TestOntologyTools:
             # Mock sibling search
             {
                 "hits": [
-                    {"_id": "sibling1", "name": "Sibling Disease"}
+                    {"_id": "sibling1", "name": "Sibling Disease", "mondo": {"parents": [{"id": "MONDO:0000001"}]}}
                 ]
             },
             # Mock gene-related search
@@ -66,8 +63,7 @@ class TestOntologyTools:
             }
         ]
         
-        api = OntologyApi()
-        result = await api.get_related_diseases(
+        result = await ontology_api.get_related_diseases(
             mock_client,
             disease_id="test-id",
             relationship_type="all"
@@ -78,15 +74,14 @@ class TestOntologyTools:
         assert len(result["related_diseases"]["related_by_genes"]) > 0
     
     @pytest.mark.asyncio
-    async def test_navigate_disease_hierarchy(self, mock_client):
+    async def test_navigate_disease_hierarchy(self, ontology_api, mock_client):
         """Test navigating disease hierarchy."""
         mock_client.get.side_effect = [
             {"name": "Current Disease", "mondo": {"parents": [{"id": "parent1", "label": "Parent"}]}},
             {"name": "Parent Disease", "mondo": {"parents": [{"id": "grandparent1", "label": "Grandparent"}]}}
         ]
         
-        api = OntologyApi()
-        result = await api.navigate_disease_hierarchy(
+        result = await ontology_api.navigate_disease_hierarchy(
             mock_client,
             disease_id="test-id",
             direction="up",
@@ -95,4 +90,175 @@ class TestOntologyTools:
         
         assert result["success"] is True
         assert len(result["hierarchy"]["path"]) >= 2
-        assert result["hierarchy"]["path"][0]["disease_name"] == "Current Disease"
\ No newline at end of file
+        assert result["hierarchy"]["path"][0]["disease_name"] == "Current Disease"
+    
+    @pytest.mark.asyncio
+    async def test_get_related_diseases_queries_each_parent(self, ontology_api, mock_client):
+        """Test sibling lookup issues one size-limited query per parent."""
+        siblings = {
+            'mondo.parents.id:("MONDO:1")': {"hits": [{"_id": "test-id", "name": "Test Disease"}]},
+            'mondo.parents.id:("MONDO:2")': {
+                "hits": [{"_id": "test-id", "name": "Test Disease"}, {"_id": "sib", "name": "Sibling"}]
+            }
+        }
+        
+        async def get(endpoint, params):
+            if endpoint == "query":
+                return siblings[params["q"]]
+            return {"name": "Test Disease", "mondo": {"parents": [{"id": "MONDO:1"}, {"id": "MONDO:2"}]}}
+        
+        mock_client.get.side_effect = get
+        
+        result = await ontology_api.get_related_diseases(
+            mock_client,
+            disease_id="test-id",
+            relationship_type="hierarchy",
+            size=10
+        )
+        
+        assert mock_client.get.await_count == 3
+        for call in mock_client.get.call_args_list[1:]:
+            assert call.kwargs["params"]["fields"] == "_id,name"
+            assert call.kwargs["params"]["size"] == 11
+        assert result["related_diseases"]["related_by_hierarchy"] == [{
+            "disease_id": "sib",
+            "disease_name": "Sibling",
+            "relationship": "sibling",
+            "via_parent": "MONDO:2"
+        }]
+    
+    @pytest.mark.asyncio
+    async def test_navigate_disease_hierarchy_up_uses_ancestor_batch(self, ontology_api, mock_client):
+        """Test upward navigation resolves the chain from one ancestor batch fetch."""
+        mock_client.get.return_value = {
+            "name": "Current Disease",
+            "mondo": {
+                "parents": [{"id": "P1", "label": "Parent"}],
+                "ancestors": ["P1", "G1", "ROOT"]
+            }
+        }
+        mock_client.post.return_value = [
+            {"query": "P1", "_id": "P1", "mondo": {"parents": [{"id": "G1", "label": "Grandparent"}]}},
+            {"query": "G1", "_id": "G1", "mondo": {"parents": [{"id": "ROOT", "label": "Root"}]}},
+            {"query": "ROOT", "notfound": True}
+        ]
+        
+        result = await ontology_api.navigate_disease_hierarchy(
+            mock_client,
+            disease_id="test-id",
+            direction="up",
+            levels=3
+        )
+        
+        mock_client.get.assert_awaited_once()
+        mock_client.post.assert_awaited_once()
+        assert mock_client.post.call_args[0][0] == "disease"
+        assert [step["disease_id"] for step in result["hierarchy"]["path"]] == [
+            "test-id", "P1", "G1", "ROOT"
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_get_disease_classification_requests_hierarchy_fields(self, ontology_api, mock_client):
+        """Test classification only requests the hierarchy subfields it reads."""
+        mock_client.get.return_value = {}
+        
+        await ontology_api.get_disease_classification(mock_client, disease_id="test-id")
+        
+        assert mock_client.get.call_args.kwargs["params"]["fields"] == (
+            "mondo.parents,mondo.children,mondo.ancestors,"
+            "disease_ontology.parents,disease_ontology.children"
+        )
+    
+    @pytest.mark.asyncio
+    async def test_navigate_disease_hierarchy_down_walks_each_level(self, ontology_api, mock_client):
+        """Test downward navigation expands every child of each level."""
+        mock_client.get.return_value = {
+            "name": "Root",
+            "mondo": {"children": [{"id": "A", "label": "A"}, {"id": "B", "label": "B"}]}
+        }
+        mock_client.post.return_value = [
+            {"query": "A", "_id": "A", "mondo": {"children": [{"id": "C", "label": "C"}]}},
+            {"query": "B", "_id": "B", "mondo": {"children": [{"id": "C", "label": "C"}, {"id": "D", "label": "D"}]}}
+        ]
+        
+        result = await ontology_api.navigate_disease_hierarchy(
+            mock_client,
+            disease_id="root",
+            direction="down",
+            levels=2
+        )
+        
+        path = result["hierarchy"]["path"]
+        assert mock_client.get.await_count == 1
+        assert mock_client.post.call_args.args[1]["ids"] == ["A", "B"]
+        assert [d["disease_id"] for d in path[1]["diseases"]] == ["A", "B"]
+        assert [d["disease_id"] for d in path[2]["diseases"]] == ["C", "D"]
+    
+    @pytest.mark.asyncio
+    async def test_get_related_diseases_fills_each_parent_share(self, ontology_api, mock_client):
+        """Test a parent with many children does not crowd out another parent's siblings."""
+        siblings = {
+            'mondo.parents.id:("P1")': {"hits": [{"_id": f"a{i}", "name": f"A{i}"} for i in range(3)]},
+            'mondo.parents.id:("P2")': {"hits": [{"_id": "d", "name": "D"}]}
+        }
+        
+        async def get(endpoint, params):
+            if endpoint == "query":
+                return siblings[params["q"]]
+            return {"mondo": {"parents": [{"id": "P1"}, {"id": "P2"}]}}
+        
+        mock_client.get.side_effect = get
+        
+        result = await ontology_api.get_related_diseases(
+            mock_client,
+            disease_id="test-id",
+            relationship_type="hierarchy",
+            size=2
+        )
+        
+        assert [
+            (s["disease_id"], s["via_parent"])
+            for s in result["related_diseases"]["related_by_hierarchy"]
+        ] == [("a0", "P1"), ("a1", "P1"), ("d", "P2")]
+    
+    @pytest.mark.asyncio
+    async def test_get_related_diseases_caps_sibling_query_size(self, ontology_api, mock_client):
+        """Test the sibling searches stay within the API's hit limit."""
+        mock_client.get.side_effect = [
+            {"mondo": {"parents": [{"id": "P1"}]}},
+            {"hits": []}
+        ]
+        
+        await ontology_api.get_related_diseases(
+            mock_client,
+            disease_id="test-id",
+            relationship_type="hierarchy",
+            size=5000
+        )
+        
+        assert mock_client.get.call_args.kwargs["params"]["size"] == 1000
+    
+    @pytest.mark.asyncio
+    async def test_navigate_disease_hierarchy_down_bounds_lookups(self, ontology_api, mock_client):
+        """Test children without ids are skipped and child lookups stop at the cap."""
+        from mydisease_mcp.tools.ontology import HIERARCHY_MAX_CHILDREN
+        
+        mock_client.get.return_value = {"name": "Root", "mondo": {"children": [
+            {"label": "No id"}, *({"id": f"C{i}"} for i in range(HIERARCHY_MAX_CHILDREN + 5))
+        ]}}
+        mock_client.post.return_value = [
+            {"query": "C0", "_id": "C0", "mondo": {"children": [{"id": "G0"}]}}
+        ]
+        
+        result = await ontology_api.navigate_disease_hierarchy(
+            mock_client,
+            disease_id="root",
+            direction="down",
+            levels=3
+        )
+        
+        path = result["hierarchy"]["path"]
+        assert len(path[1]["diseases"]) == HIERARCHY_MAX_CHILDREN + 5
+        assert [d["disease_id"] for d in path[2]["diseases"]] == ["G0"]
+        mock_client.post.assert_awaited_once()
+        assert mock_client.post.call_args.args[1]["ids"] == [f"C{i}" for i in range(HIERARCHY_MAX_CHILDREN)]
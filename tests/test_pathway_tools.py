@@ -1,19 +1,17 @@
 """Tests for pathway tools."""
 
 import pytest
-from mydisease_mcp.tools.pathway import PathwayApi
 
 
 class TestPathwayTools:
     """Test pathway and biological process tools."""
     
     @pytest.mark.asyncio
-    async def test_get_disease_pathways(self, mock_client, sample_pathway_data):
+    async def test_get_disease_pathways(self, pathway_api, mock_client, sample_pathway_data):
         """Test getting disease pathways."""
         mock_client.get.return_value = sample_pathway_data
         
-        api = PathwayApi()
-        result = await api.get_disease_pathways(
+        result = await pathway_api.get_disease_pathways(
             mock_client,
             disease_id="test-id"
         )
@@ -23,60 +21,41 @@ class TestPathwayTools:
         assert len(result["pathways"]["all_pathways"]) == 2
     
     @pytest.mark.asyncio
-    async def test_search_diseases_by_pathway(self, mock_client):
-        """Test searching diseases by pathway."""
+    @pytest.mark.parametrize("source_field, source, pathway_id, pathway_name", [
+        ("kegg_pathway", "kegg", "hsa04110", "Cell cycle"),
+        ("wikipathways", "wikipathways", "WP254", None),
+    ])
+    async def test_search_diseases_by_pathway(
+        self, pathway_api, mock_client, source_field, source, pathway_id, pathway_name
+    ):
+        """Test searching diseases by pathway ID, with or without a name."""
         mock_client.get.return_value = {
             "hits": [
                 {
                     "_id": "disease1",
                     "name": "Disease 1",
-                    "kegg_pathway": {
-                        "id": "hsa04110",
-                        "name": "Cell cycle"
+                    source_field: {
+                        "id": pathway_id,
+                        "name": pathway_name or "Pathway X"
                     }
                 }
             ]
         }
         
-        api = PathwayApi()
-        result = await api.search_diseases_by_pathway(
+        result = await pathway_api.search_diseases_by_pathway(
             mock_client,
-            pathway_id="hsa04110",
-            pathway_name="Cell cycle"
+            pathway_id=pathway_id,
+            pathway_name=pathway_name
         )
         
         assert result["success"] is True
         assert result["total_diseases"] == 1
-        assert result["diseases"][0]["pathway_associations"][0]["pathway_id"] == "hsa04110"
-
-    @pytest.mark.asyncio
-    async def test_search_diseases_by_wikipathway(self, mock_client):
-        """Test searching diseases by WikiPathways ID."""
-        mock_client.get.return_value = {
-            "hits": [
-                {
-                    "_id": "disease1",
-                    "name": "Disease 1",
-                    "wikipathways": {
-                        "id": "WP254",
-                        "name": "Pathway X"
-                    }
-                }
-            ]
-        }
-
-        api = PathwayApi()
-        result = await api.search_diseases_by_pathway(
-            mock_client,
-            pathway_id="WP254",
-        )
-
-        assert result["success"] is True
-        assert result["total_diseases"] == 1
-        assert result["diseases"][0]["pathway_associations"][0]["source"] == "wikipathways"
+        association = result["diseases"][0]["pathway_associations"][0]
+        assert association["pathway_id"] == pathway_id
+        assert association["source"] == source
     
     @pytest.mark.asyncio
-    async def test_get_pathway_genes(self, mock_client):
+    async def test_get_pathway_genes(self, pathway_api, mock_client):
         """Test getting pathway genes."""
         mock_client.get.return_value = {
             "gene": [{"symbol": "GENE1"}],
@@ -86,8 +65,7 @@ class TestPathwayTools:
             }
         }
         
-        api = PathwayApi()
-        result = await api.get_pathway_genes(
+        result = await pathway_api.get_pathway_genes(
             mock_client,
             disease_id="test-id"
         )
@@ -98,7 +76,7 @@ class TestPathwayTools:
         assert "GENE1" in result["pathway_genes"]["overlapping_genes"]
     
     @pytest.mark.asyncio
-    async def test_get_pathway_enrichment(self, mock_client):
+    async def test_get_pathway_enrichment(self, pathway_api, mock_client):
         """Test pathway enrichment analysis."""
         mock_client.get.return_value = {
             "hits": [
@@ -111,8 +89,7 @@ class TestPathwayTools:
             ]
         }
         
-        api = PathwayApi()
-        result = await api.get_pathway_enrichment(
+        result = await pathway_api.get_pathway_enrichment(
             mock_client,
             gene_list=["GENE1", "GENE2", "GENE3"],
             p_value_cutoff=0.05
@@ -120,3 +97,141 @@ class TestPathwayTools:
         
         assert result["success"] is True
         assert len(result["enriched_pathways"]) > 0
+    
+    @pytest.mark.asyncio
+    async def test_pathway_views_share_projection(self, pathway_api, mock_client):
+        """Test both per-disease pathway views request the same cacheable field set."""
+        mock_client.get.return_value = {}
+        
+        await pathway_api.get_disease_pathways(mock_client, disease_id="test-id")
+        await pathway_api.get_pathway_genes(mock_client, disease_id="test-id")
+        
+        first, second = mock_client.get.call_args_list
+        assert first == second
+    
+    @pytest.mark.asyncio
+    async def test_get_disease_pathways_tags_sources_without_mutating_record(self, pathway_api, mock_client):
+        """Test source-specific pathways are tagged on copies of the fetched entries."""
+        record = {
+            "pathway": [{"id": "P1", "source": "reactome"}, {"id": "P2", "source": "biocarta"}],
+            "kegg_pathway": {"id": "hsa04110"},
+            "reactome_pathway": [{"id": "R-HSA-1"}]
+        }
+        mock_client.get.return_value = record
+        
+        result = await pathway_api.get_disease_pathways(
+            mock_client,
+            disease_id="test-id",
+            source="reactome"
+        )
+        
+        pathways = result["pathways"]
+        assert pathways["all_pathways"] == [
+            {"id": "P1", "source": "reactome"},
+            {"id": "R-HSA-1", "source": "reactome"}
+        ]
+        assert pathways["pathways_by_source"] == {"reactome": [{"id": "R-HSA-1"}]}
+        assert record["reactome_pathway"] == [{"id": "R-HSA-1"}]
+    
+    @pytest.mark.asyncio
+    async def test_search_diseases_by_pathway_matches_name_case_insensitively(self, pathway_api, mock_client):
+        """Test pathway name matches ignore case and report the source name."""
+        mock_client.get.return_value = {
+            "hits": [
+                {
+                    "_id": "disease1",
+                    "name": "Disease 1",
+                    "reactome_pathway": [
+                        {"id": "R-HSA-1", "name": "Cell Cycle Checkpoints"},
+                        {"id": "R-HSA-2", "name": "Apoptosis"}
+                    ]
+                },
+                {"_id": "disease2", "name": "Disease 2", "pathway": {"id": "X", "name": "Other"}}
+            ]
+        }
+        
+        result = await pathway_api.search_diseases_by_pathway(
+            mock_client,
+            pathway_id="hsa04110",
+            pathway_name="cell cycle"
+        )
+        
+        assert result["total_diseases"] == 1
+        assert result["diseases"][0]["pathway_associations"] == [{
+            "source": "reactome",
+            "pathway_id": "R-HSA-1",
+            "pathway_name": "Cell Cycle Checkpoints"
+        }]
+    
+    @pytest.mark.asyncio
+    async def test_get_pathway_enrichment_splits_long_gene_lists(self, pathway_api, mock_client):
+        """Test long gene lists become concurrent queries with hits merged by disease."""
+        hit = {
+            "_id": "disease1",
+            "name": "Disease 1",
+            "gene": [{"symbol": "G0"}],
+            "kegg_pathway": {"id": "hsa04110", "name": "Cell cycle"}
+        }
+        mock_client.get.return_value = {"hits": [hit]}
+        gene_list = [f"G{i}" for i in range(120)]
+        
+        result = await pathway_api.get_pathway_enrichment(
+            mock_client,
+            gene_list=gene_list,
+            p_value_cutoff=0.0
+        )
+        
+        queries = [call.kwargs["params"]["q"] for call in mock_client.get.call_args_list]
+        assert len(queries) == 3
+        assert queries[0].startswith('gene.symbol:("G0" OR "G1"')
+        assert result["enriched_pathways"][0]["disease_count"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_get_pathway_genes_collects_kegg_and_reactome(self, pathway_api, mock_client):
+        """Test genes are gathered per pathway, skipping pathways without genes."""
+        mock_client.get.return_value = {
+            "gene": {"symbol": "GENE2"},
+            "kegg_pathway": [{"id": "hsa1", "genes": "GENE1"}, {"id": "hsa2"}],
+            "reactome_pathway": {"id": "R-HSA-1", "genes": ["GENE2", "GENE3"]}
+        }
+        
+        result = await pathway_api.get_pathway_genes(mock_client, disease_id="test-id")
+        
+        pathway_genes = result["pathway_genes"]
+        assert pathway_genes["disease_genes"] == ["GENE2"]
+        assert pathway_genes["pathway_specific_genes"] == {
+            "hsa1": ["GENE1"],
+            "R-HSA-1": ["GENE2", "GENE3"]
+        }
+        assert sorted(pathway_genes["all_pathway_genes"]) == ["GENE1", "GENE2", "GENE3"]
+        assert pathway_genes["overlapping_genes"] == ["GENE2"]
+    
+    @pytest.mark.asyncio
+    async def test_get_pathway_enrichment_returns_top_pathways(self, pathway_api, mock_client):
+        """Test only the highest-scoring pathways are returned, best first."""
+        mock_client.get.return_value = {
+            "hits": [
+                {
+                    "_id": "disease1",
+                    "gene": [{"symbol": "GENE1"}],
+                    "pathway": [{"id": "P1"}, {"id": "P2"}]
+                },
+                {
+                    "_id": "disease2",
+                    "gene": [{"symbol": "GENE1"}, {"symbol": "GENE2"}],
+                    "kegg_pathway": [{"id": "P2"}, {"id": "P3"}]
+                }
+            ]
+        }
+        
+        result = await pathway_api.get_pathway_enrichment(
+            mock_client,
+            gene_list=["GENE1", "GENE2"],
+            p_value_cutoff=0.0,
+            size=2
+        )
+        
+        assert [(p["pathway_id"], p["enrichment_score"]) for p in result["enriched_pathways"]] == [
+            ("P2", 1.5),
+            ("P3", 1.0)
+        ]
@@ -1,19 +1,17 @@
 """Tests for phenotype tools."""
 
 import pytest
-from mydisease_mcp.tools.phenotype import PhenotypeApi
 
 
 class TestPhenotypeTools:
     """Test phenotype and clinical feature tools."""
     
     @pytest.mark.asyncio
-    async def test_get_disease_phenotypes(self, mock_client, sample_phenotype_data):
+    async def test_get_disease_phenotypes(self, phenotype_api, mock_client, sample_phenotype_data):
         """Test getting disease phenotypes."""
         mock_client.get.return_value = sample_phenotype_data
         
-        api = PhenotypeApi()
-        result = await api.get_disease_phenotypes(
+        result = await phenotype_api.get_disease_phenotypes(
             mock_client,
             disease_id="test-id"
         )
@@ -25,7 +23,7 @@ class TestPhenotypeTools:
         assert result["phenotypes"]["clinical_features"][0]["frequency"] == "Very frequent (99-80%)"
     
     @pytest.mark.asyncio
-    async def test_search_by_hpo_term(self, mock_client):
+    async def test_search_by_hpo_term(self, phenotype_api, mock_client):
         """Test searching by HPO term."""
         mock_client.get.return_value = {
             "hits": [
@@ -41,8 +39,7 @@ class TestPhenotypeTools:
             ]
         }
         
-        api = PhenotypeApi()
-        result = await api.search_by_hpo_term(
+        result = await phenotype_api.search_by_hpo_term(
             mock_client,
             hpo_id="HP:0001250"
         )
@@ -53,7 +50,7 @@ class TestPhenotypeTools:
         assert result["diseases"][0]["phenotype_matches"][0]["hpo_id"] == "HP:0001250"
 
     @pytest.mark.asyncio
-    async def test_search_by_hpo_term_matches_hpo_list(self, mock_client):
+    async def test_search_by_hpo_term_matches_hpo_list(self, phenotype_api, mock_client):
         """Test HPO list payload matching."""
         mock_client.get.return_value = {
             "hits": [
@@ -68,8 +65,7 @@ class TestPhenotypeTools:
             ]
         }
 
-        api = PhenotypeApi()
-        result = await api.search_by_hpo_term(
+        result = await phenotype_api.search_by_hpo_term(
             mock_client,
             hpo_id="HP:0001250"
         )
@@ -79,7 +75,7 @@ class TestPhenotypeTools:
         assert result["diseases"][0]["phenotype_matches"][0]["hpo_id"] == "HP:0001250"
     
     @pytest.mark.asyncio
-    async def test_get_phenotype_similarity(self, mock_client):
+    async def test_get_phenotype_similarity(self, phenotype_api, mock_client):
         """Test phenotype similarity search."""
         mock_client.get.return_value = {
             "hits": [
@@ -95,8 +91,7 @@ class TestPhenotypeTools:
             ]
         }
         
-        api = PhenotypeApi()
-        result = await api.get_phenotype_similarity(
+        result = await phenotype_api.get_phenotype_similarity(
             mock_client,
             phenotype_list=["HP:0001250", "HP:0001252", "HP:0001251"],
             algorithm="jaccard",
@@ -109,7 +104,7 @@ class TestPhenotypeTools:
         assert result["diseases"][0]["similarity_score"] > 0
     
     @pytest.mark.asyncio
-    async def test_get_phenotype_frequency(self, mock_client):
+    async def test_get_phenotype_frequency(self, phenotype_api, mock_client):
         """Test getting phenotype frequency."""
         mock_client.get.return_value = {
             "phenotype_related_to_disease": [
@@ -122,8 +117,7 @@ class TestPhenotypeTools:
             ]
         }
         
-        api = PhenotypeApi()
-        result = await api.get_phenotype_frequency(
+        result = await phenotype_api.get_phenotype_frequency(
             mock_client,
             disease_id="test-id",
             phenotype_id="HP:0001250"
@@ -131,3 +125,136 @@ class TestPhenotypeTools:
         
         assert result["success"] is True
         assert result["frequency"]["frequency_info"]["frequency"] == "Very frequent (99-80%)"
+    
+    @pytest.mark.asyncio
+    async def test_phenotype_views_share_projection(self, phenotype_api, mock_client):
+        """Test both per-disease phenotype views request the same cacheable field set."""
+        mock_client.get.return_value = {}
+        
+        await phenotype_api.get_disease_phenotypes(mock_client, disease_id="test-id")
+        await phenotype_api.get_phenotype_frequency(mock_client, disease_id="test-id", phenotype_id="HP:0001250")
+        
+        first, second = mock_client.get.call_args_list
+        assert first == second
+    
+    @pytest.mark.asyncio
+    async def test_get_phenotype_similarity_groups_query_terms(self, phenotype_api, mock_client):
+        """Test HPO IDs and phenotype names are each OR'd within one clause per field."""
+        mock_client.get.return_value = {"hits": []}
+        
+        await phenotype_api.get_phenotype_similarity(
+            mock_client,
+            phenotype_list=["HP:0001250", "Ataxia", "HP:0001252"]
+        )
+        
+        mock_client.get.assert_awaited_once()
+        assert mock_client.get.call_args.kwargs["params"]["q"] == (
+            'hpo.hpo_id:("HP:0001250" OR "HP:0001252") OR '
+            'phenotype_related_to_disease.hpo_id:("HP:0001250" OR "HP:0001252") OR '
+            'hpo.phenotype_name:("Ataxia") OR '
+            'phenotype_related_to_disease.hpo_phenotype:("Ataxia")'
+        )
+    
+    @pytest.mark.asyncio
+    async def test_get_phenotype_similarity_scores(self, phenotype_api, mock_client):
+        """Test Jaccard and Dice scores for a partially overlapping profile."""
+        mock_client.get.return_value = {
+            "hits": [
+                {
+                    "_id": "disease1",
+                    "name": "Disease 1",
+                    "phenotype_related_to_disease": [
+                        {"hpo_id": "HP:1"}, {"hpo_id": "HP:2"}, {"hpo_id": "HP:9"}
+                    ]
+                }
+            ]
+        }
+        
+        jaccard = await phenotype_api.get_phenotype_similarity(
+            mock_client, phenotype_list=["HP:1", "HP:2", "HP:3"], min_similarity=0.0
+        )
+        dice = await phenotype_api.get_phenotype_similarity(
+            mock_client, phenotype_list=["HP:1", "HP:2", "HP:3"], algorithm="dice", min_similarity=0.0
+        )
+        
+        assert jaccard["diseases"][0]["similarity_score"] == 0.5
+        assert dice["diseases"][0]["similarity_score"] == 0.667
+        assert sorted(jaccard["diseases"][0]["matching_phenotypes"]) == ["HP:1", "HP:2"]
+    
+    @pytest.mark.asyncio
+    async def test_get_phenotype_similarity_ignores_unlabelled_entries(self, phenotype_api, mock_client):
+        """Test entries without an ID or name do not count toward a disease profile."""
+        mock_client.get.return_value = {
+            "hits": [
+                {
+                    "_id": "disease1",
+                    "name": "Disease 1",
+                    "hpo": {"hpo_id": "HP:1"},
+                    "phenotype_related_to_disease": [{"frequency": "Frequent"}]
+                }
+            ]
+        }
+        
+        result = await phenotype_api.get_phenotype_similarity(
+            mock_client, phenotype_list=["HP:1"], min_similarity=0.0
+        )
+        
+        assert result["diseases"][0]["similarity_score"] == 1.0
+        assert result["diseases"][0]["total_phenotypes"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_get_phenotype_frequency_reports_first_match(self, phenotype_api, mock_client):
+        """Test the first relation matching by ID or name supplies the frequency."""
+        mock_client.get.return_value = {
+            "phenotype_related_to_disease": [
+                {"hpo_id": "HP:1", "frequency": "Rare"},
+                {"hpo_id": "HP:2", "hpo_phenotype": "Seizure", "frequency": "Frequent"},
+                {"hpo_id": "HP:2", "frequency": "Occasional"}
+            ]
+        }
+        
+        found = await phenotype_api.get_phenotype_frequency(
+            mock_client, disease_id="test-id", phenotype_id="Seizure"
+        )
+        missing = await phenotype_api.get_phenotype_frequency(
+            mock_client, disease_id="test-id", phenotype_id="HP:9"
+        )
+        
+        assert found["frequency"]["frequency_info"]["frequency"] == "Frequent"
+        assert missing["frequency"]["frequency_info"] is None
+    
+    @pytest.mark.asyncio
+    async def test_get_phenotype_similarity_queries_each_term_once(self, phenotype_api, mock_client):
+        """Test repeated phenotypes are only quoted into the query once."""
+        mock_client.get.return_value = {"hits": []}
+        
+        await phenotype_api.get_phenotype_similarity(
+            mock_client,
+            phenotype_list=["HP:0001250", "HP:0001250"]
+        )
+        
+        assert mock_client.get.call_args.kwargs["params"]["q"] == (
+            'hpo.hpo_id:("HP:0001250") OR '
+            'phenotype_related_to_disease.hpo_id:("HP:0001250")'
+        )
+    
+    @pytest.mark.asyncio
+    async def test_search_by_hpo_term_matches_single_hpo_object_by_name(self, phenotype_api, mock_client):
+        """Test a lone HPO object is matched the same way as a list entry."""
+        mock_client.get.return_value = {
+            "hits": [
+                {
+                    "_id": "disease1",
+                    "name": "Disease 1",
+                    "hpo": {"hpo_id": "HP:0001250", "phenotype_name": "Seizure"}
+                },
+                {"_id": "disease2", "name": "Disease 2", "hpo": {"hpo_id": "HP:0000001"}}
+            ]
+        }
+        
+        result = await phenotype_api.search_by_hpo_term(mock_client, hpo_id="Seizure")
+        
+        assert result["total_diseases"] == 1
+        assert result["diseases"][0]["phenotype_matches"] == [
+            {"source": "hpo", "hpo_id": "HP:0001250", "match_type": "exact"}
+        ]
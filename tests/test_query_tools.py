@@ -1,14 +1,18 @@
 """Tests for query tools."""
 
 import pytest
-from mydisease_mcp.tools.query import QueryApi
+from mydisease_mcp.tools.query import (
+    DEFAULT_SEARCH_FIELDS,
+    FIELD_STATISTICS_CACHE_TTL,
+    _build_phenotype_q,
+)
 
 
 class TestQueryTools:
     """Test query-related tools."""
     
     @pytest.mark.asyncio
-    async def test_search_disease(self, mock_client, sample_disease_hit):
+    async def test_search_disease(self, query_api, mock_client, sample_disease_hit):
         """Test basic disease search."""
         mock_client.get.return_value = {
             "total": 1,
@@ -16,8 +20,7 @@ class TestQueryTools:
             "hits": [sample_disease_hit]
         }
         
-        api = QueryApi()
-        result = await api.search_disease(mock_client, q="Huntington")
+        result = await query_api.search_disease(mock_client, q="Huntington")
         
         assert result["success"] is True
         assert result["total"] == 1
@@ -34,7 +37,7 @@ class TestQueryTools:
         )
     
     @pytest.mark.asyncio
-    async def test_search_by_field(self, mock_client):
+    async def test_search_by_field(self, query_api, mock_client):
         """Test search by specific fields."""
         mock_client.get.return_value = {
             "total": 1,
@@ -42,8 +45,7 @@ class TestQueryTools:
             "hits": []
         }
         
-        api = QueryApi()
-        result = await api.search_by_field(
+        result = await query_api.search_by_field(
             mock_client,
             field_queries={
                 "mondo.mondo": "MONDO:0007739",
@@ -60,12 +62,11 @@ class TestQueryTools:
         assert " AND " in call_args
 
     @pytest.mark.asyncio
-    async def test_search_by_field_escapes_quotes(self, mock_client):
+    async def test_search_by_field_escapes_quotes(self, query_api, mock_client):
         """Test query escaping for quoted user input."""
         mock_client.get.return_value = {"total": 0, "hits": []}
 
-        api = QueryApi()
-        await api.search_by_field(
+        await query_api.search_by_field(
             mock_client,
             field_queries={"name": 'foo" OR *:*'},
         )
@@ -74,23 +75,21 @@ class TestQueryTools:
         assert 'name:"foo\\" OR *:*"' in call_args
 
     @pytest.mark.asyncio
-    async def test_search_by_field_rejects_invalid_field_name(self, mock_client):
+    async def test_search_by_field_rejects_invalid_field_name(self, query_api, mock_client):
         """Test dynamic field validation."""
-        api = QueryApi()
 
         with pytest.raises(ValueError, match="Invalid field name"):
-            await api.search_by_field(
+            await query_api.search_by_field(
                 mock_client,
                 field_queries={'name OR *:*': "value"},
             )
     
     @pytest.mark.asyncio
-    async def test_search_by_phenotype(self, mock_client):
+    async def test_search_by_phenotype(self, query_api, mock_client):
         """Test searching by phenotype."""
         mock_client.get.return_value = {"total": 5, "hits": []}
         
-        api = QueryApi()
-        result = await api.search_by_phenotype(
+        result = await query_api.search_by_phenotype(
             mock_client,
             phenotypes=["Seizures", "Hypotonia"],
             match_all=False
@@ -104,7 +103,7 @@ class TestQueryTools:
         assert " OR " in call_args
     
     @pytest.mark.asyncio
-    async def test_get_field_statistics(self, mock_client):
+    async def test_get_field_statistics(self, query_api, mock_client):
         """Test getting field statistics."""
         mock_client.get.return_value = {
             "total": 30000,
@@ -122,8 +121,7 @@ class TestQueryTools:
             }
         }
         
-        api = QueryApi()
-        result = await api.get_field_statistics(
+        result = await query_api.get_field_statistics(
             mock_client,
             field="inheritance.inheritance_type"
         )
@@ -136,12 +134,11 @@ class TestQueryTools:
         assert result["top_values"][0]["percentage"] == 40.0
 
     @pytest.mark.asyncio
-    async def test_build_complex_query_text_is_escaped_by_default(self, mock_client):
+    async def test_build_complex_query_text_is_escaped_by_default(self, query_api, mock_client):
         """Text criterion should not pass raw Lucene by default."""
         mock_client.get.return_value = {"total": 0, "hits": []}
 
-        api = QueryApi()
-        await api.build_complex_query(
+        await query_api.build_complex_query(
             mock_client,
             criteria=[{"type": "text", "value": 'name:foo OR *:*'}],
         )
@@ -150,12 +147,11 @@ class TestQueryTools:
         assert q == '"name:foo OR *:*"'
 
     @pytest.mark.asyncio
-    async def test_build_complex_query_text_allows_raw_opt_in(self, mock_client):
+    async def test_build_complex_query_text_allows_raw_opt_in(self, query_api, mock_client):
         """Raw Lucene passthrough should require explicit opt-in."""
         mock_client.get.return_value = {"total": 0, "hits": []}
 
-        api = QueryApi()
-        await api.build_complex_query(
+        await query_api.build_complex_query(
             mock_client,
             criteria=[{"type": "text", "value": "name:foo OR *:*"}],
             allow_raw_text=True,
@@ -163,3 +159,58 @@ class TestQueryTools:
 
         q = mock_client.get.call_args[1]["params"]["q"]
         assert q == "name:foo OR *:*"
+    
+    @pytest.mark.asyncio
+    async def test_search_by_phenotype_reuses_built_query(self, query_api, mock_client):
+        """Test repeated criteria are served from the query-string memo."""
+        mock_client.get.return_value = {"hits": []}
+        _build_phenotype_q.cache_clear()
+        
+        for size in (10, 20):
+            await query_api.search_by_phenotype(
+                mock_client,
+                phenotypes=["seizures", "ataxia"],
+                match_all=True,
+                size=size
+            )
+        
+        first, second = (call.kwargs["params"]["q"] for call in mock_client.get.call_args_list)
+        assert first == second == (
+            '(hpo.phenotype_name:"seizures" OR phenotype_related_to_disease.hpo_phenotype:"seizures")'
+            ' AND (hpo.phenotype_name:"ataxia" OR phenotype_related_to_disease.hpo_phenotype:"ataxia")'
+        )
+        assert _build_phenotype_q.cache_info().hits == 1
+    
+    @pytest.mark.asyncio
+    async def test_get_field_statistics_uses_long_cache_ttl(self, query_api, mock_client):
+        """Test facet statistics are cached for longer than ordinary responses."""
+        mock_client.get.return_value = {"total": 0, "facets": {}}
+        
+        await query_api.get_field_statistics(mock_client, field="inheritance.inheritance_type")
+        
+        assert mock_client.get.call_args.kwargs["cache_ttl"] == FIELD_STATISTICS_CACHE_TTL
+    
+    @pytest.mark.asyncio
+    async def test_get_field_statistics_handles_zero_total(self, query_api, mock_client):
+        """Test an empty index reports raw counts without dividing by zero."""
+        mock_client.get.return_value = {
+            "total": 0,
+            "facets": {"inheritance.inheritance_type": {"terms": [{"term": "X-linked", "count": 0}]}}
+        }
+        
+        result = await query_api.get_field_statistics(mock_client, field="inheritance.inheritance_type")
+        
+        assert result["top_values"][0]["percentage"] == 0.0
+        assert result["total_diseases"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_search_disease_default_params(self, query_api, mock_client):
+        """Test a plain search sends only the query, default fields and size."""
+        mock_client.get.return_value = {"hits": []}
+        
+        await query_api.search_disease(mock_client, q="Alzheimer")
+        await query_api.search_disease(mock_client, q="Alzheimer", fields=None, from_=20)
+        
+        plain, paged = (call.kwargs["params"] for call in mock_client.get.call_args_list)
+        assert plain == {"q": "Alzheimer", "fields": DEFAULT_SEARCH_FIELDS, "size": 10}
+        assert paged == {"q": "Alzheimer", "size": 10, "from": 20}
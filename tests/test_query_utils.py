@@ -3,8 +3,10 @@
 import pytest
 
 from mydisease_mcp.tools._query_utils import (
+    _translate_term,
     escape_lucene_phrase,
     escape_lucene_term,
+    lucene_any_of,
     maybe_quote_field_value,
     quote_lucene_phrase,
     validate_lucene_field_name,
@@ -28,6 +30,11 @@ def test_escape_lucene_term_escapes_special_chars():
     assert escape_lucene_term("a&&b||c") == "a\\&\\&b\\|\\|c"
 
 
+def test_lucene_any_of_groups_phrases_on_one_field():
+    """Any-of helper should OR quoted values inside a single field clause."""
+    assert lucene_any_of("gene.symbol", ["BRCA1", 'A"B']) == 'gene.symbol:("BRCA1" OR "A\\"B")'
+
+
 def test_maybe_quote_field_value_branches():
     """Value helper should preserve quoted/phrase behavior and escape term values."""
     assert maybe_quote_field_value('"already quoted"') == '"already quoted"'
@@ -43,3 +50,24 @@ def test_validate_lucene_field_name():
 
     with pytest.raises(ValueError, match="Invalid field name"):
         validate_lucene_field_name("name OR *:*")
+
+
+def test_escape_lucene_term_escapes_unicode_whitespace():
+    """Term escaping should cover Unicode whitespace, not just ASCII spaces."""
+    assert escape_lucene_term("a\tb\u3000c") == "a\\\tb\\\u3000c"
+
+
+def test_escape_helpers_return_clean_values_unchanged():
+    """Escape helpers should return values without special chars as-is."""
+    value = "HTT_gene.symbol"
+    assert escape_lucene_term(value) is value
+    assert escape_lucene_phrase(value) is value
+
+
+def test_escape_lucene_term_reuses_escaped_identifiers():
+    """Term escaping should cache only values that actually need escaping."""
+    _translate_term.cache_clear()
+    first = escape_lucene_term("MONDO:0007739")
+    assert escape_lucene_term("MONDO:0007739") is first
+    escape_lucene_term("HTT")
+    assert _translate_term.cache_info().currsize == 1
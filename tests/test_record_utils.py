@@ -0,0 +1,12 @@
+"""Tests for annotation record helpers."""
+
+from mydisease_mcp.tools._record_utils import as_list
+
+
+def test_as_list_normalizes_single_and_missing_values():
+    """Single objects are wrapped, lists pass through, and None becomes empty."""
+    items = [{"symbol": "HTT"}]
+    assert as_list(items) is items
+    assert as_list({"symbol": "HTT"}) == [{"symbol": "HTT"}]
+    assert as_list("MONDO:0007739") == ["MONDO:0007739"]
+    assert as_list(None) == []
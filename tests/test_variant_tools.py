@@ -1,14 +1,13 @@
 """Tests for variant tools."""
 
 import pytest
-from mydisease_mcp.tools.variant import VariantApi
 
 
 class TestVariantTools:
     """Test variant-disease association tools."""
     
     @pytest.mark.asyncio
-    async def test_get_diseases_by_variant(self, mock_client, sample_variant_data):
+    async def test_get_diseases_by_variant(self, variant_api, mock_client, sample_variant_data):
         """Test getting diseases by variant."""
         mock_client.get.return_value = {
             "hits": [
@@ -20,8 +19,7 @@ class TestVariantTools:
             ]
         }
         
-        api = VariantApi()
-        result = await api.get_diseases_by_variant(
+        result = await variant_api.get_diseases_by_variant(
             mock_client,
             variant_id="rs104894090"
         )
@@ -32,7 +30,7 @@ class TestVariantTools:
         assert result["diseases"][0]["variant_associations"][0]["source"] == "clinvar"
 
     @pytest.mark.asyncio
-    async def test_get_diseases_by_variant_handles_gwas_list(self, mock_client):
+    async def test_get_diseases_by_variant_handles_gwas_list(self, variant_api, mock_client):
         """Test GWAS list payloads do not crash variant lookup."""
         mock_client.get.return_value = {
             "hits": [
@@ -46,8 +44,7 @@ class TestVariantTools:
             ]
         }
 
-        api = VariantApi()
-        result = await api.get_diseases_by_variant(
+        result = await variant_api.get_diseases_by_variant(
             mock_client,
             variant_id="rs123",
         )
@@ -57,12 +54,11 @@ class TestVariantTools:
         assert result["diseases"][0]["variant_associations"][0]["source"] == "gwas"
     
     @pytest.mark.asyncio
-    async def test_get_disease_variants(self, mock_client, sample_variant_data):
+    async def test_get_disease_variants(self, variant_api, mock_client, sample_variant_data):
         """Test getting variants for a disease."""
         mock_client.get.return_value = sample_variant_data
         
-        api = VariantApi()
-        result = await api.get_disease_variants(
+        result = await variant_api.get_disease_variants(
             mock_client,
             disease_id="test-id"
         )
@@ -73,7 +69,7 @@ class TestVariantTools:
         assert result["variants"]["clinvar_variants"][0]["clinical_significance"] == "Pathogenic"
     
     @pytest.mark.asyncio
-    async def test_get_variant_pathogenicity(self, mock_client):
+    async def test_get_variant_pathogenicity(self, variant_api, mock_client):
         """Test getting variant pathogenicity."""
         mock_client.get.return_value = {
             "hits": [
@@ -90,8 +86,7 @@ class TestVariantTools:
             ]
         }
         
-        api = VariantApi()
-        result = await api.get_variant_pathogenicity(
+        result = await variant_api.get_variant_pathogenicity(
             mock_client,
             variant_id="rs104894090"
         )
@@ -102,7 +97,7 @@ class TestVariantTools:
         assert len(result["pathogenicity"]["disease_associations"]) == 1
     
     @pytest.mark.asyncio
-    async def test_search_by_variant_type(self, mock_client):
+    async def test_search_by_variant_type(self, variant_api, mock_client):
         """Test searching by variant type."""
         mock_client.get.return_value = {
             "hits": [
@@ -122,8 +117,7 @@ class TestVariantTools:
             ]
         }
         
-        api = VariantApi()
-        result = await api.search_by_variant_type(
+        result = await variant_api.search_by_variant_type(
             mock_client,
             variant_type="missense",
             gene_symbol="GENE1"
@@ -133,3 +127,162 @@ class TestVariantTools:
         assert result["variant_type"] == "missense"
         assert result["total_diseases"] == 1
         assert result["diseases"][0]["variant_count"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_get_diseases_by_variants(self, variant_api, mock_client):
+        """Test several variants are looked up in one POST and bucketed by variant."""
+        mock_client.post.return_value = [
+            {
+                "query": "rs1",
+                "found": True,
+                "_id": "D1",
+                "name": "Disease 1",
+                "clinvar": {"variant": {"rsid": "rs1", "clinical_significance": "Pathogenic"}}
+            },
+            {
+                "query": "NM_1:c.1A>G",
+                "found": True,
+                "_id": "D2",
+                "name": "Disease 2",
+                "pathogenic_variants": [{"hgvs": "NM_1:c.1A>G"}]
+            },
+            {"query": "rs404", "found": False}
+        ]
+        
+        result = await variant_api.get_diseases_by_variants(
+            mock_client,
+            variant_ids=["rs1", "NM_1:c.1A>G", "rs404"]
+        )
+        
+        mock_client.post.assert_awaited_once()
+        assert mock_client.post.call_args[0][0] == "query"
+        assert mock_client.post.call_args[0][1]["ids"] == ["rs1", "NM_1:c.1A>G", "rs404"]
+        by_variant = {v["variant_id"]: v for v in result["variants"]}
+        assert by_variant["rs1"]["diseases"][0]["variant_associations"][0]["source"] == "clinvar"
+        assert by_variant["NM_1:c.1A>G"]["diseases"][0]["disease_id"] == "D2"
+        assert by_variant["rs404"]["total_diseases"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_get_disease_variants_batch(self, variant_api, mock_client):
+        """Test several diseases' variants are fetched in one POST."""
+        mock_client.post.return_value = [
+            {"query": "D1", "_id": "D1", "gwas_catalog": {"rsid": "rs1"}},
+            {"query": "D2", "notfound": True}
+        ]
+        
+        result = await variant_api.get_disease_variants_batch(
+            mock_client,
+            disease_ids=["D1", "D2"]
+        )
+        
+        assert mock_client.post.call_args[0][0] == "disease"
+        assert result["total"] == 1
+        assert result["variants"][0]["disease_id"] == "D1"
+        assert result["variants"][0]["gwas_variants"] == [{"rsid": "rs1"}]
+        assert result["missing_ids"] == ["D2"]
+    
+    @pytest.mark.asyncio
+    async def test_search_by_variant_type_counts_all_and_samples_three(self, variant_api, mock_client):
+        """Test every matching variant is counted but only three are shown."""
+        mock_client.get.return_value = {
+            "hits": [
+                {
+                    "_id": "D1",
+                    "name": "Disease 1",
+                    "clinvar": {
+                        "variant": [
+                            {"variant_type": "missense", "gene": "GENE1", "rsid": f"rs{i}"}
+                            for i in range(5)
+                        ] + [{"variant_type": "missense", "gene": "OTHER", "rsid": "rs9"}]
+                    }
+                },
+                {"_id": "D2", "name": "Disease 2", "clinvar": {"variant": {"variant_type": "deletion"}}}
+            ]
+        }
+        
+        result = await variant_api.search_by_variant_type(
+            mock_client,
+            variant_type="missense",
+            gene_symbol="GENE1"
+        )
+        
+        assert result["total_diseases"] == 1
+        assert result["diseases"][0]["variant_count"] == 5
+        assert [v["rsid"] for v in result["diseases"][0]["example_variants"]] == ["rs0", "rs1", "rs2"]
+    
+    @pytest.mark.asyncio
+    async def test_get_disease_variants_filter_is_case_insensitive(self, variant_api, mock_client):
+        """Test the pathogenicity filter matches ClinVar significance ignoring case."""
+        mock_client.get.return_value = {
+            "clinvar": {"variant": [
+                {"rsid": "rs1", "clinical_significance": "Pathogenic"},
+                {"rsid": "rs2", "clinical_significance": "Benign"}
+            ]}
+        }
+        
+        result = await variant_api.get_disease_variants(
+            mock_client,
+            disease_id="test-id",
+            pathogenicity_filter="PATHOGENIC"
+        )
+        
+        assert [v["rsid"] for v in result["variants"]["clinvar_variants"]] == ["rs1"]
+    
+    @pytest.mark.asyncio
+    async def test_get_diseases_by_variant_scans_only_matching_source(self, variant_api, mock_client):
+        """Test HGVS lookups read pathogenic entries and rsID lookups read GWAS entries."""
+        hit = {
+            "_id": "d1",
+            "name": "Disease",
+            "pathogenic_variants": [{"hgvs": "NM_1:c.1A>G"}],
+            "gwas_catalog": [{"rsid": "rs1", "trait": "T"}]
+        }
+        mock_client.get.return_value = {"hits": [hit]}
+        
+        by_hgvs = await variant_api.get_diseases_by_variant(mock_client, variant_id="NM_1:c.1A>G")
+        by_rsid = await variant_api.get_diseases_by_variant(mock_client, variant_id="rs1")
+        
+        hgvs_sources = [a["source"] for a in by_hgvs["diseases"][0]["variant_associations"]]
+        rsid_sources = [a["source"] for a in by_rsid["diseases"][0]["variant_associations"]]
+        assert hgvs_sources == ["pathogenic_db"]
+        assert rsid_sources == ["gwas"]
+        assert "clinvar.variant.hgvs" in mock_client.get.call_args_list[0].kwargs["params"]["q"]
+        assert "gwas_catalog.rsid" in mock_client.get.call_args_list[1].kwargs["params"]["q"]
+    
+    @pytest.mark.asyncio
+    async def test_get_variant_pathogenicity_counts_each_association(self, variant_api, mock_client):
+        """Test the summary tallies every matching ClinVar entry across hits."""
+        mock_client.get.return_value = {
+            "hits": [
+                {"_id": "d1", "clinvar": {"variant": [
+                    {"rsid": "rs1", "clinical_significance": "Pathogenic"},
+                    {"rsid": "rs2", "clinical_significance": "Benign"}
+                ]}},
+                {"_id": "d2", "clinvar": {"variant": [{"rsid": "rs1"}]}},
+                {"_id": "d3", "clinvar": {"variant": {"rsid": "rs1", "clinical_significance": "Pathogenic"}}}
+            ]
+        }
+        
+        result = await variant_api.get_variant_pathogenicity(mock_client, variant_id="rs1")
+        
+        pathogenicity = result["pathogenicity"]
+        assert pathogenicity["pathogenicity_summary"] == {"Pathogenic": 2, "Unknown": 1}
+        assert [a["disease_id"] for a in pathogenicity["disease_associations"]] == ["d1", "d2", "d3"]
+    
+    @pytest.mark.asyncio
+    async def test_get_disease_variants_batch_pairs_results_by_query(self, variant_api, mock_client):
+        """Test an extra hit for one id does not shift the results of later ids."""
+        mock_client.post.return_value = [
+            {"query": "D1", "_id": "D1", "gwas_catalog": {"rsid": "rs1"}},
+            {"query": "D1", "_id": "D1-dup", "gwas_catalog": {"rsid": "rs9"}},
+            {"query": "D2", "_id": "D2", "gwas_catalog": {"rsid": "rs2"}}
+        ]
+        
+        result = await variant_api.get_disease_variants_batch(
+            mock_client,
+            disease_ids=["D1", "D2"]
+        )
+        
+        assert [v["disease_id"] for v in result["variants"]] == ["D1", "D2"]
+        assert result["variants"][1]["gwas_variants"] == [{"rsid": "rs2"}]
+        assert result["missing_ids"] == []